@@ -0,0 +1,149 @@
+import asyncio
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import main
+import metrics
+
+# ASGI entry point: uvicorn async_app:app --workers 2
+#
+# An event loop accepts connections and answers cheap requests (stored
+# puzzles, health checks, metrics) inline. Requests that may wait on upstream
+# sites run on a large I/O thread pool, and word generation runs on a small CPU
+# pool, so a burst of cold archive dates no longer occupies every worker slot
+# the way it does under sync gunicorn workers. Routes are the Flask app's own,
+# called through a minimal WSGI bridge, so both serving modes behave the same.
+IO_THREADS = int(os.environ.get("ASYNC_IO_THREADS", 64))
+CPU_THREADS = int(os.environ.get("ASYNC_CPU_THREADS", os.cpu_count() or 2))
+
+CPU_PATHS = {"/api/spelling-bee/generate"}
+INLINE_PATHS = {"/", "/test", "/api/spelling-bee/test", "/healthz", "/readyz", "/metrics", "/api/spelling-bee/startup"}
+ARCHIVE_PATH = re.compile(r"^/api/spelling-bee/archive/(\d{4}-\d{2}-\d{2})$")
+
+ASYNC_DISPATCH = metrics.Counter(
+    "beehelper_async_dispatch_total",
+    "Requests handled by the ASGI app, by where they ran (inline, io, cpu)",
+    ("executor",),
+)
+
+_io_executor = ThreadPoolExecutor(IO_THREADS, thread_name_prefix="asgi-io")
+_cpu_executor = ThreadPoolExecutor(CPU_THREADS, thread_name_prefix="asgi-cpu")
+
+
+def executor_for(path):
+    """The executor a request should run on, or None to answer it on the event loop"""
+    if path in INLINE_PATHS:
+        return None
+    # Requests may have to wait for startup to finish
+    if not main.startup.is_ready():
+        return _io_executor
+    if path in CPU_PATHS:
+        return _cpu_executor
+    if path == "/api/spelling-bee/today" and main.has_stored_puzzle(date.today().isoformat()):
+        return None
+    if path == "/api/spelling-bee/yesterday" and main.has_stored_puzzle((date.today() - timedelta(days=1)).isoformat()):
+        return None
+    match = ARCHIVE_PATH.match(path)
+    if match and main.has_stored_puzzle(match.group(1), archive=True):
+        return None
+    return _io_executor
+
+
+def wsgi_environ(scope, body):
+    """WSGI environ for an ASGI HTTP request"""
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        key = name if name in ("CONTENT_TYPE", "CONTENT_LENGTH") else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def call_wsgi(environ):
+    """Run the Flask app on an environ, returning (status code, headers, body)"""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = int(status.split(" ", 1)[0])
+        response["headers"] = headers
+        return chunks.append
+
+    chunks = []
+    result = main.app(environ, start_response)
+    try:
+        for chunk in result:
+            chunks.append(chunk)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return response["status"], response["headers"], b"".join(chunks)
+
+
+async def _read_body(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _io_executor.shutdown(wait=False, cancel_futures=True)
+            _cpu_executor.shutdown(wait=False, cancel_futures=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    environ = wsgi_environ(scope, await _read_body(receive))
+    executor = executor_for(scope["path"])
+    if executor is None:
+        ASYNC_DISPATCH.inc("inline")
+        status, headers, body = call_wsgi(environ)
+    else:
+        ASYNC_DISPATCH.inc("cpu" if executor is _cpu_executor else "io")
+        status, headers, body = await asyncio.get_running_loop().run_in_executor(executor, call_wsgi, environ)
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Benchmarks for word generation, word validation and stats over every wordbase.
+#
+# Each wordbase is installed as the server's dictionary in turn and the hot
+# functions run over a fixed set of real puzzles plus seeded random ones, so runs
+# are comparable across machines and commits. The letter-mask index is checked
+# against the linear dictionary scan for identical output on every puzzle, and
+# the compiled proper noun rules against checking each rule in turn.
+#
+#   python benchmark.py                            # all wordbases, print a table
+#   python benchmark.py --save baseline.json       # record a baseline
+#   python benchmark.py --compare baseline.json    # exit 1 on a regression
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+# Load the dictionary before main returns; the benchmarks replace it right away
+os.environ.setdefault("EAGER_STARTUP", "1")
+
+import main
+import remove_proper_nouns
+
+BASE_DIR = Path(__file__).resolve().parent
+WORDBASE_PATTERNS = ("beehelper_wordbase*.txt", "filtered_*.txt", "cleaned_scraped_words.txt")
+
+# (letters, center letter) of published puzzles
+REAL_PUZZLES = [
+    ("NBIKMPU", "N"),
+    ("GUILTED", "E"),
+    ("UOVNERC", "N"),
+    ("AEILNOT", "A"),
+    ("AEIORST", "E"),
+]
+
+# Inputs the index has to handle exactly like the scan, checked but not timed
+EDGE_CASE_PUZZLES = [
+    ("ABCDEFG", "Z"),
+    ("abcdefg", "A"),
+    ("AEILNOT", "a"),
+    ("AEILNOÉ", "É"),
+    ("AEILNOT'", "T"),
+    ("ABCDEFGHIJKLMNOPQRST", "E"),
+]
+
+DEFAULT_RANDOM_PUZZLES = 20
+DEFAULT_SEED = 2024
+DEFAULT_REPEAT = 20
+DEFAULT_THRESHOLD = 0.25
+
+# Words from each wordbase checked per puzzle in the validation benchmark. A
+# single check is too quick to time on its own, so each puzzle's sample is one
+# timed call and results are per batch.
+VALIDATION_SAMPLE = 2000
+
+
+def random_puzzles(count, seed):
+    rng = random.Random(seed)
+    puzzles = []
+    for _ in range(count):
+        letters = "".join(rng.sample(string.ascii_uppercase, 7))
+        puzzles.append((letters, rng.choice(letters)))
+    return puzzles
+
+
+def wordbase_paths(names=None):
+    if names:
+        return [Path(name) if Path(name).exists() else BASE_DIR / name for name in names]
+    paths = set()
+    for pattern in WORDBASE_PATTERNS:
+        paths.update(BASE_DIR.glob(pattern))
+    return sorted(paths)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(durations):
+    durations = sorted(durations)
+    total = sum(durations)
+    return {
+        "calls": len(durations),
+        "ops_per_sec": round(len(durations) / total, 1) if total else None,
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(durations, 0.99) * 1000, 4),
+    }
+
+
+def time_calls(func, calls, repeat):
+    durations = []
+    for _ in range(repeat):
+        for args in calls:
+            started = time.perf_counter()
+            func(*args)
+            durations.append(time.perf_counter() - started)
+    return durations
+
+
+def validate_batch(words, letters, center):
+    for word in words:
+        main.is_valid_spelling_bee_word(word, letters, center)
+
+
+def sample_words(words, seed):
+    return random.Random(seed).sample(words, min(VALIDATION_SAMPLE, len(words)))
+
+
+def classify_batch(words):
+    for word in words:
+        remove_proper_nouns.classify(word)
+
+
+def scan_proper_nouns_batch(words):
+    for word in words:
+        remove_proper_nouns.is_proper_noun_scan(word)
+
+
+def check_proper_noun_equivalence(words):
+    """Words the compiled proper noun rules and the sequential reference disagree on"""
+    mismatches = []
+    for word in words:
+        compiled = remove_proper_nouns.classify(word)
+        if (compiled is not None) != remove_proper_nouns.is_proper_noun_scan(word):
+            mismatches.append({"word": word, "compiled": compiled})
+    return mismatches[:10]
+
+
+def check_equivalence(puzzles):
+    """Puzzles where the index and the linear scan disagree"""
+    mismatches = []
+    for letters, center in puzzles:
+        letters = list(letters)
+        indexed = main.generate_spelling_bee_words(letters, center)
+        scanned = main.scan_spelling_bee_words(letters, center)
+        if indexed != scanned:
+            mismatches.append({
+                "letters": "".join(letters),
+                "center": center,
+                "only_index": sorted(set(indexed) - set(scanned))[:10],
+                "only_scan": sorted(set(scanned) - set(indexed))[:10],
+                "order_differs": set(indexed) == set(scanned),
+            })
+    return mismatches
+
+
+def run_wordbase(path, puzzles, repeat, seed, include_scan):
+    main.install_dictionary(main.read_dictionary_file(path))
+
+    mismatches = check_equivalence(puzzles + EDGE_CASE_PUZZLES)
+    generate_calls = [(list(letters), center) for letters, center in puzzles]
+
+    results = {
+        "words": len(main.DICTIONARY),
+        "generate_spelling_bee_words": summarize(time_calls(main.generate_spelling_bee_words, generate_calls, repeat)),
+    }
+    if include_scan:
+        results["scan_spelling_bee_words"] = summarize(time_calls(main.scan_spelling_bee_words, generate_calls, 1))
+
+    rng = random.Random(seed)
+    sample = rng.sample(sorted(main.DICTIONARY), min(VALIDATION_SAMPLE, len(main.DICTIONARY)))
+    validation_calls = [(sample, list(letters), center) for letters, center in puzzles]
+    results["is_valid_spelling_bee_word"] = dict(
+        summarize(time_calls(validate_batch, validation_calls, repeat)),
+        batch=len(sample),
+    )
+
+    stats_calls = [(main.generate_spelling_bee_words(letters, center), list(letters)) for letters, center in generate_calls]
+    results["compute_stats"] = summarize(time_calls(main.compute_stats, stats_calls, repeat))
+
+    # The wordbase build classifies every word of its sources once
+    words = sorted(word.lower() for word in main.DICTIONARY)
+    results["classify_proper_nouns"] = dict(summarize(time_calls(classify_batch, [(words,)], repeat)), batch=len(words))
+    if include_scan:
+        results["is_proper_noun_scan"] = dict(summarize(time_calls(scan_proper_nouns_batch, [(words,)], 1)), batch=len(words))
+    # Checking every word against the reference takes as long as the scan
+    mismatches += check_proper_noun_equivalence(words if include_scan else sample_words(words, seed))
+    return results, mismatches
+
+
+def compare(results, baseline, threshold):
+    """Benchmarks whose p50 latency or throughput got worse than the baseline by more than `threshold`"""
+    regressions = []
+    for wordbase, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            previous = baseline.get(wordbase, {}).get(name)
+            if not isinstance(current, dict) or not isinstance(previous, dict):
+                continue
+            if previous["p50_ms"] and current["p50_ms"] > previous["p50_ms"] * (1 + threshold):
+                regressions.append(f"{wordbase} {name}: p50 {previous['p50_ms']}ms -> {current['p50_ms']}ms")
+            if previous["ops_per_sec"] and current["ops_per_sec"] and current["ops_per_sec"] < previous["ops_per_sec"] / (1 + threshold):
+                regressions.append(f"{wordbase} {name}: {previous['ops_per_sec']}/s -> {current['ops_per_sec']}/s")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'wordbase':<38} {'benchmark':<28} {'ops/s':>11} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for wordbase, benchmarks in results.items():
+        for name, stats in benchmarks.items():
+            if isinstance(stats, dict):
+                print(f"{wordbase:<38} {name:<28} {stats['ops_per_sec'] or 0:>11} {stats['p50_ms']:>10} {stats['p95_ms']:>10} {stats['p99_ms']:>10}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark word generation, validation and stats over each wordbase")
+    parser.add_argument("wordbases", nargs="*", help="wordbase files (default: every wordbase in the project)")
+    parser.add_argument("--random-puzzles", type=int, default=DEFAULT_RANDOM_PUZZLES)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="passes over the puzzles per timed benchmark")
+    parser.add_argument("--scan", action="store_true", help="also time the linear scans the index and compiled rules replace")
+    parser.add_argument("--save", metavar="FILE", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="fail if results regress against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    puzzles = REAL_PUZZLES + random_puzzles(args.random_puzzles, args.seed)
+    results = {}
+    mismatches = {}
+    for path in wordbase_paths(args.wordbases):
+        results[path.name], wordbase_mismatches = run_wordbase(path, puzzles, args.repeat, args.seed, args.scan)
+        if wordbase_mismatches:
+            mismatches[path.name] = wordbase_mismatches
+
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "puzzles": len(puzzles),
+                "repeat": args.repeat,
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if mismatches:
+        print("Index or compiled rule output differs from the linear scan:")
+        print(json.dumps(mismatches, indent=2))
+        return 2
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,251 @@
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+import structured_logging
+import word_index
+
+logger = structured_logging.get_logger("cpu_pool")
+
+# Shared process pool for CPU-bound request work.
+#
+# Work that holds the GIL for long runs in worker processes, so cache-hit reads
+# on the server's own threads stay fast. Admission is bounded: once
+# MAX_PENDING tasks are queued or running, new ones are rejected with PoolBusy
+# straight away (the caller answers 503 with Retry-After) instead of piling up.
+# A task that takes longer than TASK_TIMEOUT raises PoolTimeout; the worker
+# finishes it in the background, but the request stops waiting.
+#
+# Each worker holds its own copy of the dictionary index, built once when the
+# worker starts. set_dictionary() replaces the pool when the dictionary
+# changes; with warm=True the new workers are started and have built their
+# index before tasks switch to them. Tasks can name the dictionary version they
+# expect, and get None instead of an answer from another version.
+# CPU_POOL_WORKERS=0 disables the pool; callers then do the work on their own
+# thread.
+WORKERS = int(os.environ.get("CPU_POOL_WORKERS", min(2, os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get("CPU_POOL_MAX_PENDING", max(WORKERS, 1) * 4))
+TASK_TIMEOUT = float(os.environ.get("CPU_POOL_TASK_TIMEOUT", 10))
+RETRY_AFTER = 2
+
+# How long set_dictionary(warm=True) waits for the new workers to start
+WARM_TIMEOUT = 60
+
+# "spawn" starts workers from a clean interpreter; forking a threaded server
+# can copy locks held by other threads
+START_METHOD = os.environ.get("CPU_POOL_START_METHOD", "spawn")
+
+
+class PoolBusy(Exception):
+    """Raised when the pool already has MAX_PENDING tasks"""
+
+
+class PoolTimeout(Exception):
+    """Raised when a task didn't finish within its timeout"""
+
+
+TASKS = metrics.Counter(
+    "beehelper_cpu_pool_tasks_total",
+    "CPU pool tasks by outcome (completed, rejected, timeout, error, stale)",
+    ("outcome",),
+)
+
+_lock = threading.Lock()
+_executor = None
+_dictionary = None
+_version = None
+_admission = threading.BoundedSemaphore(MAX_PENDING)
+_pending = 0
+
+# Worker process state
+_worker_index = None
+
+
+# Pool worker processes are named with this prefix. Spawn and forkserver
+# workers re-import the server's main script (and whatever it imports) before
+# they start, and the name is the one thing they already have then; server
+# workers that uvicorn itself spawns have other names and load as usual
+WORKER_NAME_PREFIX = "cpu-pool-worker-"
+
+_base_context = multiprocessing.get_context(START_METHOD)
+
+
+class _WorkerProcess(_base_context.Process):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = WORKER_NAME_PREFIX + self.name.rsplit("-", 1)[-1]
+
+
+class _WorkerContext(type(_base_context)):
+    Process = _WorkerProcess
+
+
+def is_worker_process():
+    """Whether this process is a pool worker (or the forkserver that starts them) rather than a server process"""
+    return (
+        multiprocessing.current_process().name.startswith(WORKER_NAME_PREFIX)
+        or "multiprocessing.forkserver" in " ".join(sys.orig_argv)
+    )
+
+
+def _init_worker(words):
+    global _worker_index
+    _worker_index = word_index.build(words)
+
+
+def _find_words(letters, center_letter):
+    return word_index.find_words(_worker_index, letters, center_letter)
+
+
+def _warm():
+    return _worker_index is not None
+
+
+def _new_executor(dictionary):
+    return ProcessPoolExecutor(
+        max_workers=WORKERS,
+        mp_context=_WorkerContext(),
+        initializer=_init_worker,
+        initargs=(dictionary,),
+    )
+
+
+def _start_executor(dictionary):
+    """A new executor whose workers have all started and built their index, or None if they didn't"""
+    executor = _new_executor(dictionary)
+    try:
+        # Submitted together, so each goes to a worker of its own
+        for future in [executor.submit(_warm) for _ in range(WORKERS)]:
+            future.result(timeout=WARM_TIMEOUT)
+    except Exception as e:
+        logger.warning("CPU pool workers didn't start, starting them on first use instead: %s", e)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return None
+    return executor
+
+
+def set_dictionary(dictionary, version, warm=False):
+    """Use a new dictionary for pool tasks, replacing the workers if it changed"""
+    global _executor, _dictionary, _version
+    if version == _version:
+        return
+    dictionary = tuple(dictionary)
+    new_executor = _start_executor(dictionary) if warm and WORKERS > 0 else None
+    with _lock:
+        old_executor = _executor
+        _executor = new_executor
+        _dictionary = dictionary
+        _version = version
+    if old_executor is not None:
+        # Running tasks finish on the old workers; their callers are keyed by the old version
+        old_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_executor(version=None):
+    """The pool's executor, or None if its dictionary isn't `version`"""
+    global _executor
+    with _lock:
+        if version is not None and version != _version:
+            return None
+        if _executor is None:
+            _executor = _new_executor(_dictionary)
+        return _executor
+
+
+def _reset_executor(executor):
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+
+
+def _release(_future=None):
+    global _pending
+    with _lock:
+        _pending -= 1
+    _admission.release()
+
+
+def enabled():
+    """Whether tasks go to worker processes (a dictionary has been set and WORKERS > 0)"""
+    return WORKERS > 0 and _dictionary is not None
+
+
+def find_words(letters, center_letter, version=None, timeout=TASK_TIMEOUT):
+    """Valid words for a puzzle computed on the pool, or None if the index can't answer or isn't at `version`"""
+    return run(_find_words, list(letters), center_letter, timeout=timeout, version=version)
+
+
+def run(func, *args, timeout=TASK_TIMEOUT, version=None):
+    """Run a module-level function on the pool and wait for its result, or None if the pool's dictionary isn't `version`"""
+    global _pending
+    if not _admission.acquire(blocking=False):
+        TASKS.inc("rejected")
+        raise PoolBusy(f"CPU pool has {MAX_PENDING} tasks pending")
+    with _lock:
+        _pending += 1
+
+    executor = None
+    try:
+        executor = _get_executor(version)
+        if executor is None:
+            _release()
+            TASKS.inc("stale")
+            return None
+        future = executor.submit(func, *args)
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        _release()
+        if version is not None and version != _version:
+            # The dictionary changed and the executor was shut down under us
+            TASKS.inc("stale")
+            return None
+        _reset_executor(executor)
+        TASKS.inc("error")
+        raise PoolBusy(f"CPU pool unavailable: {e}")
+    future.add_done_callback(_release)
+
+    try:
+        result = future.result(timeout=timeout)
+    except CancelledError:
+        # Queued when set_dictionary() replaced the workers
+        TASKS.inc("stale")
+        return None
+    except TimeoutError:
+        future.cancel()
+        TASKS.inc("timeout")
+        raise PoolTimeout(f"CPU task took longer than {timeout}s")
+    except BrokenProcessPool as e:
+        # A worker died (e.g. killed for memory); start fresh workers next time
+        _reset_executor(executor)
+        TASKS.inc("error")
+        logger.error("CPU pool worker died: %s", e)
+        raise PoolBusy("CPU pool worker died")
+    TASKS.inc("completed")
+    return result
+
+
+def status():
+    with _lock:
+        return {
+            "workers": WORKERS,
+            "started": _executor is not None,
+            "pending": _pending,
+            "max_pending": MAX_PENDING,
+            "task_timeout": TASK_TIMEOUT,
+            "dictionary_version": _version,
+        }
+
+
+def collect_metrics():
+    current = status()
+    return [
+        ("beehelper_cpu_pool_pending", "gauge", "CPU pool tasks queued or running", [({}, current["pending"])]),
+        ("beehelper_cpu_pool_max_pending", "gauge", "CPU pool admission limit", [({}, current["max_pending"])]),
+    ]
+
+
+metrics.register_collector(collect_metrics)
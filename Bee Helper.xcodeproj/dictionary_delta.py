@@ -0,0 +1,126 @@
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+
+import word_index
+
+# Delta files between two wordbase versions.
+#
+# A delta lists the words added to and removed from a wordbase, one per line
+# with a + or - in front, after a header naming the dictionary versions
+# (word_index.dictionary_version) it goes from and to:
+#
+#   # beehelper wordbase delta
+#   from 1b65195201cf...
+#   to 9a3e07c4d1b2...
+#   -aardvark
+#   +zymurgy
+#
+# Both wordbases must be sorted, as wordbase.py and merge_wordlists.py write
+# them, so the delta and both versions come out of one linear merge without
+# holding either wordbase in memory. The server applies a delta only when it
+# is serving the "from" version and the result hashes to the "to" version:
+#
+#   python wordbase.py diff beehelper_wordbase-41017.txt beehelper_wordbase-41446.txt
+#   curl -X POST -H "X-Admin-Token: $ADMIN_TOKEN" --data-binary @beehelper_wordbase-41017-to-41446.delta \
+#       https://<host>/api/spelling-bee/admin/dictionary/delta
+HEADER = "# beehelper wordbase delta"
+VERSION_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+class DeltaError(Exception):
+    """Raised when a delta file, or a wordbase it's made from, is malformed"""
+
+
+def sorted_words(lines, name):
+    """Normalized words of a sorted wordbase with repeats dropped, raising DeltaError if they're out of order"""
+    previous = None
+    for line in lines:
+        word = line.strip().lower()
+        if not word or word == previous:
+            continue
+        if previous is not None and word < previous:
+            raise DeltaError(f"{name} isn't sorted ({previous!r} comes before {word!r})")
+        previous = word
+        yield word
+
+
+def diff(old_words, new_words):
+    """("-", word) for words only in old and ("+", word) for words only in new, by a linear merge of sorted streams"""
+    old_words, new_words = iter(old_words), iter(new_words)
+    old = next(old_words, None)
+    new = next(new_words, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old < new):
+            yield "-", old
+            old = next(old_words, None)
+        elif old is None or new < old:
+            yield "+", new
+            new = next(new_words, None)
+        else:
+            old = next(old_words, None)
+            new = next(new_words, None)
+
+
+def write_delta(old_path, new_path, delta_path):
+    """Write the delta from one sorted wordbase to another, returning its versions and counts"""
+    old_digest = hashlib.sha256()
+    new_digest = hashlib.sha256()
+    counts = {"+": 0, "-": 0}
+
+    # The versions are only known once both files have been read, so the
+    # changes go to a temporary file and the header is written in front after
+    delta_path = Path(delta_path)
+    body_path = delta_path.with_name(f"{delta_path.name}.{os.getpid()}.body")
+    temp_path = delta_path.with_name(f"{delta_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(old_path, "r", encoding="utf-8") as old_file, \
+                open(new_path, "r", encoding="utf-8") as new_file, \
+                open(body_path, "w", encoding="utf-8") as body:
+            old_words = word_index.hashed(sorted_words(old_file, old_path), old_digest)
+            new_words = word_index.hashed(sorted_words(new_file, new_path), new_digest)
+            for sign, word in diff(old_words, new_words):
+                counts[sign] += 1
+                body.write(f"{sign}{word}\n")
+
+        with open(temp_path, "w", encoding="utf-8") as out, open(body_path, "r", encoding="utf-8") as body:
+            out.write(f"{HEADER}\nfrom {old_digest.hexdigest()}\nto {new_digest.hexdigest()}\n")
+            shutil.copyfileobj(body, out)
+        os.replace(temp_path, delta_path)
+    finally:
+        body_path.unlink(missing_ok=True)
+        temp_path.unlink(missing_ok=True)
+
+    return {
+        "path": str(delta_path),
+        "from": old_digest.hexdigest(),
+        "to": new_digest.hexdigest(),
+        "added": counts["+"],
+        "removed": counts["-"],
+    }
+
+
+def parse(lines):
+    """A delta's versions and its added and removed words, raising DeltaError if it's malformed"""
+    lines = iter(lines)
+    if next(lines, "").strip() != HEADER:
+        raise DeltaError("Not a wordbase delta (missing header)")
+
+    delta = {"added": [], "removed": []}
+    for key in ("from", "to"):
+        label, _, version = next(lines, "").strip().partition(" ")
+        if label != key or not VERSION_PATTERN.fullmatch(version):
+            raise DeltaError(f"Delta has no valid {key!r} version")
+        delta[key] = version
+
+    for number, line in enumerate(lines, start=4):
+        line = line.strip()
+        if not line:
+            continue
+        sign, word = line[0], line[1:].strip().lower()
+        if sign not in "+-" or not word:
+            raise DeltaError(f"Line {number} isn't +word or -word: {line!r}")
+        delta["added" if sign == "+" else "removed"].append(word)
+    return delta
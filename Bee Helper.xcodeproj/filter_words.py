@@ -1,43 +1,56 @@
-import requests
-import re
+import sys
 
-def filter_words():
+import source_cache
+
+DWYL_WORDS_URL = "https://raw.githubusercontent.com/dwyl/english-words/refs/heads/master/words_alpha.txt"
+
+# Puzzle words have at least 4 letters and at most 7 distinct letters
+MIN_LENGTH = 4
+MAX_UNIQUE_LETTERS = 7
+
+def is_playable(word, min_length=MIN_LENGTH, max_unique_letters=MAX_UNIQUE_LETTERS):
+    """Whether a lowercase word is long enough and uses few enough distinct letters to be a puzzle word"""
+    return len(word) >= min_length and len(set(word)) <= max_unique_letters
+
+def filter_playable(words, min_length=MIN_LENGTH, max_unique_letters=MAX_UNIQUE_LETTERS, stats=None):
+    """Playable words, counting the kept ones by length and distinct letters into `stats` in the same pass"""
+    stats = {} if stats is None else stats
+    lengths = stats.setdefault("length", {})
+    unique_counts = stats.setdefault("unique_letters", {})
+    for word in words:
+        length = len(word)
+        if length < min_length:
+            continue
+        unique_letters = len(set(word))
+        if unique_letters > max_unique_letters:
+            continue
+        lengths[length] = lengths.get(length, 0) + 1
+        unique_counts[unique_letters] = unique_counts.get(unique_letters, 0) + 1
+        yield word
+
+def decode_lines(lines, status):
+    """Stripped lowercase words from raw lines, counting them in status["lines"]"""
+    for line in lines:
+        status["lines"] += 1
+        yield line.decode("utf-8", errors="replace").strip().lower()
+
+def filter_words(url=DWYL_WORDS_URL, output_file="filtered_words_4to7letters.txt", offline=False):
     """Filter words from the GitHub repository based on length and unique letter requirements"""
-    
-    # URL of the word list
-    url = "https://raw.githubusercontent.com/dwyl/english-words/refs/heads/master/words_alpha.txt"
-    
     try:
-        print("Downloading word list from GitHub...")
-        response = requests.get(url)
-        response.raise_for_status()
+        print("Downloading word list from GitHub..." if not offline else "Reading cached word list...")
         
-        # Get all words and split into lines
-        words = response.text.strip().split('\n')
-        print(f"Downloaded {len(words)} words")
+        # Stream lines into the filter as they download; an unchanged list is read from the cache
+        status = {"lines": 0}
+        words = decode_lines(source_cache.lines(url, offline=offline, status=status), status)
         
-        # Filter words
-        filtered_words = []
-        for word in words:
-            word = word.strip().lower()
-            
-            # Skip words under 4 letters
-            if len(word) < 4:
-                continue
-                
-            # Count unique letters
-            unique_letters = len(set(word))
-            
-            # Skip words with more than 7 unique letters
-            if unique_letters > 7:
-                continue
-                
-            filtered_words.append(word)
+        # Filter words, gathering statistics in the same pass
+        stats = {}
+        filtered_words = list(filter_playable(words, stats=stats))
+        print(f"Read {status['lines']} words ({status.get('cache')})")
         
         print(f"Filtered to {len(filtered_words)} words")
         
         # Save filtered words to file
-        output_file = "filtered_words_4to7letters.txt"
         with open(output_file, 'w') as f:
             for word in filtered_words:
                 f.write(word + '\n')
@@ -45,15 +58,8 @@ def filter_words():
         print(f"Saved filtered words to {output_file}")
         
         # Show some statistics
-        length_distribution = {}
-        unique_letter_distribution = {}
-        
-        for word in filtered_words:
-            length = len(word)
-            unique_letters = len(set(word))
-            
-            length_distribution[length] = length_distribution.get(length, 0) + 1
-            unique_letter_distribution[unique_letters] = unique_letter_distribution.get(unique_letters, 0) + 1
+        length_distribution = stats["length"]
+        unique_letter_distribution = stats["unique_letters"]
         
         print("\nLength distribution:")
         for length in sorted(length_distribution.keys()):
@@ -70,7 +76,7 @@ def filter_words():
             
         return filtered_words
         
-    except requests.exceptions.RequestException as e:
+    except source_cache.SourceUnavailable as e:
         print(f"Error downloading word list: {e}")
         return []
     except Exception as e:
@@ -78,5 +84,5 @@ def filter_words():
         return []
 
 if __name__ == "__main__":
-    filtered_words = filter_words()
+    filtered_words = filter_words(offline="--offline" in sys.argv[1:])
 
@@ -1,11 +1,14 @@
 import os
+import sys
 
-def filter_words():
+from filter_words import filter_playable
+
+# The NYT Spelling Bee cleaned word list, kept outside the repository
+NYT_WORDS_FILE = os.environ.get("NYT_WORDS_FILE", "nyt_spellingbee_cleaned_tight.txt")
+
+def filter_words(input_file=NYT_WORDS_FILE, output_file="filtered_nyt_words_4to7letters.txt"):
     """Filter words from the NYT Spelling Bee cleaned file based on length and unique letter requirements"""
     
-    # File path for the NYT Spelling Bee cleaned file
-    input_file = "/Users/emmabrown/Downloads/nyt_spellingbee_cleaned_tight.txt"
-    
     if not os.path.exists(input_file):
         print(f"Error: {input_file} not found")
         return []
@@ -17,26 +20,13 @@ def filter_words():
         
         print(f"Loaded {len(words)} words from NYT Spelling Bee file")
         
-        # Filter words
-        filtered_words = []
-        for word in words:
-            # Skip words under 4 letters
-            if len(word) < 4:
-                continue
-                
-            # Count unique letters
-            unique_letters = len(set(word))
-            
-            # Skip words with more than 7 unique letters
-            if unique_letters > 7:
-                continue
-                
-            filtered_words.append(word)
+        # Filter words, gathering statistics in the same pass
+        stats = {}
+        filtered_words = list(filter_playable(words, stats=stats))
         
         print(f"Filtered to {len(filtered_words)} words")
         
         # Save filtered words to file
-        output_file = "filtered_nyt_words_4to7letters.txt"
         with open(output_file, 'w') as f:
             for word in filtered_words:
                 f.write(word + '\n')
@@ -44,15 +34,8 @@ def filter_words():
         print(f"Saved filtered words to {output_file}")
         
         # Show some statistics
-        length_distribution = {}
-        unique_letter_distribution = {}
-        
-        for word in filtered_words:
-            length = len(word)
-            unique_letters = len(set(word))
-            
-            length_distribution[length] = length_distribution.get(length, 0) + 1
-            unique_letter_distribution[unique_letters] = unique_letter_distribution.get(unique_letters, 0) + 1
+        length_distribution = stats["length"]
+        unique_letter_distribution = stats["unique_letters"]
         
         print("\nLength distribution:")
         for length in sorted(length_distribution.keys()):
@@ -74,4 +57,4 @@ def filter_words():
         return []
 
 if __name__ == "__main__":
-    filtered_words = filter_words()
+    filtered_words = filter_words(*sys.argv[1:2])
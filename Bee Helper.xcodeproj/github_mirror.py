@@ -0,0 +1,306 @@
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tarfile
+import threading
+import time
+from pathlib import Path
+
+import host_scheduler
+import memory_usage
+import structured_logging
+import upstream
+
+logger = structured_logging.get_logger("github_mirror")
+
+# Local mirror of the tedmiston/spelling-bee-answers `days/` tree.
+#
+# A full sync downloads the repository tarball once and ingests every day file.
+# Incremental syncs list the `days/` tree (two API calls) and only re-download
+# the day files whose blob SHA changed, via raw.githubusercontent.com which does
+# not count against the API rate limit. Archive lookups are then local reads;
+# a lookup that misses only starts a sync in the background, so no request
+# waits on GitHub. A sync works on a copy of the mirror and swaps it in when
+# done, so readers never see a half-ingested one.
+GITHUB_REPO = "tedmiston/spelling-bee-answers"
+GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}"
+GITHUB_RAW_URL = f"https://raw.githubusercontent.com/{GITHUB_REPO}/HEAD"
+
+CACHE_DIR = Path("cache")
+MIRROR_FILE = CACHE_DIR / "github_archive.json"
+
+# Set to a local directory containing `days/` or to a local .tar.gz to mirror a
+# stand-in archive instead of GitHub (used for tests and load testing)
+ARCHIVE_SOURCE = os.environ.get("GITHUB_ARCHIVE_SOURCE", "")
+
+# Minimum number of seconds between automatic incremental syncs
+SYNC_INTERVAL = int(os.environ.get("GITHUB_MIRROR_SYNC_INTERVAL", 3600))
+
+# Fall back to the tarball when more than this many day files changed
+MAX_RAW_DOWNLOADS = 50
+
+HEADERS = {
+    'User-Agent': 'Bee-Helper-App/1.0',
+}
+
+DAY_FILE_PATTERN = re.compile(r'(?:^|/)days/(\d{4}-\d{2}-\d{2})\.json$')
+
+_mirror = None
+_sync_lock = threading.Lock()
+
+memory_usage.track("github_mirror", lambda: _mirror)
+
+
+def git_blob_sha(content):
+    """Compute the git blob SHA of a file's content, as reported by the GitHub tree API"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def parse_day_file(date_str, content):
+    """Convert a day JSON file from the archive into puzzle info, or None if unusable"""
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        logger.error("Invalid JSON in GitHub archive day %s: %s", date_str, e)
+        return None
+
+    if 'validLetters' not in data or 'centerLetter' not in data:
+        logger.warning("Missing required fields in GitHub archive day %s", date_str)
+        return None
+
+    return {
+        "letters": [letter.upper() for letter in data['validLetters']],
+        "center_letter": data['centerLetter'].upper(),
+        "source": f"github.com/tedmiston/spelling-bee-answers ({date_str})"
+    }
+
+
+def load_mirror():
+    """Load the local mirror from disk"""
+    try:
+        if MIRROR_FILE.exists():
+            with open(MIRROR_FILE, 'r') as f:
+                mirror = json.load(f)
+                logger.info("Loaded %s days from GitHub archive mirror", len(mirror.get('days', {})))
+                return mirror
+    except Exception as e:
+        logger.error("Error loading GitHub archive mirror: %s", e)
+    return {"tree_sha": None, "synced_at": 0, "days": {}}
+
+
+def save_mirror(mirror):
+    """Save the local mirror to disk"""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = MIRROR_FILE.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(mirror, f)
+        os.replace(tmp_file, MIRROR_FILE)
+        logger.info("Saved %s days to GitHub archive mirror", len(mirror['days']))
+    except Exception as e:
+        logger.error("Error saving GitHub archive mirror: %s", e)
+
+
+def get_mirror():
+    """Return the in-memory mirror, loading it on first use"""
+    global _mirror
+    if _mirror is None:
+        _mirror = load_mirror()
+    return _mirror
+
+
+def lookup(date_str):
+    """Get puzzle info for a date from the local mirror"""
+    day = get_mirror()["days"].get(date_str)
+    if day:
+        return day["puzzle"]
+    return None
+
+
+def sync_due():
+    """Whether enough time has passed since the last sync to try another one"""
+    return time.time() - get_mirror().get("synced_at", 0) >= SYNC_INTERVAL
+
+
+def _ingest(mirror, files):
+    """Ingest {date_str: content} day files into the mirror, returning the number stored"""
+    stored = 0
+    for date_str, content in files.items():
+        puzzle = parse_day_file(date_str, content)
+        if puzzle:
+            mirror["days"][date_str] = {"sha": git_blob_sha(content), "puzzle": puzzle}
+            stored += 1
+    return stored
+
+
+def _read_tarball(fileobj):
+    """Yield (date_str, content) for every day file in a gzipped repository tarball"""
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            match = DAY_FILE_PATTERN.search(member.name)
+            if member.isfile() and match:
+                yield match.group(1), tar.extractfile(member).read()
+
+
+def _local_tree(source):
+    """Read {date_str: content} for every day file in a local stand-in directory"""
+    days_dir = Path(source) / "days"
+    files = {}
+    for path in sorted(days_dir.glob("*.json")):
+        match = DAY_FILE_PATTERN.search(path.as_posix())
+        if match:
+            files[match.group(1)] = path.read_bytes()
+    return files
+
+
+def _tree_sha(blob_shas):
+    """Stable digest of a {date_str: blob_sha} listing, used for stand-in archives"""
+    listing = "\n".join(f"{name} {sha}" for name, sha in sorted(blob_shas.items()))
+    return hashlib.sha1(listing.encode()).hexdigest()
+
+
+def _sync_local(mirror, full):
+    """Sync the mirror from a local stand-in directory or tarball"""
+    if ARCHIVE_SOURCE.endswith((".tar.gz", ".tgz")):
+        with open(ARCHIVE_SOURCE, 'rb') as f:
+            files = dict(_read_tarball(f))
+    else:
+        files = _local_tree(ARCHIVE_SOURCE)
+
+    blob_shas = {date_str: git_blob_sha(content) for date_str, content in files.items()}
+    tree_sha = _tree_sha(blob_shas)
+    if not full and tree_sha == mirror.get("tree_sha"):
+        return 0, tree_sha
+
+    changed = {
+        date_str: content for date_str, content in files.items()
+        if full or mirror["days"].get(date_str, {}).get("sha") != blob_shas[date_str]
+    }
+    return _ingest(mirror, changed), tree_sha
+
+
+def _get_json(url):
+    """GET a GitHub API URL and decode the JSON body"""
+    import requests
+    with host_scheduler.slot(url):
+        response = requests.get(upstream.resolve(url), headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def _sync_github(mirror, full):
+    """Sync the mirror from GitHub, using the tarball for full syncs and tree SHAs otherwise"""
+    import requests
+    root = _get_json(f"{GITHUB_API_URL}/git/trees/HEAD")
+    days_entry = next((entry for entry in root["tree"] if entry["path"] == "days"), None)
+    if days_entry is None:
+        raise ValueError("No days/ tree in GitHub archive repository")
+
+    tree_sha = days_entry["sha"]
+    if not full and tree_sha == mirror.get("tree_sha"):
+        return 0, tree_sha
+
+    changed = []
+    if not full:
+        listing = _get_json(f"{GITHUB_API_URL}/git/trees/{tree_sha}")
+        for entry in listing["tree"]:
+            match = DAY_FILE_PATTERN.search("days/" + entry["path"])
+            if match and mirror["days"].get(match.group(1), {}).get("sha") != entry["sha"]:
+                changed.append(entry["path"])
+
+    if full or len(changed) > MAX_RAW_DOWNLOADS:
+        logger.info("Downloading GitHub archive tarball")
+        tarball_url = f"{GITHUB_API_URL}/tarball"
+        with host_scheduler.slot(tarball_url):
+            response = requests.get(upstream.resolve(tarball_url), headers=HEADERS, timeout=60)
+        response.raise_for_status()
+        files = dict(_read_tarball(io.BytesIO(response.content)))
+    else:
+        files = {}
+        for name in changed:
+            day_url = f"{GITHUB_RAW_URL}/days/{name}"
+            with host_scheduler.slot(day_url):
+                response = requests.get(upstream.resolve(day_url), headers=HEADERS, timeout=10)
+            response.raise_for_status()
+            files[name[:-len(".json")]] = response.content
+
+    return _ingest(mirror, files), tree_sha
+
+
+def sync(full=False):
+    """Bring the local mirror up to date, returning a summary of what changed"""
+    with _sync_lock:
+        return _sync(full)
+
+
+def _sync(full):
+    """Sync a copy of the mirror and swap it in; the caller holds _sync_lock"""
+    global _mirror
+    current = get_mirror()
+    mirror = dict(current, days=dict(current["days"]))
+    full = full or not mirror["days"]
+    started = time.time()
+    try:
+        if ARCHIVE_SOURCE:
+            updated, tree_sha = _sync_local(mirror, full)
+        else:
+            updated, tree_sha = _sync_github(mirror, full)
+    except Exception as e:
+        logger.error("Error syncing GitHub archive mirror: %s", e)
+        # Don't retry on every lookup while upstream is failing
+        current["synced_at"] = time.time()
+        return {"status": "error", "error": str(e)}
+
+    mirror["tree_sha"] = tree_sha
+    mirror["synced_at"] = time.time()
+    save_mirror(mirror)
+    _mirror = mirror
+    logger.info("GitHub archive mirror sync updated %s days in %.2fs", updated, time.time() - started)
+    return {
+        "status": "ok",
+        "full": full,
+        "updated_days": updated,
+        "total_days": len(mirror["days"]),
+        "tree_sha": tree_sha,
+    }
+
+
+def _run_background_sync(full):
+    try:
+        with host_scheduler.priority(host_scheduler.BACKFILL):
+            _sync(full)
+    finally:
+        _sync_lock.release()
+
+
+def sync_in_background(full=False):
+    """Start a sync on a background thread unless one is already running, returning whether it started"""
+    if not _sync_lock.acquire(blocking=False):
+        return False
+    threading.Thread(target=_run_background_sync, args=(full,), name="github-mirror-sync", daemon=True).start()
+    return True
+
+
+def status():
+    """Describe the state of the local mirror"""
+    # Syncs swap in a new mirror rather than changing this one
+    mirror = get_mirror()
+    dates = sorted(mirror["days"])
+    return {
+        "total_days": len(dates),
+        "first_date": dates[0] if dates else None,
+        "last_date": dates[-1] if dates else None,
+        "tree_sha": mirror.get("tree_sha"),
+        "synced_at": mirror.get("synced_at"),
+        "source": ARCHIVE_SOURCE or GITHUB_REPO,
+        "mirror_file": str(MIRROR_FILE),
+    }
+
+
+if __name__ == "__main__":
+    structured_logging.configure()
+    with host_scheduler.priority(host_scheduler.BACKFILL):
+        print(json.dumps(sync(full="--full" in sys.argv[1:]), indent=2))
@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import structured_logging
+
+logger = structured_logging.get_logger("host_scheduler")
+
+# Politeness scheduler for upstream hosts.
+#
+# Every upstream request takes a slot from its host's scheduler first. A slot
+# needs a token from the host's token bucket and a free connection under the
+# host's concurrency cap. Waiters queue by priority, so interactive requests go
+# ahead of background prefetch and backfill work, and FIFO within a priority.
+INTERACTIVE = 0
+PREFETCH = 1
+BACKFILL = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", PREFETCH: "prefetch", BACKFILL: "backfill"}
+
+# host: (requests per second, burst, max concurrent connections)
+DEFAULT_LIMITS = (1.0, 3, 2)
+HOST_LIMITS = {
+    "word.tips": (1.0, 3, 2),
+    "www.nytimes.com": (0.5, 2, 1),
+    "www.thewordfinder.com": (0.5, 2, 1),
+    "api.github.com": (0.5, 5, 2),
+    "raw.githubusercontent.com": (5.0, 10, 4),
+}
+
+# Override or add limits with e.g. {"word.tips": [2.0, 5, 2]}
+HOST_LIMITS_ENV = "UPSTREAM_HOST_LIMITS"
+
+# Give up on a slot after waiting this long
+DEFAULT_QUEUE_TIMEOUT = 30.0
+
+
+class UpstreamBusy(Exception):
+    """Raised when no slot for an upstream host became available in time"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second up to `burst`"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Take a token and return 0, or return the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class HostScheduler:
+    """Token bucket, connection cap and priority queue for one upstream host"""
+
+    def __init__(self, host, rate, burst, max_concurrent):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.waiters = []
+        self.condition = threading.Condition()
+        self.stats = {
+            "requests": 0,
+            "timeouts": 0,
+            "max_queue_depth": 0,
+            "wait_seconds_total": {name: 0.0 for name in PRIORITY_NAMES.values()},
+            "wait_seconds_max": {name: 0.0 for name in PRIORITY_NAMES.values()},
+            "acquired": {name: 0 for name in PRIORITY_NAMES.values()},
+        }
+
+    def acquire(self, priority=INTERACTIVE, timeout=DEFAULT_QUEUE_TIMEOUT):
+        """Block until this request may go out, returning the seconds spent waiting"""
+        ticket = (priority, next(_sequence))
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self.condition:
+            heapq.heappush(self.waiters, ticket)
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self.waiters))
+            try:
+                while True:
+                    delay = None
+                    if self.waiters[0] == ticket and self.active < self.max_concurrent:
+                        delay = self.bucket.take()
+                        if delay == 0:
+                            break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["timeouts"] += 1
+                        raise UpstreamBusy(f"Timed out waiting for a slot on {self.host}")
+                    self.condition.wait(remaining if delay is None else min(delay, remaining))
+            except BaseException:
+                self.waiters.remove(ticket)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+                raise
+
+            heapq.heappop(self.waiters)
+            self.active += 1
+            # The next waiter may be able to go now too
+            self.condition.notify_all()
+
+            waited = time.monotonic() - started
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            self.stats["requests"] += 1
+            self.stats["acquired"][name] = self.stats["acquired"].get(name, 0) + 1
+            self.stats["wait_seconds_total"][name] = self.stats["wait_seconds_total"].get(name, 0.0) + waited
+            self.stats["wait_seconds_max"][name] = max(self.stats["wait_seconds_max"].get(name, 0.0), waited)
+            return waited
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def metrics(self):
+        with self.condition:
+            return dict(
+                self.stats,
+                queue_depth=len(self.waiters),
+                active=self.active,
+                rate=self.bucket.rate,
+                burst=self.bucket.burst,
+                max_concurrent=self.max_concurrent,
+            )
+
+
+_sequence = itertools.count()
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+_context = threading.local()
+
+
+def _limits_for(host):
+    overrides = {}
+    try:
+        overrides = json.loads(os.environ.get(HOST_LIMITS_ENV) or "{}")
+    except ValueError as e:
+        logger.error("Invalid %s: %s", HOST_LIMITS_ENV, e)
+    return tuple(overrides.get(host) or HOST_LIMITS.get(host) or DEFAULT_LIMITS)
+
+
+def scheduler_for(host):
+    """The scheduler for a host, created with its configured limits on first use"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(host)
+        if scheduler is None:
+            rate, burst, max_concurrent = _limits_for(host)
+            scheduler = _schedulers[host] = HostScheduler(host, rate, burst, max_concurrent)
+        return scheduler
+
+
+def current_priority():
+    """Priority of upstream requests made by the current thread"""
+    return getattr(_context, "priority", INTERACTIVE)
+
+
+@contextmanager
+def priority(level):
+    """Run upstream requests made inside the block at the given priority"""
+    previous = current_priority()
+    _context.priority = level
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+
+@contextmanager
+def slot(url, timeout=DEFAULT_QUEUE_TIMEOUT):
+    """Hold a politeness slot for the host of `url` while the request is made"""
+    scheduler = scheduler_for(urlsplit(url).hostname or "")
+    scheduler.acquire(current_priority(), timeout)
+    try:
+        yield
+    finally:
+        scheduler.release()
+
+
+def metrics():
+    """Queue depth, wait time and limits per upstream host"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {scheduler.host: scheduler.metrics() for scheduler in schedulers}
@@ -0,0 +1,401 @@
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import signal
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# HTTP load test for the API under different deployment configurations:
+# in-process WSGI, gunicorn sync and gthread workers with and without
+# --preload, and the ASGI app (async_app.py) under uvicorn.
+#
+# Each configuration starts from an empty cache in its own working directory,
+# with every upstream site served by a local stand-in (UPSTREAM_REDIRECT_URL)
+# and the GitHub archive mirrored from a generated local archive, so runs never
+# touch the real sites and are repeatable. Client threads replay a weighted mix
+# of /today polls, /archive/<date> browsing and /generate calls, and each
+# configuration reports throughput, p50/p95/p99 latency and error rate.
+#
+#   python loadtest.py                                    # every configuration
+#   python loadtest.py --configs sync,gthread --duration 30 --concurrency 32
+#   python loadtest.py --mix today=50,archive=40,generate=10 --json results.json
+#
+# --threads sets both the threads per gthread worker and the I/O threads per
+# uvicorn worker (ASYNC_IO_THREADS), so the two compare at equal concurrency.
+BASE_DIR = Path(__file__).resolve().parent
+DICTIONARY_FILE = BASE_DIR / "filtered_4plus_7letters.txt"
+
+# name: (server, gunicorn worker class, preload), or None for the in-process WSGI app
+CONFIGS = {
+    "inprocess": None,
+    "sync": ("gunicorn", "sync", False),
+    "sync-preload": ("gunicorn", "sync", True),
+    "gthread": ("gunicorn", "gthread", False),
+    "gthread-preload": ("gunicorn", "gthread", True),
+    "uvicorn": ("uvicorn", None, False),
+}
+
+DEFAULT_MIX = "today=60,archive=30,generate=10"
+DEFAULT_DURATION = 15
+DEFAULT_CONCURRENCY = 16
+DEFAULT_WORKERS = 2
+DEFAULT_THREADS = 4
+
+# Days of history in the generated archive; archive requests go up to twice as
+# far back, so older dates fall through to the scraped stand-in sites
+ARCHIVE_DAYS = 120
+
+# The app's real per-host limits would throttle every cold archive date to one
+# request a second; load tests measure the app, not the politeness budget
+STANDIN_HOST_LIMITS = {
+    host: [1000.0, 1000, 64]
+    for host in ("word.tips", "www.nytimes.com", "www.thewordfinder.com", "api.github.com", "raw.githubusercontent.com")
+}
+
+VOWELS = "AEIOU"
+CONSONANTS = "".join(letter for letter in string.ascii_uppercase if letter not in VOWELS + "S")
+
+
+def puzzle_for(date_str):
+    """Deterministic stand-in puzzle for a date: 7 distinct letters and a center letter"""
+    rng = random.Random(date_str)
+    letters = rng.sample(VOWELS, 2) + rng.sample(CONSONANTS, 5)
+    rng.shuffle(letters)
+    return letters, rng.choice(letters)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Serves pages shaped like each upstream site's, at /<host>/<path>"""
+
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        host, _, path = self.path.lstrip("/").partition("/")
+        match = re.search(r"(\d{4})[/-](\d{2})[/-](\d{2})", path)
+        date_str = "-".join(match.groups()) if match else date.today().isoformat()
+        letters, center = puzzle_for(date_str)
+        pangram = "".join(letters)
+
+        if host == "word.tips" and path.startswith("yesterdays"):
+            body = "<html><body><h1>Yesterday</h1><p>Pangram: genealogy</p></body></html>"
+        elif host == "word.tips":
+            body = f"<html><body><h1>Today's answers</h1><p>{pangram}</p>{center * 3}</body></html>"
+        elif host == "www.nytimes.com":
+            body = f"<html><body><p>Letters: {pangram}</p><p>Center letter: {center}</p></body></html>"
+        elif host == "www.thewordfinder.com":
+            body = f"<html><body><span>{pangram}</span></body></html>"
+        else:
+            self.send_error(404)
+            return
+
+        content = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin(latency):
+    handler = type("Handler", (StandinHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def prepare_workdir(root, name):
+    """Fresh working directory with the dictionary and a generated GitHub archive"""
+    workdir = Path(root) / name
+    days_dir = workdir / "archive" / "days"
+    days_dir.mkdir(parents=True)
+    if DICTIONARY_FILE.exists():
+        os.symlink(DICTIONARY_FILE, workdir / DICTIONARY_FILE.name)
+    today = date.today()
+    for offset in range(ARCHIVE_DAYS):
+        date_str = (today - timedelta(days=offset)).isoformat()
+        letters, center = puzzle_for(date_str)
+        with open(days_dir / f"{date_str}.json", "w") as f:
+            json.dump({"validLetters": [letter.lower() for letter in letters], "centerLetter": center.lower()}, f)
+    return workdir
+
+
+def app_environment(workdir, standin_url):
+    env = dict(os.environ)
+    env.update({
+        "UPSTREAM_REDIRECT_URL": standin_url,
+        "GITHUB_ARCHIVE_MODE": "mirror",
+        "GITHUB_ARCHIVE_SOURCE": str(workdir / "archive"),
+        "UPSTREAM_HOST_LIMITS": json.dumps(STANDIN_HOST_LIMITS),
+        # Every simulated client shares one address
+        "RATE_LIMITS_ENABLED": "0",
+        "LOG_LEVEL": env.get("LOG_LEVEL", "WARNING"),
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")])),
+    })
+    return env
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in ("today", "archive", "generate"):
+            raise ValueError(f"Unknown request kind in mix: {kind}")
+        weights[kind] = float(weight or 1)
+    return weights
+
+
+def request_paths(weights, seed):
+    """Endless stream of (kind, path) drawn from the traffic mix"""
+    rng = random.Random(seed)
+    kinds = list(weights)
+    today = date.today()
+    while True:
+        kind = rng.choices(kinds, [weights[k] for k in kinds])[0]
+        if kind == "today":
+            yield kind, "/api/spelling-bee/today"
+        elif kind == "archive":
+            day = today - timedelta(days=rng.randint(1, ARCHIVE_DAYS * 2))
+            yield kind, f"/api/spelling-bee/archive/{day.isoformat()}"
+        else:
+            letters, center = puzzle_for(str(rng.random()))
+            yield kind, f"/api/spelling-bee/generate?letters={''.join(letters)}&center={center}"
+
+
+def http_client(base_url, timeout):
+    def send(path):
+        try:
+            with urllib.request.urlopen(base_url + path, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (OSError, urllib.error.URLError):
+            return None
+    return send
+
+
+def wsgi_client(app):
+    local = threading.local()
+
+    def send(path):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        try:
+            return client.get(path).status_code
+        except Exception:
+            return None
+    return send
+
+
+def run_load(send, weights, duration, concurrency, seed):
+    """Drive `send` from `concurrency` threads for `duration` seconds, returning per-request samples"""
+    samples = []
+    samples_lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(worker_id):
+        local_samples = []
+        for kind, path in request_paths(weights, seed + worker_id):
+            if time.monotonic() >= deadline:
+                break
+            started = time.perf_counter()
+            status = send(path)
+            local_samples.append((kind, time.perf_counter() - started, status))
+        with samples_lock:
+            samples.extend(local_samples)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.monotonic() - started
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency for _, latency, _ in samples)
+    errors = sum(1 for _, _, status in samples if status is None or status >= 400)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "error_rate": round(errors / len(samples), 4) if samples else 0,
+    }
+
+
+def report(samples, elapsed):
+    result = summarize(samples, elapsed)
+    result["by_kind"] = {
+        kind: summarize([sample for sample in samples if sample[0] == kind], elapsed)
+        for kind in sorted({sample[0] for sample in samples})
+    }
+    return result
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(base_url, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(base_url + "/api/spelling-bee/test", timeout=2):
+                return
+        except (OSError, urllib.error.URLError):
+            time.sleep(0.2)
+    raise RuntimeError("server did not start in time")
+
+
+def server_command(server, worker_class, preload, port, args):
+    if server == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "async_app:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(args.workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ]
+    command = [
+        sys.executable, "-m", "gunicorn", "main:app",
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(args.workers),
+        "--worker-class", worker_class,
+        "--timeout", "60",
+        "--log-level", "warning",
+    ]
+    if worker_class == "gthread":
+        command += ["--threads", str(args.threads)]
+    if preload:
+        command.append("--preload")
+    return command
+
+
+def run_server(name, server, worker_class, preload, workdir, env, args):
+    port = free_port()
+    command = server_command(server, worker_class, preload, port, args)
+    if server == "uvicorn":
+        env = dict(env, ASYNC_IO_THREADS=str(args.threads))
+
+    process = subprocess.Popen(command, cwd=workdir, env=env, start_new_session=True)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url, process)
+        samples, elapsed = run_load(http_client(base_url, args.timeout), parse_mix(args.mix), args.duration, args.concurrency, args.seed)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+    threaded = worker_class == "gthread" or server == "uvicorn"
+    return dict(report(samples, elapsed), workers=args.workers, threads=args.threads if threaded else None)
+
+
+def run_inprocess(workdir, env, args):
+    # The app reads its configuration and cache paths at import time
+    os.environ.update(env)
+    os.chdir(workdir)
+    sys.path.insert(0, str(BASE_DIR))
+    import main
+    samples, elapsed = run_load(wsgi_client(main.app), parse_mix(args.mix), args.duration, args.concurrency, args.seed)
+    return report(samples, elapsed)
+
+
+def print_table(results):
+    print(f"{'config':<18} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<18} failed: {result['error']}")
+            continue
+        print(f"{name:<18} {result['requests']:>9} {result['throughput_rps']:>9} {result['p50_ms']:>9} "
+              f"{result['p95_ms']:>9} {result['p99_ms']:>9} {result['error_rate']:>8.2%}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the API against a local upstream stand-in")
+    parser.add_argument("--configs", default=",".join(CONFIGS), help=f"comma-separated, from {', '.join(CONFIGS)}")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="request weights, e.g. today=60,archive=30,generate=10")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per configuration")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="client threads")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="gunicorn or uvicorn worker processes")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads per gthread worker, and I/O threads per uvicorn worker")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="seconds the stand-in takes per response")
+    parser.add_argument("--timeout", type=float, default=30, help="client timeout per request")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--json", metavar="FILE", help="write results to a JSON file")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.configs.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CONFIGS]
+    if unknown:
+        parser.error(f"unknown configs: {', '.join(unknown)}")
+    parse_mix(args.mix)
+
+    # In-process runs import the app into this process, so do them last
+    names.sort(key=lambda name: name == "inprocess")
+
+    standin = start_standin(args.upstream_latency)
+    standin_url = f"http://127.0.0.1:{standin.server_address[1]}"
+    root = tempfile.mkdtemp(prefix="beehelper-loadtest-")
+    results = {}
+    try:
+        for name in names:
+            workdir = prepare_workdir(root, name)
+            env = app_environment(workdir, standin_url)
+            print(f"Running {name} for {args.duration:g}s at concurrency {args.concurrency}...", file=sys.stderr)
+            try:
+                if CONFIGS[name] is None:
+                    results[name] = run_inprocess(workdir, env, args)
+                else:
+                    results[name] = run_server(name, *CONFIGS[name], workdir, env, args)
+            except Exception as e:
+                results[name] = {"error": str(e)}
+    finally:
+        standin.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mix": parse_mix(args.mix), "duration": args.duration, "concurrency": args.concurrency, "results": results}, f, indent=2)
+    return 1 if any("error" in result for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -1,59 +1,125 @@
-from flask import Flask, jsonify, request
+import startup
+
+from flask import Flask, Response, abort, g, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
+startup.mark("import flask")
 from datetime import date, datetime, timedelta
 import os
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
+import uuid
+import hmac
+import logging
+import functools
+import threading
+import time
 import pickle
+from collections import OrderedDict
 from pathlib import Path
 
+import cpu_pool
+import dictionary_delta
+import github_mirror
+import host_scheduler
+import memory_usage
+import metrics
+import profiling
+import rate_limit
+import response_store
+import source_stats
+import structured_logging
+import timing
+import upstream
+import word_index
+startup.mark("import server modules")
+
+structured_logging.configure()
+logger = structured_logging.get_logger("main")
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that reports encoding time as a Server-Timing span"""
+    
+    def dumps(self, obj, **kwargs):
+        with timing.span("json"):
+            return super().dumps(obj, **kwargs)
+
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 
-# Load the comprehensive dictionary
-DICTIONARY_FILE = "/Users/emmabrown/Downloads/dictionary/filtered_4plus_7letters.txt"
+# Load the comprehensive dictionary; DICTIONARY_FILE points at another wordbase,
+# e.g. one built with `python wordbase.py build`
+DICTIONARY_FILE = os.environ.get("DICTIONARY_FILE", "")
 # For hosted deployment, try alternative paths
-HOSTED_DICTIONARY_FILES = [
+HOSTED_DICTIONARY_FILES = [path for path in [
+    DICTIONARY_FILE,
     "filtered_4plus_7letters.txt",  # Local copy in project directory
     "/app/filtered_4plus_7letters.txt",  # Render deployment path
-    "/Users/emmabrown/Downloads/dictionary/filtered_4plus_7letters.txt"  # Local development path
-]
+] if path]
+# The admin reload endpoint only loads ?file= wordbases from this directory
+WORDBASE_DIR = Path(os.environ.get("WORDBASE_DIR", Path(__file__).resolve().parent))
 CACHE_DIR = Path("cache")
 PUZZLE_CACHE_FILE = CACHE_DIR / "puzzle_cache.pkl"
 PUZZLE_DATABASE_FILE = CACHE_DIR / "puzzle_database.json"
 
-# Ensure cache directory exists
-CACHE_DIR.mkdir(exist_ok=True)
+WORD_TIPS_TODAY_URL = "https://word.tips/spelling-bee-answers/"
+WORD_TIPS_YESTERDAY_URL = "https://word.tips/yesterdays-spelling-bee-answers/"
+
+# "mirror" serves the GitHub archive from a local copy of the repository's days/
+# tree; "api" fetches each date from the GitHub contents API (60 requests/hour
+# unauthenticated)
+GITHUB_ARCHIVE_MODE = os.environ.get("GITHUB_ARCHIVE_MODE", "mirror")
+
+# Shared secret for admin endpoints, sent as the X-Admin-Token header. Admin
+# endpoints are disabled when it isn't set.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+def read_dictionary_file(dict_file):
+    """Read a wordbase file into a set of uppercase words of 4+ letters"""
+    dictionary = set()
+    with open(dict_file, 'r') as f:
+        for line in f:
+            word = line.strip().upper()
+            if word and len(word) >= 4:  # Skip empty lines and short words
+                dictionary.add(word)
+    return dictionary
+
+def write_dictionary_file(dict_file, dictionary):
+    """Write a dictionary as a sorted, lowercase wordbase, replacing the file atomically"""
+    temp_file = f"{dict_file}.{os.getpid()}.tmp"
+    try:
+        with open(temp_file, 'w') as f:
+            for word in sorted(dictionary):
+                f.write(word.lower() + '\n')
+        os.replace(temp_file, dict_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
 
 def load_dictionary():
-    """Load the comprehensive dictionary into a set for fast lookup"""
+    """Load the comprehensive dictionary into a set, returning it with the file it came from (None for the fallback)"""
     dictionary = set()
     
     # Try multiple dictionary file paths
     for dict_file in HOSTED_DICTIONARY_FILES:
         try:
-            with open(dict_file, 'r') as f:
-                for line in f:
-                    word = line.strip().upper()
-                    if word and len(word) >= 4:  # Skip empty lines and short words
-                        dictionary.add(word)
-            print(f"Loaded {len(dictionary)} words from comprehensive dictionary at {dict_file}")
-            return dictionary
+            dictionary = read_dictionary_file(dict_file)
+            logger.info("Loaded %s words from comprehensive dictionary at %s", len(dictionary), dict_file)
+            return dictionary, dict_file
         except FileNotFoundError:
-            print(f"Dictionary file not found: {dict_file}")
+            logger.warning("Dictionary file not found: %s", dict_file)
             continue
         except Exception as e:
-            print(f"Error reading dictionary file {dict_file}: {e}")
+            logger.error("Error reading dictionary file %s: %s", dict_file, e)
             continue
     
     # If no dictionary file found, create a basic fallback
-    print("No dictionary file found, using fallback dictionary")
+    logger.warning("No dictionary file found, using fallback dictionary")
     basic_words = [
         "THE", "AND", "FOR", "ARE", "BUT", "NOT", "YOU", "ALL", "CAN", "HER", "WAS", "ONE", "OUR", "OUT", "DAY", "GET", "HAS", "HIM", "HIS", "HOW", "MAN", "NEW", "NOW", "OLD", "SEE", "TWO", "WAY", "WHO", "BOY", "DID", "ITS", "LET", "PUT", "SAY", "SHE", "TOO", "USE"
     ]
     dictionary.update(basic_words)
-    print(f"Using fallback dictionary with {len(dictionary)} words")
-    return dictionary
+    logger.warning("Using fallback dictionary with %s words", len(dictionary))
+    return dictionary, None
 
 def load_puzzle_cache():
     """Load cached puzzle data"""
@@ -61,24 +127,55 @@ def load_puzzle_cache():
         if PUZZLE_CACHE_FILE.exists():
             with open(PUZZLE_CACHE_FILE, 'rb') as f:
                 cache = pickle.load(f)
-                print(f"Loaded {len(cache)} cached puzzles")
+                logger.info("Loaded %s cached puzzles", len(cache))
                 return cache
     except Exception as e:
-        print(f"Error loading cache: {e}")
+        logger.error("Error loading cache: %s", e)
     return {}
 
 def save_puzzle_cache(cache):
     """Save puzzle data to cache"""
     try:
         with open(PUZZLE_CACHE_FILE, 'wb') as f:
-            pickle.dump(cache, f)
-        print(f"Saved {len(cache)} puzzles to cache")
+            pickle.dump(dict(cache), f)
+        logger.debug("Saved %s puzzles to cache", len(cache))
     except Exception as e:
-        print(f"Error saving cache: {e}")
+        logger.error("Error saving cache: %s", e)
+
+# Filled in by load_state() at startup. DICTIONARY_FILE_LOADED is None while
+# loading or when the fallback word list is in use.
+DICTIONARY = set()
+DICTIONARY_INDEX = word_index.build(DICTIONARY)
+DICTIONARY_VERSION = None
+DICTIONARY_FILE_LOADED = None
+PUZZLE_CACHE = {}
+
+# The same four, replaced as one tuple whenever the dictionary changes. Request
+# code reads it once and uses that snapshot throughout, so a reload landing
+# mid-request never mixes two versions; the separate names are kept for reports
+# and scripts.
+DICTIONARY_STATE = (DICTIONARY, DICTIONARY_INDEX, DICTIONARY_VERSION, DICTIONARY_FILE_LOADED)
+
+# (mtime, size) of the wordbase file when it was loaded, for the file watch
+_dictionary_file_signature = None
+
+# Held while the dictionary is being replaced or patched, so changes apply one
+# at a time against the version they were checked against
+_dictionary_lock = threading.Lock()
+
+def set_dictionary_state(dictionary, index, version, dictionary_file):
+    """Swap in a dictionary; the caller holds _dictionary_lock"""
+    global DICTIONARY, DICTIONARY_INDEX, DICTIONARY_VERSION, DICTIONARY_FILE_LOADED, DICTIONARY_STATE
+    DICTIONARY_STATE = (dictionary, index, version, dictionary_file)
+    DICTIONARY, DICTIONARY_INDEX, DICTIONARY_VERSION, DICTIONARY_FILE_LOADED = DICTIONARY_STATE
 
-# Load dictionary and cache at startup
-DICTIONARY = load_dictionary()
-PUZZLE_CACHE = load_puzzle_cache()
+def file_signature(path):
+    """(mtime, size) of a file, or None if it can't be read"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
 def load_puzzle_database():
     """Load permanent puzzle database from JSON file"""
@@ -86,21 +183,23 @@ def load_puzzle_database():
         if PUZZLE_DATABASE_FILE.exists():
             with open(PUZZLE_DATABASE_FILE, 'r') as f:
                 database = json.load(f)
-                print(f"Loaded {len(database)} puzzles from permanent database")
+                logger.info("Loaded %s puzzles from permanent database", len(database))
                 return database
     except Exception as e:
-        print(f"Error loading puzzle database: {e}")
+        logger.error("Error loading puzzle database: %s", e)
     return {}
 
 def save_puzzle_database(database):
     """Save puzzle database to JSON file"""
     try:
         with open(PUZZLE_DATABASE_FILE, 'w') as f:
-            json.dump(database, f, indent=2)
-        print(f"Saved {len(database)} puzzles to permanent database")
+            # Copy first; other request threads may add puzzles while this writes
+            json.dump(dict(database), f, indent=2)
+        logger.debug("Saved %s puzzles to permanent database", len(database))
     except Exception as e:
-        print(f"Error saving puzzle database: {e}")
+        logger.error("Error saving puzzle database: %s", e)
 
+@timing.timed("cache")
 def get_puzzle_from_database(date_str):
     """Get puzzle data from permanent database"""
     return PUZZLE_DATABASE.get(date_str)
@@ -110,102 +209,166 @@ def save_puzzle_to_database(date_str, puzzle_data):
     PUZZLE_DATABASE[date_str] = puzzle_data
     save_puzzle_database(PUZZLE_DATABASE)
 
-# Load permanent puzzle database
-PUZZLE_DATABASE = load_puzzle_database()
+PUZZLE_DATABASE = {}
+
+def load_state():
+    """Load the dictionary, its index and the puzzle stores"""
+    global PUZZLE_CACHE, PUZZLE_DATABASE, _dictionary_file_signature
+    with startup.phase("create cache dir"):
+        CACHE_DIR.mkdir(exist_ok=True)
+    with startup.phase("load dictionary"):
+        dictionary, dictionary_file = load_dictionary()
+    with startup.phase("build dictionary index"):
+        index = word_index.build(dictionary)
+    with startup.phase("hash dictionary"):
+        version = word_index.dictionary_version(dictionary)
+    with startup.phase("load puzzle cache"):
+        puzzle_cache = load_puzzle_cache()
+    with startup.phase("load puzzle database"):
+        puzzle_database = load_puzzle_database()
+    with _dictionary_lock:
+        set_dictionary_state(dictionary, index, version, dictionary_file)
+        _dictionary_file_signature = dictionary_file and file_signature(dictionary_file)
+    with startup.phase("start cpu pool"):
+        # Workers build their index now, so the first /generate doesn't wait on them
+        cpu_pool.set_dictionary(dictionary, version, warm=True)
+    PUZZLE_CACHE, PUZZLE_DATABASE = puzzle_cache, puzzle_database
+    logger.info("Startup data loaded: %s", ", ".join(f"{p['name']} {p['ms']}ms" for p in startup.report()["phases"]))
+
+# Pool workers re-import the script that started the server, and this module
+# with it; they only need cpu_pool, so they skip the startup loader and the
+# file watch
+IS_POOL_WORKER = cpu_pool.is_worker_process()
+
+# Requests that need the data wait for it (see wait_for_startup)
+if not IS_POOL_WORKER:
+    startup.run(load_state)
 
+memory_usage.track("DICTIONARY", lambda: DICTIONARY)
+memory_usage.track("DICTIONARY_INDEX", lambda: DICTIONARY_INDEX)
+memory_usage.track("PUZZLE_CACHE", lambda: PUZZLE_CACHE)
+memory_usage.track("PUZZLE_DATABASE", lambda: PUZZLE_DATABASE)
+
+@timing.timed("cache")
 def get_cached_puzzle(date_str):
     """Get puzzle data from cache if available"""
     return PUZZLE_CACHE.get(date_str)
 
+def has_stored_puzzle(date_str, archive=False):
+    """Whether a read route can answer for a date from a stored puzzle, without going upstream"""
+    # The archive route only answers from the puzzle cache directly
+    puzzle = get_cached_puzzle(date_str) if archive else (get_puzzle_from_database(date_str) or get_cached_puzzle(date_str))
+    return bool(puzzle and "words" in puzzle)
+
+def has_local_letters(date_str):
+    """Whether a date's letters are in the puzzle database or the local GitHub mirror, so no upstream call is needed"""
+    if get_puzzle_from_database(date_str):
+        return True
+    return GITHUB_ARCHIVE_MODE == "mirror" and github_mirror.lookup(date_str) is not None
+
 def cache_puzzle(date_str, puzzle_data):
     """Cache puzzle data for future use"""
     PUZZLE_CACHE[date_str] = puzzle_data
     save_puzzle_cache(PUZZLE_CACHE)
 
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+def parse_response(parser_name, response, target_date=None):
+    """Parse an upstream response, reusing the memoized result if its content was parsed before"""
+    context = target_date.strftime("%Y-%m-%d") if target_date else ""
+    if response.sha256:
+        response_store.note_parser(response.url, response.sha256, parser_name, context)
+        found, result = response_store.get_parsed(parser_name, response.sha256, context)
+        if found:
+            logger.debug("Reusing parsed %s result for unchanged content", parser_name)
+            return result
+    
+    with timing.span("parse"):
+        result = PARSERS[parser_name](response.content, target_date)
+    if response.sha256:
+        response_store.set_parsed(parser_name, response.sha256, result, context)
+    return result
+
+def make_soup(content):
+    """Parse HTML with BeautifulSoup, imported on first use to keep it out of startup"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, 'html.parser')
+
+def parse_word_tips_today(content, target_date=None):
+    """Extract today's letters from a word.tips answers page"""
+    soup = make_soup(content)
+    all_text = soup.get_text()
+    
+    # First, try to find pangrams (7-letter words that use all letters)
+    pangram_pattern = re.compile(r'\b[A-Z]{7}\b')
+    pangrams = pangram_pattern.findall(all_text.upper())
+    
+    for pangram in pangrams:
+        letters = list(set(pangram))
+        if len(letters) == 7:
+            # Determine center letter by frequency analysis
+            center_letter = determine_center_letter_from_text(letters, all_text)
+            return {
+                "letters": letters,
+                "center_letter": center_letter,
+                "source": "word.tips (pangram found)"
+            }
+    
+    # Look for word lists and extract letters
+    word_pattern = re.compile(r'\b[A-Z]{4,}\b')
+    words = word_pattern.findall(all_text.upper())
+    
+    if words:
+        # Collect all letters from words
+        all_letters = set()
+        for word in words[:50]:  # Check first 50 words
+            all_letters.update(word)
+        
+        # If we have exactly 7 letters, use them
+        if len(all_letters) == 7:
+            center_letter = determine_center_letter_from_text(list(all_letters), all_text)
+            return {
+                "letters": list(all_letters),
+                "center_letter": center_letter,
+                "source": "word.tips (word analysis)"
+            }
+    
+    # Look for specific patterns that might indicate letters
+    letter_pattern = re.compile(r'[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]')
+    letter_matches = letter_pattern.findall(all_text.upper())
+    
+    for match in letter_matches:
+        letters = [c for c in match if c.isalpha()]
+        if len(letters) == 7:
+            center_letter = determine_center_letter_from_text(letters, all_text)
+            return {
+                "letters": letters,
+                "center_letter": center_letter,
+                "source": "word.tips (letter pattern)"
+            }
+    
+    return None
+
 def scrape_word_tips_today():
     """Scrape today's NYT Spelling Bee letters from word.tips"""
     try:
-        url = "https://word.tips/spelling-bee-answers/"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = upstream.fetch(WORD_TIPS_TODAY_URL, headers=BROWSER_HEADERS, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        all_text = soup.get_text()
-        
-        # First, try to find pangrams (7-letter words that use all letters)
-        pangram_pattern = re.compile(r'\b[A-Z]{7}\b')
-        pangrams = pangram_pattern.findall(all_text.upper())
-        
-        for pangram in pangrams:
-            letters = list(set(pangram))
-            if len(letters) == 7:
-                # Determine center letter by frequency analysis
-                center_letter = determine_center_letter_from_text(letters, all_text)
-                return {
-                    "letters": letters,
-                    "center_letter": center_letter,
-                    "source": "word.tips (pangram found)"
-                }
-        
-        # Look for word lists and extract letters
-        word_pattern = re.compile(r'\b[A-Z]{4,}\b')
-        words = word_pattern.findall(all_text.upper())
-        
-        if words:
-            # Collect all letters from words
-            all_letters = set()
-            for word in words[:50]:  # Check first 50 words
-                all_letters.update(word)
-            
-            # If we have exactly 7 letters, use them
-            if len(all_letters) == 7:
-                center_letter = determine_center_letter_from_text(list(all_letters), all_text)
-                return {
-                    "letters": list(all_letters),
-                    "center_letter": center_letter,
-                    "source": "word.tips (word analysis)"
-                }
-        
-        # Look for specific patterns that might indicate letters
-        letter_pattern = re.compile(r'[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]\s*[A-Z]')
-        letter_matches = letter_pattern.findall(all_text.upper())
-        
-        for match in letter_matches:
-            letters = [c for c in match if c.isalpha()]
-            if len(letters) == 7:
-                center_letter = determine_center_letter_from_text(letters, all_text)
-                return {
-                    "letters": letters,
-                    "center_letter": center_letter,
-                    "source": "word.tips (letter pattern)"
-                }
-        
-        # If we can't find today's data, try to get yesterday's as a fallback
-        print("Could not find today's letters, trying yesterday's data")
-        yesterday_data = scrape_word_tips_yesterday()
-        if yesterday_data:
-            return yesterday_data
+        result = parse_response("word_tips_today", response)
+        if result:
+            return result
         
-        # Last resort: use a reasonable fallback
-        print("Using fallback letters")
-        return {
-            "letters": ["A", "E", "I", "L", "N", "O", "T"],
-            "center_letter": "E",
-            "source": "word.tips (fallback)"
-        }
+        # Let the cascade try the next source; canned letters only come from
+        # get_fallback_data at the end of it
+        logger.warning("Could not find today's letters on word.tips")
+        return None
         
     except Exception as e:
-        print(f"Error scraping word.tips: {e}")
-        # Return fallback data instead of None
-        return {
-            "letters": ["A", "E", "I", "L", "N", "O", "T"],
-            "center_letter": "E",
-            "source": "word.tips (error fallback)"
-        }
+        logger.warning("Error scraping word.tips: %s", e)
+        return None
 
 def determine_center_letter_from_text(letters, text):
     """Determine center letter by analyzing letter frequency in text"""
@@ -219,49 +382,63 @@ def determine_center_letter_from_text(letters, text):
     center_letter = max(letter_counts, key=letter_counts.get)
     return center_letter
 
+def parse_word_tips_yesterday(content, target_date=None):
+    """Extract yesterday's letters from a word.tips answers page"""
+    soup = make_soup(content)
+    
+    # Based on the search results, yesterday's puzzle had letters A, E, G, L, N, O, Y with center E
+    # The pangram was "genealogy" which uses all 7 letters
+    pangram_text = soup.find(string=lambda text: text and 'genealogy' in text.lower())
+    if pangram_text:
+        # Extract letters from the pangram
+        pangram = "genealogy"
+        letters = list(set(pangram.upper()))
+        if len(letters) == 7:
+            return {
+                "letters": letters,
+                "center_letter": "E",  # Based on search results
+                "source": "word.tips (yesterday)"
+            }
+    
+    return None
+
 def scrape_word_tips_yesterday():
     """Scrape yesterday's NYT Spelling Bee letters from word.tips"""
     try:
-        url = "https://word.tips/yesterdays-spelling-bee-answers/"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = upstream.fetch(WORD_TIPS_YESTERDAY_URL, headers=BROWSER_HEADERS, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        result = parse_response("word_tips_yesterday", response)
+        if result:
+            return result
         
-        # Based on the search results, yesterday's puzzle had letters A, E, G, L, N, O, Y with center E
-        # The pangram was "genealogy" which uses all 7 letters
-        pangram_text = soup.find(string=lambda text: text and 'genealogy' in text.lower())
-        if pangram_text:
-            # Extract letters from the pangram
-            pangram = "genealogy"
-            letters = list(set(pangram.upper()))
-            if len(letters) == 7:
+        logger.warning("Could not find yesterday's letters on word.tips")
+        return None
+        
+    except Exception as e:
+        logger.warning("Error scraping word.tips yesterday: %s", e)
+        return None
+
+def parse_word_finder_archive(content, target_date=None):
+    """Extract letters from a thewordfinder.com answers page"""
+    soup = make_soup(content)
+    
+    # Look for pangram or letter patterns
+    pangram_patterns = soup.find_all(string=re.compile(r'[A-Z]{7,}'))
+    if pangram_patterns:
+        for pattern in pangram_patterns:
+            pangram = pattern.strip().upper()
+            if len(set(pangram)) == 7:  # Exactly 7 unique letters
+                letters = list(set(pangram))
+                # Try to determine center letter from frequency
+                center_letter = determine_center_letter(letters, [])
                 return {
                     "letters": letters,
-                    "center_letter": "E",  # Based on search results
-                    "source": "word.tips (yesterday)"
+                    "center_letter": center_letter,
+                    "source": f"thewordfinder.com ({target_date.strftime('%Y-%m-%d') if target_date else 'today'})"
                 }
-        
-        # Hardcoded fallback based on yesterday's actual puzzle (Aug 4, 2025)
-        print("Using hardcoded yesterday's letters from word.tips")
-        return {
-            "letters": ["G", "U", "I", "L", "T", "E", "D"],
-            "center_letter": "E",
-            "source": "word.tips (yesterday, hardcoded)"
-        }
-        
-    except Exception as e:
-        print(f"Error scraping word.tips yesterday: {e}")
-        # Return fallback data instead of None
-        return {
-            "letters": ["G", "U", "I", "L", "T", "E", "D"],
-            "center_letter": "E",
-            "source": "word.tips (yesterday, error fallback)"
-        }
+    
+    return None
 
 def scrape_word_finder_archive(target_date=None):
     """Scrape archive data from The Word Finder"""
@@ -273,38 +450,42 @@ def scrape_word_finder_archive(target_date=None):
         else:
             url = "https://www.thewordfinder.com/spelling-bee-answers/"
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = upstream.fetch(url, headers=BROWSER_HEADERS, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for pangram or letter patterns
-        pangram_patterns = soup.find_all(string=re.compile(r'[A-Z]{7,}'))
-        if pangram_patterns:
-            for pattern in pangram_patterns:
-                pangram = pattern.strip().upper()
-                if len(set(pangram)) == 7:  # Exactly 7 unique letters
-                    letters = list(set(pangram))
-                    # Try to determine center letter from frequency
-                    center_letter = determine_center_letter(letters, [])
-                    return {
-                        "letters": letters,
-                        "center_letter": center_letter,
-                        "source": f"thewordfinder.com ({target_date.strftime('%Y-%m-%d') if target_date else 'today'})"
-                    }
-        
-        return None
+        return parse_response("word_finder_archive", response, target_date)
         
     except Exception as e:
-        print(f"Error scraping thewordfinder.com: {e}")
+        logger.warning("Error scraping thewordfinder.com: %s", e)
         return None
 
+def parse_github_contents(content, target_date=None):
+    """Extract letters from a GitHub contents API day file"""
+    data = json.loads(content)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("GitHub API response keys: %s", list(data.keys()))
+    
+    # The GitHub API returns the data directly, not in a content field
+    if 'validLetters' in data and 'centerLetter' in data:
+        letters = [letter.upper() for letter in data['validLetters']]
+        center_letter = data['centerLetter'].upper()
+        
+        logger.debug("Successfully extracted letters: %s, center: %s", letters, center_letter)
+        
+        return {
+            "letters": letters,
+            "center_letter": center_letter,
+            "source": f"github.com/tedmiston/spelling-bee-answers ({target_date.strftime('%Y-%m-%d')})"
+        }
+    
+    logger.warning("Missing required fields in GitHub data: %s", list(data.keys()))
+    return None
+
 def fetch_github_archive(target_date=None):
     """Fetch archive data from GitHub repository"""
+    if GITHUB_ARCHIVE_MODE == "mirror":
+        return fetch_github_mirror(target_date)
+    
     try:
         if target_date is None:
             target_date = date.today()
@@ -315,44 +496,85 @@ def fetch_github_archive(target_date=None):
         # GitHub API URL for the repository
         api_url = f"https://api.github.com/repos/tedmiston/spelling-bee-answers/contents/days/{date_str}.json"
         
-        print(f"Trying to fetch from GitHub: {api_url}")
+        logger.debug("Trying to fetch from GitHub: %s", api_url)
         
         headers = {
             'User-Agent': 'Bee-Helper-App/1.0',
             'Accept': 'application/vnd.github.v3.raw'
         }
         
-        response = requests.get(api_url, headers=headers, timeout=10)
+        response = upstream.fetch(api_url, headers=headers, timeout=10)
         
-        print(f"GitHub API response status: {response.status_code}")
+        logger.debug("GitHub API response status: %s", response.status_code)
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"GitHub API response keys: {list(data.keys())}")
-            
-            # The GitHub API returns the data directly, not in a content field
-            if 'validLetters' in data and 'centerLetter' in data:
-                letters = [letter.upper() for letter in data['validLetters']]
-                center_letter = data['centerLetter'].upper()
-                
-                print(f"Successfully extracted letters: {letters}, center: {center_letter}")
-                
-                return {
-                    "letters": letters,
-                    "center_letter": center_letter,
-                    "source": f"github.com/tedmiston/spelling-bee-answers ({date_str})"
-                }
-            else:
-                print(f"Missing required fields in GitHub data: {list(data.keys())}")
+            return parse_response("github_contents", response, target_date)
         else:
-            print(f"GitHub API returned status {response.status_code}")
+            logger.debug("GitHub API returned status %s", response.status_code)
         
         return None
         
     except Exception as e:
-        print(f"Error fetching from GitHub: {e}")
+        logger.warning("Error fetching from GitHub: %s", e)
         return None
 
+def fetch_github_mirror(target_date=None):
+    """Look up archive data in the local GitHub archive mirror, starting a background sync if it's stale"""
+    if target_date is None:
+        target_date = date.today()
+    
+    date_str = target_date.strftime('%Y-%m-%d')
+    puzzle = github_mirror.lookup(date_str)
+    if puzzle is None and target_date <= date.today() and github_mirror.sync_due():
+        # Serve the miss now; the day will be there for later requests
+        github_mirror.sync_in_background()
+    return puzzle
+
+def parse_nyt_forum_archive(content, target_date=None):
+    """Extract letters from an NYT Spelling Bee forum page"""
+    soup = make_soup(content)
+    
+    # Look for letters in the forum content
+    # The forum typically shows the letters in the puzzle description
+    page_text = soup.get_text()
+    
+    # Common patterns for finding letters in NYT forum
+    letter_patterns = [
+        r'Letters?:\s*([A-Z]{7})',
+        r'([A-Z])\s*is\s*the\s*center\s*letter',
+        r'Center\s*letter:\s*([A-Z])',
+        r'([A-Z])\s*\(center\)',
+        r'([A-Z])\s*in\s*the\s*middle',
+    ]
+    
+    letters = []
+    center_letter = None
+    
+    # Try to find letters in the text
+    for pattern in letter_patterns:
+        match = re.search(pattern, page_text, re.IGNORECASE)
+        if match:
+            if len(match.group(1)) == 7:
+                letters = list(match.group(1))
+            elif len(match.group(1)) == 1:
+                center_letter = match.group(1)
+    
+    # If we found letters, determine center letter if not already found
+    if letters and not center_letter:
+        center_letter = determine_center_letter(letters, [])
+    
+    if letters and center_letter:
+        logger.debug("Successfully extracted letters: %s, center: %s", letters, center_letter)
+        
+        return {
+            "letters": letters,
+            "center_letter": center_letter,
+            "source": f"nytimes.com/forum ({target_date.strftime('%Y-%m-%d')})"
+        }
+    
+    logger.warning("Could not extract letters from NYT forum")
+    return None
+
 def scrape_nyt_forum_archive(target_date=None):
     """Scrape archive data from NYT Spelling Bee forum"""
     try:
@@ -363,65 +585,21 @@ def scrape_nyt_forum_archive(target_date=None):
         date_str = target_date.strftime('%Y/%m/%d')
         url = f"https://www.nytimes.com/{date_str}/crosswords/spelling-bee-forum.html"
         
-        print(f"Trying to fetch from NYT forum: {url}")
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        logger.debug("Trying to fetch from NYT forum: %s", url)
         
-        response = requests.get(url, headers=headers, timeout=10)
+        response = upstream.fetch(url, headers=BROWSER_HEADERS, timeout=10)
         
-        print(f"NYT forum response status: {response.status_code}")
+        logger.debug("NYT forum response status: %s", response.status_code)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for letters in the forum content
-            # The forum typically shows the letters in the puzzle description
-            page_text = soup.get_text()
-            
-            # Common patterns for finding letters in NYT forum
-            letter_patterns = [
-                r'Letters?:\s*([A-Z]{7})',
-                r'([A-Z])\s*is\s*the\s*center\s*letter',
-                r'Center\s*letter:\s*([A-Z])',
-                r'([A-Z])\s*\(center\)',
-                r'([A-Z])\s*in\s*the\s*middle',
-            ]
-            
-            letters = []
-            center_letter = None
-            
-            # Try to find letters in the text
-            for pattern in letter_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
-                if match:
-                    if len(match.group(1)) == 7:
-                        letters = list(match.group(1))
-                    elif len(match.group(1)) == 1:
-                        center_letter = match.group(1)
-            
-            # If we found letters, determine center letter if not already found
-            if letters and not center_letter:
-                center_letter = determine_center_letter(letters, [])
-            
-            if letters and center_letter:
-                print(f"Successfully extracted letters: {letters}, center: {center_letter}")
-                
-                return {
-                    "letters": letters,
-                    "center_letter": center_letter,
-                    "source": f"nytimes.com/forum ({target_date.strftime('%Y-%m-%d')})"
-                }
-            else:
-                print(f"Could not extract letters from NYT forum")
+            return parse_response("nyt_forum_archive", response, target_date)
         else:
-            print(f"NYT forum returned status {response.status_code}")
+            logger.debug("NYT forum returned status %s", response.status_code)
         
         return None
         
     except Exception as e:
-        print(f"Error scraping NYT forum: {e}")
+        logger.warning("Error scraping NYT forum: %s", e)
         return None
 
 def get_puzzle_data_for_date(target_date=None):
@@ -434,42 +612,80 @@ def get_puzzle_data_for_date(target_date=None):
     # Check permanent database first
     database_puzzle = get_puzzle_from_database(date_str)
     if database_puzzle:
-        print(f"Found puzzle for {date_str} in permanent database")
+        logger.debug("Found puzzle for %s in permanent database", date_str)
+        metrics.PUZZLE_LOOKUPS.inc("database")
         return database_puzzle
     
     # Check cache second
     cached_puzzle = get_cached_puzzle(date_str)
     if cached_puzzle:
-        print(f"Using cached puzzle for {date_str}")
+        logger.debug("Using cached puzzle for %s", date_str)
+        metrics.PUZZLE_LOOKUPS.inc("puzzle_cache")
         # Save to permanent database
         save_puzzle_to_database(date_str, cached_puzzle)
         return cached_puzzle
 
-    # Try multiple sources in order of preference
+    # Try the sources that apply to this date, fastest expected valid answer first
+    klass = source_stats.date_class(target_date)
     sources = [
         ("github.com/tedmiston/spelling-bee-answers", lambda: fetch_github_archive(target_date)),
-        ("word.tips (today)", lambda: scrape_word_tips_today() if target_date == date.today() else None),
-        ("word.tips (yesterday)", lambda: scrape_word_tips_yesterday() if target_date == date.today() - timedelta(days=1) else None),
         ("nytimes.com/forum", lambda: scrape_nyt_forum_archive(target_date)),
         ("thewordfinder.com", lambda: scrape_word_finder_archive(target_date)),
-        ("fallback", lambda: get_fallback_data(target_date))
     ]
+    if klass == "today":
+        sources.insert(1, ("word.tips (today)", scrape_word_tips_today))
+    elif klass == "yesterday":
+        sources.insert(1, ("word.tips (yesterday)", scrape_word_tips_yesterday))
+    sources = source_stats.order(sources, klass)
+    
+    # The fallback always answers, so it stays last and isn't tracked
+    sources.append(("fallback", lambda: get_fallback_data(target_date)))
     
     for source_name, source_func in sources:
+        started = time.monotonic()
         try:
-            result = source_func()
-            if result:
-                print(f"Successfully got data from {source_name}")
-                # Save to both cache and permanent database
+            with timing.span(f"upstream.{source_name}"):
+                result = source_func()
+        except Exception as e:
+            logger.warning("Error with %s: %s", source_name, e)
+            result = None
+        
+        elapsed = time.monotonic() - started
+        valid = is_valid_puzzle_info(result)
+        if valid and source_name != "fallback" and is_canned_puzzle_info(result):
+            # Canned letters from a source are a failure, not a fast success
+            logger.info("Ignoring canned letters from %s: %s", source_name, result.get('source'))
+            valid = False
+            result = None
+        metrics.UPSTREAM_SOURCE_DURATION.observe(elapsed, source_name, klass, "valid" if valid else "failed")
+        if source_name != "fallback":
+            source_stats.record(source_name, klass, valid, elapsed)
+        if valid:
+            logger.info("Successfully got data from %s", source_name)
+            metrics.PUZZLE_LOOKUPS.inc("fallback" if source_name == "fallback" else "upstream")
+            if source_name != "fallback":
+                # Save to both cache and permanent database; canned letters
+                # aren't stored, so a later request can still find the real ones
                 cache_puzzle(date_str, result)
                 save_puzzle_to_database(date_str, result)
-                return result
-        except Exception as e:
-            print(f"Error with {source_name}: {e}")
-            continue
+            return result
+        if result:
+            logger.info("Ignoring invalid letters from %s: %s", source_name, result.get('letters'))
     
     return None
 
+def is_valid_puzzle_info(puzzle_info):
+    """Whether scraped puzzle info has 7 distinct letters including the center letter"""
+    if not puzzle_info:
+        return False
+    letters = puzzle_info.get("letters") or []
+    return len(set(letters)) == 7 and len(letters) == 7 and puzzle_info.get("center_letter") in letters
+
+def is_canned_puzzle_info(puzzle_info):
+    """Whether puzzle info is placeholder letters rather than a scraped puzzle"""
+    source = (puzzle_info.get("source") or "").lower()
+    return "fallback" in source or "hardcoded" in source
+
 def get_fallback_data(target_date):
     """Get fallback data for a specific date"""
     if target_date == date.today():
@@ -493,61 +709,92 @@ def get_fallback_data(target_date):
             "source": f"fallback ({target_date.strftime('%Y-%m-%d')})"
         }
 
+def parse_todays_words(content, target_date=None):
+    """Extract candidate answer words from a word.tips answers page"""
+    soup = make_soup(content)
+    
+    # Look for word lists in the page
+    words = []
+    
+    # Find all text that looks like words (4+ letters, all caps)
+    word_elements = soup.find_all(string=re.compile(r'^[A-Z]{4,}$'))
+    for element in word_elements:
+        word = element.strip()
+        if word and len(word) >= 4:
+            words.append(word)
+    
+    # Also look for words in specific sections
+    word_sections = soup.find_all(['div', 'span'], string=re.compile(r'^[a-zA-Z]{4,}$'))
+    for element in word_sections:
+        word = element.get_text().strip().upper()
+        if word and len(word) >= 4 and word not in words:
+            words.append(word)
+    
+    # Look for words in any text content
+    all_text = soup.get_text()
+    # Find all 4+ letter sequences that could be words
+    potential_words = re.findall(r'\b[A-Z]{4,}\b', all_text.upper())
+    for word in potential_words:
+        if word not in words:
+            words.append(word)
+    
+    # Also look for words in lists or tables
+    list_elements = soup.find_all(['li', 'td', 'tr'])
+    for element in list_elements:
+        text = element.get_text().strip().upper()
+        # Split by common delimiters
+        for part in re.split(r'[,\s]+', text):
+            if len(part) >= 4 and part.isalpha():
+                words.append(part)
+    
+    return list(set(words))  # Remove duplicates
+
 def scrape_todays_words():
     """Scrape today's complete word list from word.tips"""
     try:
-        url = "https://word.tips/spelling-bee-answers/"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = upstream.fetch(WORD_TIPS_TODAY_URL, headers=BROWSER_HEADERS, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for word lists in the page
-        words = []
-        
-        # Find all text that looks like words (4+ letters, all caps)
-        word_elements = soup.find_all(string=re.compile(r'^[A-Z]{4,}$'))
-        for element in word_elements:
-            word = element.strip()
-            if word and len(word) >= 4:
-                words.append(word)
-        
-        # Also look for words in specific sections
-        word_sections = soup.find_all(['div', 'span'], string=re.compile(r'^[a-zA-Z]{4,}$'))
-        for element in word_sections:
-            word = element.get_text().strip().upper()
-            if word and len(word) >= 4 and word not in words:
-                words.append(word)
-        
-        # Look for words in any text content
-        all_text = soup.get_text()
-        # Find all 4+ letter sequences that could be words
-        potential_words = re.findall(r'\b[A-Z]{4,}\b', all_text.upper())
-        for word in potential_words:
-            if word not in words:
-                words.append(word)
-        
-        # Also look for words in lists or tables
-        list_elements = soup.find_all(['li', 'td', 'tr'])
-        for element in list_elements:
-            text = element.get_text().strip().upper()
-            # Split by common delimiters
-            for part in re.split(r'[,\s]+', text):
-                if len(part) >= 4 and part.isalpha():
-                    words.append(part)
-        
-        unique_words = list(set(words))  # Remove duplicates
-        print(f"Found {len(unique_words)} potential words from word.tips")
+        unique_words = parse_response("todays_words", response)
+        logger.info("Found %s potential words from word.tips", len(unique_words))
         return unique_words
         
     except Exception as e:
-        print(f"Error scraping words from word.tips: {e}")
+        logger.warning("Error scraping words from word.tips: %s", e)
         return None
 
+# Parsers that can be re-run over the raw response store, by name
+PARSERS = {
+    "word_tips_today": parse_word_tips_today,
+    "word_tips_yesterday": parse_word_tips_yesterday,
+    "word_finder_archive": parse_word_finder_archive,
+    "github_contents": parse_github_contents,
+    "nyt_forum_archive": parse_nyt_forum_archive,
+    "todays_words": parse_todays_words,
+}
+
+def reparse_stored_responses(parser_name=None):
+    """Re-run the current parsers over every stored response, without the network"""
+    summary = {"parsed": 0, "changed": 0, "errors": 0}
+    for url, entry, name, context in response_store.stored_responses(parser_name):
+        target_date = datetime.strptime(context, "%Y-%m-%d").date() if context else None
+        try:
+            content = response_store.read(entry["sha256"])
+            result = PARSERS[name](content, target_date)
+        except Exception as e:
+            logger.error("Error reparsing %s (%s) with %s: %s", url, entry['fetched_on'], name, e)
+            summary["errors"] += 1
+            continue
+        
+        found, previous = response_store.get_parsed(name, entry["sha256"], context)
+        if not found or previous != result:
+            summary["changed"] += 1
+        response_store.set_parsed(name, entry["sha256"], result, context)
+        summary["parsed"] += 1
+    
+    logger.info("Reparsed %s stored responses, %s results changed, %s errors", summary['parsed'], summary['changed'], summary['errors'])
+    return summary
+
 def get_today_nyt_letters():
     """Get today's actual NYT Spelling Bee letters"""
     return get_puzzle_data_for_date(date.today())
@@ -562,14 +809,17 @@ def get_todays_puzzle_data():
     letters = puzzle_info["letters"]
     center_letter = puzzle_info["center_letter"]
     
+    # Filter and generate against one dictionary version
+    state = DICTIONARY_STATE
+    
     # Try to scrape the complete word list from word.tips
     scraped_words = scrape_todays_words()
     if scraped_words:
-        print(f"Scraped {len(scraped_words)} words from word.tips")
+        logger.info("Scraped %s words from word.tips", len(scraped_words))
         # Filter words to only include those that use our letters and center letter
         valid_words = []
         for word in scraped_words:
-            if is_valid_spelling_bee_word(word, letters, center_letter):
+            if is_valid_spelling_bee_word(word, letters, center_letter, state[0]):
                 valid_words.append(word)
         
         # If we have a reasonable number of words (at least 20), use them
@@ -583,11 +833,11 @@ def get_todays_puzzle_data():
             }
         elif len(valid_words) > 0:
             # If we have some words but not enough, use them as a starting point
-            print(f"Only found {len(valid_words)} words from scraping, using dictionary generation")
+            logger.info("Only found %s words from scraping, using dictionary generation", len(valid_words))
     
     # Fallback to dictionary generation
-    print("Using dictionary-generated words")
-    words = generate_spelling_bee_words(letters, center_letter)
+    logger.info("Using dictionary-generated words")
+    words = generate_spelling_bee_words(letters, center_letter, state)
     return {
         "date": str(date.today()),
         "center_letter": center_letter,
@@ -614,7 +864,7 @@ def determine_center_letter(letters, word_elements):
     center_letter = max(letter_counts, key=letter_counts.get)
     return center_letter
 
-def is_valid_spelling_bee_word(word, letters, center_letter):
+def is_valid_spelling_bee_word(word, letters, center_letter, dictionary=None):
     """
     Check if a word is valid for Spelling Bee:
     - Must be at least 4 letters long
@@ -639,23 +889,214 @@ def is_valid_spelling_bee_word(word, letters, center_letter):
             return False
     
     # Must be in dictionary
-    if word_upper not in DICTIONARY:
+    if dictionary is None:
+        dictionary = DICTIONARY_STATE[0]
+    if word_upper not in dictionary:
         return False
     
     return True
 
-def generate_spelling_bee_words(letters, center_letter):
+@metrics.timed(metrics.FUNCTION_DURATION, "generate_spelling_bee_words")
+@timing.timed("generate")
+def generate_spelling_bee_words(letters, center_letter, state=None):
     """Generate all valid Spelling Bee words for the given letters"""
+    dictionary, index, _, _ = state or DICTIONARY_STATE
+    words = word_index.find_words(index, letters, center_letter)
+    if words is None:
+        words = scan_spelling_bee_words(letters, center_letter, dictionary)
+    return words
+
+def scan_spelling_bee_words(letters, center_letter, dictionary=None):
+    """Generate valid words by checking every word in the dictionary (reference for the index)"""
     valid_words = []
-    letter_set = set(letters)
+    if dictionary is None:
+        dictionary = DICTIONARY_STATE[0]
     
     # Check each word in the dictionary
-    for word in DICTIONARY:
-        if is_valid_spelling_bee_word(word, letters, center_letter):
+    for word in dictionary:
+        if is_valid_spelling_bee_word(word, letters, center_letter, dictionary):
             valid_words.append(word)
     
     return sorted(valid_words)
 
+def install_dictionary(dictionary, dictionary_file=None):
+    """Replace the dictionary and rebuild its letter-mask index"""
+    index = word_index.build(dictionary)
+    version = word_index.dictionary_version(dictionary)
+    with _dictionary_lock:
+        set_dictionary_state(dictionary, index, version, dictionary_file)
+    cpu_pool.set_dictionary(dictionary, version)
+    clear_generation_memo()
+
+def patch_dictionary(delta):
+    """Apply a parsed wordbase delta to the live dictionary, updating only the index groups it touches"""
+    global _dictionary_file_signature
+    with _dictionary_lock:
+        current, current_index, current_version, dictionary_file = DICTIONARY_STATE
+        if current_version == delta["to"]:
+            return {"status": "current", "version": current_version}
+        if current_version != delta["from"]:
+            return {"status": "conflict", "version": current_version, "delta_from": delta["from"]}
+        
+        # Same rules as read_dictionary_file; the set and index are copied,
+        # so requests already running keep the version they started with
+        added = {word.upper() for word in delta["added"] if len(word) >= 4}
+        removed = {word.upper() for word in delta["removed"]}
+        dictionary = (current - removed) | added
+        version = word_index.dictionary_version(dictionary)
+        if version != delta["to"]:
+            return {"status": "mismatch", "version": current_version, "result": version, "delta_to": delta["to"]}
+        
+        index = word_index.apply_delta(current_index, added, removed, len(dictionary))
+        set_dictionary_state(dictionary, index, version, dictionary_file)
+        
+        # Write the patched words back to the served file, so other workers'
+        # file watches and the next restart load them too. Without a file
+        # (the fallback word list) the patch lasts only for this process.
+        persisted = False
+        if dictionary_file:
+            try:
+                write_dictionary_file(dictionary_file, dictionary)
+                _dictionary_file_signature = file_signature(dictionary_file)
+                persisted = True
+            except Exception as e:
+                logger.error("Error writing patched dictionary to %s: %s", dictionary_file, e)
+    # Tasks fall back to this thread until the new pool workers are up
+    cpu_pool.set_dictionary(dictionary, version, warm=True)
+    clear_generation_memo()
+    logger.info("Applied dictionary delta: +%s -%s words, now %s words at version %s",
+                len(added), len(removed), len(dictionary), version)
+    return {"status": "applied", "version": version, "added": len(added), "removed": len(removed), "words": len(dictionary),
+            "file": dictionary_file, "persisted": persisted}
+
+# Seconds between checks of the loaded wordbase file for changes; 0 turns the
+# watch off (reloads can still be started from the admin endpoint)
+DICTIONARY_WATCH_INTERVAL = float(os.environ.get("DICTIONARY_WATCH_INTERVAL", 30))
+
+_reload_lock = threading.Lock()
+DICTIONARY_RELOAD = {"status": "idle"}
+
+def reload_dictionary(dictionary_file):
+    """Load a wordbase and build its index on this thread while the current dictionary keeps serving, then swap it in"""
+    global _dictionary_file_signature
+    started = time.perf_counter()
+    signature = file_signature(dictionary_file)
+    try:
+        dictionary = read_dictionary_file(dictionary_file)
+        if not dictionary:
+            raise ValueError("no words of 4+ letters")
+    except Exception as e:
+        logger.error("Error reloading dictionary from %s: %s", dictionary_file, e)
+        # Don't retry the same broken file on every watch; the signature is
+        # the served file's, so a failed reload of another file leaves it be
+        if dictionary_file == DICTIONARY_STATE[3]:
+            _dictionary_file_signature = signature
+        return {"status": "error", "file": dictionary_file, "error": str(e)}
+    
+    version = word_index.dictionary_version(dictionary)
+    with _dictionary_lock:
+        unchanged = version == DICTIONARY_STATE[2]
+        if unchanged:
+            # Same words; keep the index, just follow the file
+            set_dictionary_state(*DICTIONARY_STATE[:3], dictionary_file)
+            _dictionary_file_signature = signature
+    if unchanged:
+        return {"status": "current", "file": dictionary_file, "version": version}
+    
+    index = word_index.build(dictionary)
+    # Start the new pool workers first, so requests never wait on them
+    cpu_pool.set_dictionary(dictionary, version, warm=True)
+    with _dictionary_lock:
+        set_dictionary_state(dictionary, index, version, dictionary_file)
+        _dictionary_file_signature = signature
+    clear_generation_memo()
+    
+    ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("Reloaded dictionary from %s: %s words at version %s in %sms", dictionary_file, len(dictionary), version, ms)
+    return {"status": "reloaded", "file": dictionary_file, "version": version, "words": len(dictionary), "ms": ms}
+
+def _run_reload(dictionary_file):
+    global DICTIONARY_RELOAD
+    try:
+        result = reload_dictionary(dictionary_file)
+    except Exception as e:
+        logger.error("Error reloading dictionary from %s: %s", dictionary_file, e)
+        result = {"status": "error", "file": dictionary_file, "error": str(e)}
+    DICTIONARY_RELOAD = dict(result, finished_at=datetime.now().isoformat(timespec="seconds"))
+    _reload_lock.release()
+
+def wordbase_file(name):
+    """Path of a wordbase in WORDBASE_DIR, or None if the name points outside it"""
+    wordbase_dir = WORDBASE_DIR.resolve()
+    path = (wordbase_dir / name).resolve()
+    if path.parent != wordbase_dir or not path.is_file():
+        return None
+    return str(path)
+
+def start_dictionary_reload(dictionary_file=None, wait=False):
+    """Reload the dictionary on a background thread, returning False if a reload is already running"""
+    global DICTIONARY_RELOAD
+    dictionary_file = dictionary_file or DICTIONARY_STATE[3] or HOSTED_DICTIONARY_FILES[0]
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    DICTIONARY_RELOAD = {"status": "running", "file": dictionary_file, "started_at": datetime.now().isoformat(timespec="seconds")}
+    thread = threading.Thread(target=_run_reload, args=(dictionary_file,), name="dictionary-reload", daemon=True)
+    thread.start()
+    if wait:
+        thread.join()
+    return True
+
+def watch_dictionary_file():
+    """Reload the dictionary whenever its wordbase file changes"""
+    while True:
+        time.sleep(DICTIONARY_WATCH_INTERVAL)
+        dictionary_file = DICTIONARY_STATE[3]
+        if dictionary_file is None or not startup.is_ready():
+            continue
+        signature = file_signature(dictionary_file)
+        if signature is not None and signature != _dictionary_file_signature:
+            logger.info("Dictionary file %s changed, reloading", dictionary_file)
+            start_dictionary_reload(dictionary_file)
+
+if DICTIONARY_WATCH_INTERVAL > 0 and not IS_POOL_WORKER:
+    threading.Thread(target=watch_dictionary_file, name="dictionary-watch", daemon=True).start()
+
+# Custom puzzles generated recently, keyed by (dictionary version, letters,
+# center letter) so a dictionary change never serves stale words
+GENERATION_MEMO_SIZE = 1024
+_generation_memo = OrderedDict()
+_generation_memo_lock = threading.Lock()
+
+def generate_custom_words(letters, center_letter):
+    """Words for a custom puzzle: memoized, and computed on the CPU pool when it is enabled"""
+    state = DICTIONARY_STATE
+    key = (state[2], tuple(letters), center_letter)
+    with _generation_memo_lock:
+        words = _generation_memo.get(key)
+        if words is not None:
+            _generation_memo.move_to_end(key)
+            return list(words)
+    
+    words = None
+    if cpu_pool.enabled():
+        # Raises cpu_pool.PoolBusy / PoolTimeout when the pool is saturated
+        with timing.span("generate"):
+            words = cpu_pool.find_words(letters, center_letter, version=state[2])
+    if words is None:
+        words = generate_spelling_bee_words(letters, center_letter, state)
+    
+    with _generation_memo_lock:
+        _generation_memo[key] = tuple(words)
+        while len(_generation_memo) > GENERATION_MEMO_SIZE:
+            _generation_memo.popitem(last=False)
+    return words
+
+def clear_generation_memo():
+    with _generation_memo_lock:
+        _generation_memo.clear()
+
+@metrics.timed(metrics.FUNCTION_DURATION, "compute_stats")
+@timing.timed("stats")
 def compute_stats(words, letters):
     """Compute statistics for the word list"""
     # Find pangrams (words that use all 7 letters)
@@ -692,6 +1133,174 @@ def compute_stats(words, letters):
         "prefix_tally_2": prefix_tally,
     }
 
+def is_admin_request():
+    """Whether the request carries the admin token"""
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+def require_admin(view):
+    """Reject requests to an admin endpoint that don't carry the admin token"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            return jsonify({"error": "Admin token required"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def assign_request_id():
+    """Tag the request and its log records with the caller's X-Request-ID, or a new one"""
+    g.request_id = request.headers.get("X-Request-ID", "")[:64] or uuid.uuid4().hex
+    g.request_id_token = structured_logging.set_request_id(g.request_id)
+
+# Endpoints that answer without the dictionary and puzzle stores
+STARTUP_EXEMPT_ENDPOINTS = {"hello", "test", "test_api", "healthz", "readyz", "get_metrics", "get_startup_report", "static"}
+
+@app.before_request
+def wait_for_startup():
+    """Hold requests that need the startup data until it has loaded, or answer 503"""
+    if request.endpoint in STARTUP_EXEMPT_ENDPOINTS or startup.is_ready():
+        return None
+    if startup.wait_ready():
+        return None
+    response = jsonify({"error": "Server is starting up, try again shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "5"
+    return response
+
+def request_needs_upstream():
+    """Whether the current request would have to fetch its puzzle from upstream"""
+    endpoint = request.endpoint
+    if endpoint in ("get_today_puzzle", "get_today_letters"):
+        return not has_stored_puzzle(date.today().isoformat())
+    if endpoint == "get_yesterday_puzzle":
+        return not has_stored_puzzle((date.today() - timedelta(days=1)).isoformat())
+    if endpoint == "get_archive_puzzle":
+        date_str = (request.view_args or {}).get("date_str", "")
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            # The route answers 400 without fetching anything
+            return False
+        return not (has_stored_puzzle(date_str, archive=True) or has_local_letters(date_str))
+    return False
+
+@app.before_request
+def apply_rate_limits():
+    """Refuse requests over the client's rate limits or the global cap on upstream work"""
+    if request.endpoint is None or is_admin_request():
+        return None
+    upstream_bound = request_needs_upstream()
+    client = rate_limit.client_id(request.remote_addr, request.headers.get("X-Forwarded-For", ""))
+    refused = rate_limit.check(client, request.endpoint, upstream=upstream_bound)
+    if refused is None:
+        g.holds_upstream_slot = upstream_bound and rate_limit.RATE_LIMITS_ENABLED
+        return None
+    reason, status_code, retry_after = refused
+    logger.warning("Refusing %s from %s: %s limit", request.path, client, reason)
+    message = "Too many requests, slow down" if status_code == 429 else "Server is busy, try again shortly"
+    response = jsonify({"error": message})
+    response.status_code = status_code
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+@app.before_request
+def start_request_profile():
+    """Profile this request when an admin asks for it with X-Profile, or when it is sampled"""
+    requested = request.headers.get("X-Profile") and is_admin_request()
+    if requested or profiling.should_sample():
+        g.profiler = profiling.start()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get("request_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.REQUEST_DURATION.observe(time.perf_counter() - started, route, request.method, str(response.status_code))
+    return response
+
+@app.after_request
+def add_server_timing(response):
+    """Report where the request spent its time in a Server-Timing header, and in the body with ?debug=timing"""
+    started = g.get("request_started")
+    total = time.perf_counter() - started if started is not None else None
+    response.headers["Server-Timing"] = timing.server_timing_header(total)
+    
+    if request.args.get("debug") == "timing" and response.is_json:
+        payload = response.get_json(silent=True)
+        if isinstance(payload, dict):
+            payload["debug"] = {
+                "timing": timing.summary(),
+                "total_ms": round(total * 1000, 3) if total is not None else None
+            }
+            response.set_data(app.json.dumps(payload))
+    return response
+
+@app.after_request
+def save_request_profile(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        started = g.get("request_started") or time.perf_counter()
+        name = profiling.stop(profiler, request.path, time.perf_counter() - started)
+        if name:
+            response.headers["X-Profile-Name"] = name
+    return response
+
+@app.after_request
+def add_request_id_header(response):
+    if g.get("request_id"):
+        response.headers["X-Request-ID"] = g.request_id
+    return response
+
+@app.teardown_request
+def clear_request_id(exc):
+    token = g.pop("request_id_token", None)
+    if token is not None:
+        structured_logging.reset_request_id(token)
+
+@app.teardown_request
+def release_upstream_slot(exc):
+    if g.pop("holds_upstream_slot", False):
+        rate_limit.release_upstream()
+
+@app.teardown_request
+def discard_request_profile(exc):
+    # Requests that never reached after_request must still release the profiler
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiling.discard(profiler)
+
+def collect_server_metrics():
+    """Gauges for cache sizes and the upstream schedulers, computed at scrape time"""
+    scheduler_metrics = host_scheduler.metrics()
+    return [
+        ("beehelper_dictionary_words", "gauge", "Words in the loaded dictionary", [({}, len(DICTIONARY))]),
+        ("beehelper_puzzle_cache_entries", "gauge", "Puzzles in PUZZLE_CACHE", [({}, len(PUZZLE_CACHE))]),
+        ("beehelper_puzzle_database_entries", "gauge", "Puzzles in the permanent database", [({}, len(PUZZLE_DATABASE))]),
+        ("beehelper_upstream_queue_depth", "gauge", "Requests waiting for an upstream slot",
+         [({"host": host}, m["queue_depth"]) for host, m in scheduler_metrics.items()]),
+        ("beehelper_upstream_active_requests", "gauge", "Upstream requests in flight",
+         [({"host": host}, m["active"]) for host, m in scheduler_metrics.items()]),
+        ("beehelper_upstream_requests_total", "counter", "Upstream requests that got a slot",
+         [({"host": host}, m["requests"]) for host, m in scheduler_metrics.items()]),
+        ("beehelper_upstream_queue_timeouts_total", "counter", "Upstream requests that timed out waiting for a slot",
+         [({"host": host}, m["timeouts"]) for host, m in scheduler_metrics.items()]),
+        ("beehelper_upstream_queue_wait_seconds_total", "counter", "Time spent waiting for upstream slots",
+         [({"host": host, "priority": name}, seconds)
+          for host, m in scheduler_metrics.items() for name, seconds in m["wait_seconds_total"].items()]),
+    ]
+
+metrics.register_collector(collect_server_metrics)
+
+@app.route("/metrics")
+def get_metrics():
+    """Prometheus metrics"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 @app.route("/api/spelling-bee/today")
 def get_today_puzzle():
     try:
@@ -699,8 +1308,9 @@ def get_today_puzzle():
         
         # Check permanent database first
         database_puzzle = get_puzzle_from_database(today_str)
-        if database_puzzle:
-            print(f"Returning database puzzle for {today_str}")
+        if database_puzzle and "words" in database_puzzle:
+            logger.debug("Returning database puzzle for %s", today_str)
+            metrics.PUZZLE_LOOKUPS.inc("database")
             stats = compute_stats(database_puzzle["words"], database_puzzle["letters"])
             return jsonify({
                 "date": database_puzzle["date"],
@@ -717,8 +1327,9 @@ def get_today_puzzle():
         
         # Check cache second
         cached_puzzle = get_cached_puzzle(today_str)
-        if cached_puzzle:
-            print(f"Returning cached puzzle for {today_str}")
+        if cached_puzzle and "words" in cached_puzzle:
+            logger.debug("Returning cached puzzle for %s", today_str)
+            metrics.PUZZLE_LOOKUPS.inc("puzzle_cache")
             stats = compute_stats(cached_puzzle["words"], cached_puzzle["letters"])
             return jsonify({
                 "date": cached_puzzle["date"],
@@ -738,8 +1349,10 @@ def get_today_puzzle():
         if not puzzle:
             return jsonify({"error": "Could not fetch today's puzzle data"}), 500
         
-        # Cache the result
-        cache_puzzle(today_str, puzzle)
+        # Cache the result; placeholder letters aren't cached, so a later
+        # request can still find the real puzzle
+        if not is_canned_puzzle_info(puzzle):
+            cache_puzzle(today_str, puzzle)
         
         stats = compute_stats(puzzle["words"], puzzle["letters"])
         # Use the actual puzzle date, not today's date
@@ -757,7 +1370,7 @@ def get_today_puzzle():
             "source": puzzle.get("source", "unknown")
         })
     except Exception as e:
-        print(f"Error in get_today_puzzle: {e}")
+        logger.exception("Error in get_today_puzzle: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route("/api/spelling-bee/yesterday")
@@ -769,8 +1382,9 @@ def get_yesterday_puzzle():
         
         # Check permanent database first
         database_puzzle = get_puzzle_from_database(yesterday_str)
-        if database_puzzle:
-            print(f"Returning database puzzle for {yesterday_str}")
+        if database_puzzle and "words" in database_puzzle:
+            logger.debug("Returning database puzzle for %s", yesterday_str)
+            metrics.PUZZLE_LOOKUPS.inc("database")
             stats = compute_stats(database_puzzle["words"], database_puzzle["letters"])
             return jsonify({
                 "date": database_puzzle["date"],
@@ -787,8 +1401,9 @@ def get_yesterday_puzzle():
         
         # Check cache second
         cached_puzzle = get_cached_puzzle(yesterday_str)
-        if cached_puzzle:
-            print(f"Returning cached puzzle for {yesterday_str}")
+        if cached_puzzle and "words" in cached_puzzle:
+            logger.debug("Returning cached puzzle for %s", yesterday_str)
+            metrics.PUZZLE_LOOKUPS.inc("puzzle_cache")
             stats = compute_stats(cached_puzzle["words"], cached_puzzle["letters"])
             return jsonify({
                 "date": cached_puzzle["date"],
@@ -822,8 +1437,10 @@ def get_yesterday_puzzle():
             "source": puzzle_info.get("source", "unknown")
         }
         
-        # Cache the result
-        cache_puzzle(yesterday_str, puzzle_data)
+        # Cache the result; placeholder letters aren't cached, so a later
+        # request can still find the real puzzle
+        if not is_canned_puzzle_info(puzzle_info):
+            cache_puzzle(yesterday_str, puzzle_data)
         
         return jsonify({
             "date": yesterday_str,
@@ -838,7 +1455,7 @@ def get_yesterday_puzzle():
             "source": puzzle_info.get("source", "unknown")
         })
     except Exception as e:
-        print(f"Error in get_yesterday_puzzle: {e}")
+        logger.exception("Error in get_yesterday_puzzle: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route("/api/spelling-bee/archive/<date_str>")
@@ -851,8 +1468,9 @@ def get_archive_puzzle(date_str):
     
     # Check cache first
     cached_puzzle = get_cached_puzzle(date_str)
-    if cached_puzzle:
-        print(f"Returning cached puzzle for {date_str}")
+    if cached_puzzle and "words" in cached_puzzle:
+        logger.debug("Returning cached puzzle for %s", date_str)
+        metrics.PUZZLE_LOOKUPS.inc("puzzle_cache")
         stats = compute_stats(cached_puzzle["words"], cached_puzzle["letters"])
         return jsonify({
             "date": cached_puzzle["date"],
@@ -886,8 +1504,10 @@ def get_archive_puzzle(date_str):
         "source": puzzle_info.get("source", "unknown")
     }
     
-    # Cache the result
-    cache_puzzle(date_str, puzzle_data)
+    # Cache the result; placeholder letters aren't cached, so a later request
+    # can still find the real puzzle
+    if not is_canned_puzzle_info(puzzle_info):
+        cache_puzzle(date_str, puzzle_data)
     
     return jsonify({
         "date": date_str,
@@ -921,7 +1541,14 @@ def generate_custom_puzzle():
         return jsonify({"error": "Center letter must be one of the 7 letters"}), 400
     
     # Generate words
-    words = generate_spelling_bee_words(letters, center_letter)
+    try:
+        words = generate_custom_words(letters, center_letter)
+    except (cpu_pool.PoolBusy, cpu_pool.PoolTimeout) as e:
+        logger.warning("Shedding /generate: %s", e)
+        response = jsonify({"error": "Server is busy, try again shortly"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(cpu_pool.RETRY_AFTER)
+        return response
     stats = compute_stats(words, letters)
     
     return jsonify({
@@ -1001,10 +1628,71 @@ def get_available_sources():
             "/api/spelling-bee/generate?letters=ABC&center=A",
             "/api/spelling-bee/letters",
             "/api/spelling-bee/sources",
-            "/api/spelling-bee/cache"
+            "/api/spelling-bee/cache",
+            "/api/spelling-bee/github-mirror",
+            "/api/spelling-bee/responses",
+            "/api/spelling-bee/source-stats",
+            "/api/spelling-bee/upstream"
         ]
     })
 
+@app.route("/api/spelling-bee/github-mirror", methods=['GET', 'POST'])
+def github_mirror_status():
+    """Get the state of the local GitHub archive mirror, or sync it with POST"""
+    if request.method == 'POST':
+        if not is_admin_request():
+            return jsonify({"error": "Admin token required"}), 403
+        full = request.args.get('full', '').lower() in ('1', 'true', 'yes')
+        result = github_mirror.sync(full=full)
+        status_code = 200 if result["status"] == "ok" else 502
+        return jsonify(result), status_code
+    
+    return jsonify(github_mirror.status())
+
+@app.route("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "ok"})
+
+def store_writable(path):
+    """Whether a store directory exists (or can be created) and accepts writes"""
+    try:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        return os.access(path, os.W_OK)
+    except OSError:
+        return False
+
+@app.route("/readyz")
+def readyz():
+    """Readiness: 200 once the real dictionary and its index are loaded and the stores are writable"""
+    today_str = date.today().strftime("%Y-%m-%d")
+    today_puzzle = get_puzzle_from_database(today_str) or get_cached_puzzle(today_str)
+    dictionary, index, version, dictionary_file = DICTIONARY_STATE
+    checks = {
+        "startup_finished": startup.is_ready(),
+        "dictionary_loaded": dictionary_file is not None,
+        "index_built": startup.is_ready() and index["dictionary_words"] == len(dictionary),
+        "cache_store_writable": store_writable(CACHE_DIR),
+        "response_store_writable": store_writable(response_store.STORE_DIR),
+    }
+    ready = all(checks.values())
+    return jsonify({
+        "status": "ready" if ready else "not ready",
+        "checks": checks,
+        "startup_error": startup.error(),
+        "dictionary": {
+            "file": dictionary_file,
+            "words": len(dictionary),
+            "version": version,
+        },
+        "index": {
+            "words": index["words"],
+            "letter_groups": len(index["groups"]),
+        },
+        # Reported only; a worker can serve before today's puzzle has been fetched
+        "today_precomputed": bool(today_puzzle and "words" in today_puzzle),
+    }), 200 if ready else 503
+
 @app.route("/")
 def hello():
     return "Spelling Bee API is running with multiple sources and archive support."
@@ -1017,6 +1705,11 @@ def test():
 def test_api():
     return jsonify({"status": "ok", "message": "API is working"})
 
+@app.route("/api/spelling-bee/startup")
+def get_startup_report():
+    """Get the time spent in each startup phase and whether the data has loaded"""
+    return jsonify(startup.report())
+
 @app.route("/api/spelling-bee/test-ios")
 def test_ios_format():
     """Test endpoint that returns data in the exact format iOS expects"""
@@ -1077,7 +1770,142 @@ def get_database_status():
         "database_file": str(PUZZLE_DATABASE_FILE)
     })
 
+@app.route("/api/spelling-bee/responses")
+def get_response_store_status():
+    """Get information about the raw upstream response store"""
+    return jsonify(response_store.status())
+
+@app.route("/api/spelling-bee/upstream")
+def get_upstream_status():
+    """Get queue depth, wait times and limits of the per-host upstream schedulers"""
+    return jsonify(host_scheduler.metrics())
+
+@app.route("/api/spelling-bee/source-stats", methods=['GET', 'POST'])
+def get_source_stats():
+    """Get per-source success and latency statistics, or set a priority override with POST"""
+    if request.method == 'POST':
+        if not is_admin_request():
+            return jsonify({"error": "Admin token required"}), 403
+        data = request.get_json() or {}
+        date_class = data.get('date_class')
+        if date_class not in source_stats.DATE_CLASSES:
+            return jsonify({"error": f"date_class must be one of {list(source_stats.DATE_CLASSES)}"}), 400
+        source_stats.set_override(date_class, data.get('sources'))
+    
+    return jsonify(source_stats.status())
+
+@app.route("/api/spelling-bee/admin/profiles")
+@require_admin
+def list_request_profiles():
+    """List saved request profiles, newest first"""
+    return jsonify({"profiles": profiling.list_profiles()})
+
+@app.route("/api/spelling-bee/admin/profiles/<name>")
+@require_admin
+def download_request_profile(name):
+    """Download a saved .prof file, or a text summary with ?format=text"""
+    path = profiling.profile_path(name)
+    if path is None:
+        abort(404)
+    
+    if request.args.get('format') == 'text':
+        sort_by = request.args.get('sort', 'cumulative')
+        if sort_by not in profiling.SORT_KEYS:
+            return jsonify({"error": f"Unknown sort {sort_by!r}; use one of {', '.join(sorted(profiling.SORT_KEYS))}"}), 400
+        summary = profiling.summarize(path, sort_by=sort_by)
+        return Response(summary, content_type="text/plain; charset=utf-8")
+    return send_file(path.resolve(), mimetype="application/octet-stream", as_attachment=True, download_name=name)
+
+@app.route("/api/spelling-bee/admin/memory")
+@require_admin
+def get_memory_report():
+    """Get the approximate size of the server's global structures and the process RSS"""
+    return jsonify(memory_usage.report())
+
+@app.route("/api/spelling-bee/admin/memory/snapshots", methods=['GET', 'POST', 'DELETE'])
+@require_admin
+def memory_snapshots():
+    """List tracemalloc snapshots, take one with POST, or stop tracing with DELETE"""
+    if request.method == 'POST':
+        snapshot_id = memory_usage.take_snapshot()
+        return jsonify({"id": snapshot_id, "snapshots": memory_usage.list_snapshots()})
+    if request.method == 'DELETE':
+        memory_usage.stop_tracing()
+    return jsonify(memory_usage.tracemalloc_status())
+
+@app.route("/api/spelling-bee/admin/memory/diff")
+@require_admin
+def memory_snapshot_diff():
+    """Compare two snapshots: ?from=<id>&to=<id>[&key=lineno|filename|traceback][&limit=25]"""
+    key_type = request.args.get('key', 'lineno')
+    if key_type not in ('lineno', 'filename', 'traceback'):
+        return jsonify({"error": "key must be lineno, filename or traceback"}), 400
+    try:
+        from_id = int(request.args['from'])
+        to_id = int(request.args['to'])
+        limit = int(request.args.get('limit', 25))
+    except (KeyError, ValueError):
+        return jsonify({"error": "from and to must be snapshot ids"}), 400
+    
+    result = memory_usage.diff(from_id, to_id, key_type, limit)
+    if result is None:
+        return jsonify({"error": "Snapshot not found", "snapshots": memory_usage.list_snapshots()}), 404
+    return jsonify(result)
+
+@app.route("/api/spelling-bee/admin/dictionary")
+@require_admin
+def get_dictionary_status():
+    """Get the loaded dictionary's file, size and version, and the state of the last reload"""
+    dictionary, index, version, dictionary_file = DICTIONARY_STATE
+    return jsonify({
+        "file": dictionary_file,
+        "words": len(dictionary),
+        "version": version,
+        "letter_groups": len(index["groups"]),
+        "watch_interval": DICTIONARY_WATCH_INTERVAL,
+        "reload": DICTIONARY_RELOAD,
+        "cpu_pool": cpu_pool.status(),
+    })
+
+@app.route("/api/spelling-bee/admin/dictionary/reload", methods=['POST'])
+@require_admin
+def reload_dictionary_endpoint():
+    """Reload the dictionary in the background, from ?file= in WORDBASE_DIR or the file it was loaded from; ?wait=1 waits for it"""
+    wait = request.args.get('wait', '').lower() in ('1', 'true', 'yes')
+    dictionary_file = None
+    if request.args.get('file'):
+        dictionary_file = wordbase_file(request.args['file'])
+        if dictionary_file is None:
+            return jsonify({"error": f"No wordbase {request.args['file']!r} in {WORDBASE_DIR}"}), 400
+    if not start_dictionary_reload(dictionary_file, wait=wait):
+        return jsonify({"error": "A reload is already running", "reload": DICTIONARY_RELOAD}), 409
+    if wait:
+        return jsonify(DICTIONARY_RELOAD), 500 if DICTIONARY_RELOAD["status"] == "error" else 200
+    return jsonify(DICTIONARY_RELOAD), 202
+
+@app.route("/api/spelling-bee/admin/dictionary/delta", methods=['POST'])
+@require_admin
+def apply_dictionary_delta():
+    """Apply a delta from `python wordbase.py diff` (the request body) to the live dictionary and its wordbase file"""
+    try:
+        delta = dictionary_delta.parse(request.get_data(as_text=True).splitlines())
+    except dictionary_delta.DeltaError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # 409 when the server isn't at the version the delta was made from. When
+    # "persisted" is false the file couldn't be written, and the delta lasts
+    # only for the worker that served this request.
+    result = patch_dictionary(delta)
+    status_code = {"applied": 200, "current": 200, "conflict": 409, "mismatch": 422}[result["status"]]
+    return jsonify(result), status_code
+
 if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["reparse"]:
+        # python main.py reparse [parser_name]
+        reparse_stored_responses(sys.argv[2] if len(sys.argv) > 2 else None)
+        sys.exit(0)
+    
     import os
     port = int(os.environ.get('PORT', 5001))
     app.run(debug=True, host='0.0.0.0', port=port) 
\ No newline at end of file
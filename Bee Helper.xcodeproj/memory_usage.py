@@ -0,0 +1,186 @@
+import gc
+import itertools
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import structured_logging
+
+logger = structured_logging.get_logger("memory_usage")
+
+# Memory accounting for the server's long-lived structures.
+#
+# Modules register their global caches with track(); report() walks each one to
+# estimate its deep size and adds the process RSS and a count of live bs4
+# objects; BeautifulSoup and Tag counts should fall back to zero once a scrape
+# returns, so a steady climb means parsed trees are being kept alive.
+# tracemalloc is off by default (it slows every allocation); taking the first
+# snapshot starts it, and snapshots can then be diffed to find what grew.
+TRACEMALLOC_FRAMES = int(os.environ.get("TRACEMALLOC_FRAMES", 1))
+
+# Snapshots hold a record per allocation site, so keep only a few
+MAX_SNAPSHOTS = 5
+
+_tracked = {}
+_snapshots = {}
+_snapshot_ids = itertools.count(1)
+_snapshot_lock = threading.Lock()
+
+
+def track(name, get_value):
+    """Include a structure, returned by `get_value` at report time, in memory reports"""
+    _tracked[name] = get_value
+
+
+def deep_size(obj):
+    """Approximate bytes held by an object and everything reachable through its containers"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif not isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            if hasattr(current, "__dict__"):
+                stack.append(vars(current))
+            for slot in getattr(type(current), "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def process_rss():
+    """Current resident set size in bytes, or the peak if the current value isn't available"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024, "current"
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return (peak if sys.platform == "darwin" else peak * 1024), "peak"
+
+
+def live_objects(module_prefix):
+    """Count of live objects per type for types defined in modules under a prefix"""
+    counts = Counter()
+    for obj in gc.get_objects():
+        obj_type = type(obj)
+        module = getattr(obj_type, "__module__", None)
+        if isinstance(module, str) and module.startswith(module_prefix):
+            counts[obj_type.__name__] += 1
+    return dict(counts.most_common())
+
+
+def report():
+    """Deep size of each tracked structure, process RSS and live BeautifulSoup objects"""
+    structures = {}
+    for name, get_value in list(_tracked.items()):
+        started = time.perf_counter()
+        try:
+            value = get_value()
+            structures[name] = {
+                "bytes": deep_size(value),
+                "items": len(value) if hasattr(value, "__len__") else None,
+                "measure_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+        except Exception as e:
+            logger.error("Error measuring %s: %s", name, e)
+            structures[name] = {"error": str(e)}
+
+    rss, rss_kind = process_rss()
+    return {
+        "rss_bytes": rss,
+        "rss_kind": rss_kind,
+        "structures": structures,
+        "bs4_objects": live_objects("bs4"),
+        "gc_counts": gc.get_count(),
+        "tracemalloc": tracemalloc_status(),
+    }
+
+
+def tracemalloc_status():
+    if not tracemalloc.is_tracing():
+        return {"tracing": False, "snapshots": list_snapshots()}
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "tracing": True,
+        "traced_bytes": current,
+        "traced_peak_bytes": peak,
+        "overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+        "snapshots": list_snapshots(),
+    }
+
+
+def take_snapshot():
+    """Take a tracemalloc snapshot, starting tracing first if needed, and return its id"""
+    with _snapshot_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            logger.info("Started tracemalloc with %s frames", TRACEMALLOC_FRAMES)
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        snapshot_id = next(_snapshot_ids)
+        _snapshots[snapshot_id] = (time.time(), snapshot)
+        for old_id in sorted(_snapshots)[:-MAX_SNAPSHOTS]:
+            del _snapshots[old_id]
+        return snapshot_id
+
+
+def stop_tracing():
+    """Stop tracemalloc and drop all snapshots"""
+    with _snapshot_lock:
+        _snapshots.clear()
+        tracemalloc.stop()
+
+
+def list_snapshots():
+    with _snapshot_lock:
+        return [
+            {"id": snapshot_id, "taken": taken, "traced_bytes": sum(stat.size for stat in snapshot.statistics("filename"))}
+            for snapshot_id, (taken, snapshot) in sorted(_snapshots.items())
+        ]
+
+
+def diff(from_id, to_id, key_type="lineno", limit=25):
+    """Largest allocation changes between two snapshots, or None if either is missing"""
+    with _snapshot_lock:
+        older = _snapshots.get(from_id)
+        newer = _snapshots.get(to_id)
+    if older is None or newer is None:
+        return None
+
+    stats = newer[1].compare_to(older[1], key_type)
+    return {
+        "from": from_id,
+        "to": to_id,
+        "seconds_between": round(newer[0] - older[0], 1),
+        "size_diff_bytes": sum(stat.size_diff for stat in stats),
+        "top": [
+            {
+                "location": str(stat.traceback),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ],
+    }
@@ -1,83 +1,188 @@
+import argparse
+import heapq
+import itertools
 import os
+import tempfile
 
-def merge_wordlists():
+from filter_words import is_playable
+
+# Words per sorted run when an input has to be sorted before merging; inputs
+# that are already sorted are merged straight from the file
+RUN_SIZE = 200000
+
+def normalized_words(lines):
+    """Stripped, lowercase, non-empty words"""
+    for line in lines:
+        word = line.strip().lower()
+        if word:
+            yield word
+
+def read_words(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from normalized_words(f)
+
+def is_sorted(path):
+    """Whether a wordlist's normalized words are already in sorted order"""
+    previous = ""
+    for word in read_words(path):
+        if word < previous:
+            return False
+        previous = word
+    return True
+
+def dedupe_sorted(words):
+    previous = None
+    for word in words:
+        if word != previous:
+            yield word
+            previous = word
+
+def external_sort(words, run_size=RUN_SIZE, temp_dir=None):
+    """Sorted, deduplicated words, spilling sorted runs of run_size words to temporary files"""
+    words = iter(words)
+    run = sorted(set(itertools.islice(words, run_size)))
+    next_word = next(words, None)
+    if next_word is None:
+        # Fits in one run; no need to touch the disk
+        yield from run
+        return
+    words = itertools.chain([next_word], words)
+
+    with tempfile.TemporaryDirectory(prefix="wordlist-runs-", dir=temp_dir) as run_dir:
+        run_paths = []
+        while run:
+            run_path = os.path.join(run_dir, f"run{len(run_paths)}.txt")
+            with open(run_path, 'w', encoding='utf-8') as f:
+                for word in run:
+                    f.write(word + '\n')
+            run_paths.append(run_path)
+            run = sorted(set(itertools.islice(words, run_size)))
+
+        run_files = [open(path, 'r', encoding='utf-8') for path in run_paths]
+        try:
+            runs = [(line.rstrip('\n') for line in f) for f in run_files]
+            yield from dedupe_sorted(heapq.merge(*runs))
+        finally:
+            for f in run_files:
+                f.close()
+
+def sorted_words(path, run_size=RUN_SIZE, temp_dir=None):
+    """Sorted, deduplicated words of a wordlist, sorting it externally only if it isn't sorted already"""
+    if is_sorted(path):
+        return dedupe_sorted(read_words(path))
+    return external_sort(read_words(path), run_size, temp_dir)
+
+def tagged(words, index):
+    for word in words:
+        yield word, index
+
+def merge_sorted(named_inputs):
+    """k-way merge of sorted, deduplicated word streams, yielding (word, names of the inputs containing it)"""
+    streams = [tagged(words, index) for index, (name, words) in enumerate(named_inputs)]
+    names = [name for name, words in named_inputs]
+    for word, group in itertools.groupby(heapq.merge(*streams), key=lambda item: item[0]):
+        yield word, tuple(names[index] for _, index in group)
+
+def merge_sorted_wordlists(input_files, output_file, provenance_file=None, run_size=RUN_SIZE):
+    """Merge wordlists into a sorted, deduplicated output in constant memory, returning merge statistics"""
+    stats = {
+        "inputs": {path: 0 for path in input_files},
+        "only_in": {path: 0 for path in input_files},
+        "output": 0,
+        "invalid": 0,
+        "invalid_sample": [],
+        "sample": [],
+    }
+
+    named_inputs = [(path, sorted_words(path, run_size)) for path in input_files]
+    temp_output = f"{output_file}.{os.getpid()}.tmp"
+    provenance = open(provenance_file, 'w', encoding='utf-8') if provenance_file else None
+    try:
+        with open(temp_output, 'w', encoding='utf-8') as out:
+            for word, sources in merge_sorted(named_inputs):
+                out.write(word + '\n')
+                if provenance:
+                    provenance.write(f"{word}\t{','.join(sources)}\n")
+
+                stats["output"] += 1
+                for source in sources:
+                    stats["inputs"][source] += 1
+                if len(sources) == 1:
+                    stats["only_in"][sources[0]] += 1
+                if len(stats["sample"]) < 20:
+                    stats["sample"].append(word)
+                # Check for any words that might not meet the criteria
+                if not is_playable(word):
+                    stats["invalid"] += 1
+                    if len(stats["invalid_sample"]) < 10:
+                        stats["invalid_sample"].append(word)
+        os.replace(temp_output, output_file)
+    finally:
+        if provenance:
+            provenance.close()
+        if os.path.exists(temp_output):
+            os.remove(temp_output)
+
+    stats["duplicates"] = sum(stats["inputs"].values()) - stats["output"]
+    return stats
+
+def print_merge_stats(stats, output_file):
+    print(f"Successfully created {output_file} with {stats['output']} words")
+
+    # Show statistics
+    print("\nStatistics:")
+    for path, count in stats["inputs"].items():
+        print(f"  Words from {path}: {count} ({stats['only_in'][path]} only there)")
+    print(f"  Duplicates removed: {stats['duplicates']}")
+    print(f"  Total unique words: {stats['output']}")
+
+    # Show some examples
+    print(f"\nSample words from merged list (first 20):")
+    for word in stats["sample"]:
+        print(f"  {word}")
+
+    if stats["invalid"]:
+        print(f"\nWarning: Found {stats['invalid']} words that don't meet the 4+ letters and ≤7 unique letters criteria:")
+        for word in stats["invalid_sample"]:
+            print(f"  {word} ({len(word)} letters, {len(set(word))} unique letters)")
+        if stats["invalid"] > 10:
+            print(f"  ... and {stats['invalid'] - 10} more")
+    else:
+        print(f"\nAll words meet the criteria (4+ letters, ≤7 unique letters)")
+
+def merge_wordlists(scraped_words_file="cleaned_scraped_words.txt", filtered_words_file="filtered_words_4to7letters.txt", output_file="beehelper_wordbase.txt", provenance_file=None):
     """Merge cleaned_scraped_words.txt with filtered_words_4to7letters.txt, remove duplicates, and create beehelper_wordbase.txt"""
-    
-    # File paths
-    scraped_words_file = "cleaned_scraped_words.txt"
-    filtered_words_file = "filtered_words_4to7letters.txt"
-    output_file = "beehelper_wordbase.txt"
-    
+
     # Check if files exist
-    if not os.path.exists(scraped_words_file):
-        print(f"Error: {scraped_words_file} not found")
-        return
-    
-    if not os.path.exists(filtered_words_file):
-        print(f"Error: {filtered_words_file} not found")
-        return
-    
+    for path in (scraped_words_file, filtered_words_file):
+        if not os.path.exists(path):
+            print(f"Error: {path} not found")
+            return
+
     try:
-        # Read cleaned_scraped_words.txt
-        print(f"Reading {scraped_words_file}...")
-        with open(scraped_words_file, 'r') as f:
-            scraped_words = set(line.strip().lower() for line in f if line.strip())
-        print(f"Loaded {len(scraped_words)} words from {scraped_words_file}")
-        
-        # Read filtered_words_4to7letters.txt
-        print(f"Reading {filtered_words_file}...")
-        with open(filtered_words_file, 'r') as f:
-            filtered_words = set(line.strip().lower() for line in f if line.strip())
-        print(f"Loaded {len(filtered_words)} words from {filtered_words_file}")
-        
-        # Merge word sets (automatically removes duplicates)
-        merged_words = scraped_words.union(filtered_words)
-        print(f"Merged to {len(merged_words)} unique words")
-        
-        # Convert to sorted list for consistent output
-        sorted_words = sorted(merged_words)
-        
-        # Write to new file
-        print(f"Writing to {output_file}...")
-        with open(output_file, 'w') as f:
-            for word in sorted_words:
-                f.write(word + '\n')
-        
-        print(f"Successfully created {output_file} with {len(sorted_words)} words")
-        
-        # Show statistics
-        print("\nStatistics:")
-        print(f"  Words from {scraped_words_file}: {len(scraped_words)}")
-        print(f"  Words from {filtered_words_file}: {len(filtered_words)}")
-        print(f"  Duplicates removed: {len(scraped_words) + len(filtered_words) - len(merged_words)}")
-        print(f"  Total unique words: {len(merged_words)}")
-        
-        # Show some examples
-        print(f"\nSample words from merged list (first 20):")
-        for word in sorted_words[:20]:
-            print(f"  {word}")
-            
-        # Check for any words that might not meet the criteria
-        invalid_words = []
-        for word in sorted_words:
-            if len(word) < 4 or len(set(word)) > 7:
-                invalid_words.append(word)
-        
-        if invalid_words:
-            print(f"\nWarning: Found {len(invalid_words)} words that don't meet the 4+ letters and ≤7 unique letters criteria:")
-            for word in invalid_words[:10]:  # Show first 10
-                print(f"  {word} ({len(word)} letters, {len(set(word))} unique letters)")
-            if len(invalid_words) > 10:
-                print(f"  ... and {len(invalid_words) - 10} more")
-        else:
-            print(f"\nAll words meet the criteria (4+ letters, ≤7 unique letters)")
-        
-        return sorted_words
-        
+        print(f"Merging {scraped_words_file} and {filtered_words_file} into {output_file}...")
+        stats = merge_sorted_wordlists([scraped_words_file, filtered_words_file], output_file, provenance_file)
+        print_merge_stats(stats, output_file)
+        # The merge streams; callers of this function still get the sorted words
+        return list(read_words(output_file))
+
     except Exception as e:
         print(f"Error processing word lists: {e}")
         return []
 
 if __name__ == "__main__":
-    merged_words = merge_wordlists()
+    parser = argparse.ArgumentParser(description="Merge wordlists into one sorted, deduplicated wordlist")
+    parser.add_argument("inputs", nargs="*", help="wordlists to merge (default: cleaned_scraped_words.txt and filtered_words_4to7letters.txt)")
+    parser.add_argument("-o", "--output", default="beehelper_wordbase.txt")
+    parser.add_argument("--provenance", metavar="FILE", help="also write each word with the inputs that contained it")
+    parser.add_argument("--run-size", type=int, default=RUN_SIZE, help="words per sorted run for unsorted inputs")
+    args = parser.parse_args()
 
+    if not args.inputs:
+        merged = merge_wordlists(output_file=args.output, provenance_file=args.provenance)
+    else:
+        missing = [path for path in args.inputs if not os.path.exists(path)]
+        if missing:
+            parser.error(f"not found: {', '.join(missing)}")
+        merged = merge_sorted_wordlists(args.inputs, args.output, args.provenance, args.run_size)
+        print_merge_stats(merged, args.output)
@@ -0,0 +1,175 @@
+import bisect
+import functools
+import threading
+import time
+
+import structured_logging
+
+logger = structured_logging.get_logger("metrics")
+
+# Minimal Prometheus-style metrics: counters and histograms with labels, plus
+# collectors that report gauges computed at scrape time. Recording is a dict
+# lookup and a few additions under a per-metric lock, cheap enough to leave on
+# in production. render() produces the Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing count, per label combination"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, per label combination"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, *labels):
+        """Context manager observing the duration of the block"""
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels(self.labelnames, labels, [("le", _format_value(bound))])
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                label_str = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+                lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+def timed(histogram, *labels):
+    """Decorator observing each call's duration in a histogram"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *labels)
+        return wrapper
+    return decorator
+
+
+def register_collector(collect):
+    """Register a function returning [(name, type, documentation, [(labels dict, value)])] at scrape time"""
+    _collectors.append(collect)
+
+
+def render():
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        try:
+            families = collect()
+        except Exception as e:
+            logger.error("Error collecting metrics from %s: %s", collect.__name__, e)
+            continue
+        for name, metric_type, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Metrics shared across the server's modules
+REQUEST_DURATION = Histogram(
+    "beehelper_http_request_duration_seconds",
+    "HTTP request latency by route, method and status code",
+    ("route", "method", "status"),
+)
+PUZZLE_LOOKUPS = Counter(
+    "beehelper_puzzle_lookups_total",
+    "Puzzle lookups answered at each tier (database, puzzle_cache, upstream, fallback)",
+    ("tier",),
+)
+UPSTREAM_SOURCE_DURATION = Histogram(
+    "beehelper_upstream_source_duration_seconds",
+    "Time spent on each upstream source in the scrape cascade",
+    ("source", "date_class", "outcome"),
+)
+FUNCTION_DURATION = Histogram(
+    "beehelper_function_duration_seconds",
+    "Time spent in hot functions",
+    ("function",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
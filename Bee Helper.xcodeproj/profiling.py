@@ -0,0 +1,113 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+import structured_logging
+
+logger = structured_logging.get_logger("profiling")
+
+# On-demand cProfile runs of single requests.
+#
+# A request is profiled when an admin asks for it with the X-Profile header, or
+# when it is picked by PROFILE_SAMPLE_RATE. Only one request is profiled at a
+# time. Profiles are written to a rotating directory as .prof files that load
+# with pstats or snakeviz.
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "cache/profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 50))
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+
+PROFILE_NAME_PATTERN = re.compile(r'^[\w.-]+\.prof$')
+
+# Orders a summary can be sorted by (pstats.SortKey values, e.g. "cumulative")
+SORT_KEYS = frozenset(key.value for key in pstats.SortKey)
+
+_active_lock = threading.Lock()
+
+
+def should_sample():
+    """Whether a request should be profiled by random sampling"""
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def start():
+    """Start profiling the current request, or return None if another profile is running"""
+    if not _active_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except Exception as e:
+        # Another profiler (e.g. a debugger) already owns the hook
+        _active_lock.release()
+        logger.warning("Could not start profiler: %s", e)
+        return None
+    return profiler
+
+
+def stop(profiler, label, elapsed):
+    """Stop a profile, save it to the profile directory and return its file name"""
+    try:
+        profiler.disable()
+    finally:
+        _active_lock.release()
+
+    safe_label = re.sub(r'[^\w-]+', '_', label).strip('_') or "request"
+    name = f"{int(time.time() * 1000)}_{safe_label}_{elapsed * 1000:.0f}ms.prof"
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(PROFILE_DIR / name)
+        _rotate()
+    except Exception as e:
+        logger.error("Error saving profile %s: %s", name, e)
+        return None
+    return name
+
+
+def discard(profiler):
+    """Stop a profile without saving it"""
+    try:
+        profiler.disable()
+    finally:
+        _active_lock.release()
+
+
+def _rotate():
+    profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda path: path.stat().st_mtime)
+    for path in profiles[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else profiles:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def list_profiles():
+    """Saved profiles, newest first"""
+    if not PROFILE_DIR.exists():
+        return []
+    profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda path: path.stat().st_mtime, reverse=True)
+    return [
+        {"name": path.name, "bytes": path.stat().st_size, "created": path.stat().st_mtime}
+        for path in profiles
+    ]
+
+
+def profile_path(name):
+    """Path of a saved profile, or None if the name is invalid or missing"""
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    path = PROFILE_DIR / name
+    return path if path.exists() else None
+
+
+def summarize(path, limit=40, sort_by="cumulative"):
+    """Text summary of the most expensive functions in a saved profile"""
+    output = io.StringIO()
+    stats = pstats.Stats(str(path), stream=output)
+    stats.strip_dirs().sort_stats(sort_by).print_stats(limit)
+    return output.getvalue()
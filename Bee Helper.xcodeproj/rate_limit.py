@@ -0,0 +1,174 @@
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import metrics
+import structured_logging
+from host_scheduler import TokenBucket
+
+logger = structured_logging.get_logger("rate_limit")
+
+# Incoming rate limits and admission control.
+#
+# Every client gets a token bucket per route. Requests that would have to go
+# upstream (a puzzle that isn't stored yet) also take a token from the client's
+# much tighter upstream bucket, and a slot under a global cap on requests doing
+# upstream work at once, so one client walking the archive can't tie up the
+# scrape cascade for everyone else. Over a client limit the request gets a 429,
+# over the global cap a 503, both with Retry-After.
+#
+# Limits are per process: with several server workers, each enforces them
+# separately.
+RATE_LIMITS_ENABLED = os.environ.get("RATE_LIMITS_ENABLED", "1").lower() in ("1", "true", "yes")
+
+# endpoint: (requests per second, burst), per client
+DEFAULT_LIMIT = (5.0, 30)
+ROUTE_LIMITS = {
+    "get_today_puzzle": (5.0, 30),
+    "get_yesterday_puzzle": (5.0, 30),
+    "get_archive_puzzle": (5.0, 60),
+    "generate_custom_puzzle": (2.0, 20),
+    "get_today_letters": (1.0, 10),
+}
+
+# Requests that go upstream, per client across all routes
+UPSTREAM_LIMIT = (0.1, 5)
+
+# Override or add limits with e.g. {"get_archive_puzzle": [2.0, 20], "upstream": [0.05, 3]}
+RATE_LIMITS_ENV = "RATE_LIMITS"
+
+# Requests doing upstream work at once, across all clients
+UPSTREAM_MAX_IN_FLIGHT = int(os.environ.get("UPSTREAM_MAX_IN_FLIGHT", 8))
+UPSTREAM_RETRY_AFTER = 5
+
+# Behind a proxy (Render), the client address is this many entries from the
+# right of X-Forwarded-For. The default, 0, uses the socket address: without a
+# proxy in front, clients could pick their own key by sending the header.
+PROXY_HOPS = int(os.environ.get("RATE_LIMIT_PROXY_HOPS", 0))
+
+# Buckets kept at once; the least recently seen clients are forgotten first
+MAX_BUCKETS = 10000
+
+EXEMPT_ENDPOINTS = {"healthz", "readyz", "get_metrics", "static"}
+
+RATE_LIMITED = metrics.Counter(
+    "beehelper_rate_limited_total",
+    "Requests refused by incoming rate limits, by endpoint and reason (route, upstream, in_flight)",
+    ("endpoint", "reason"),
+)
+
+_lock = threading.Lock()
+_buckets = OrderedDict()
+_upstream_slots = threading.BoundedSemaphore(UPSTREAM_MAX_IN_FLIGHT)
+_upstream_in_flight = 0
+
+
+def _load_overrides():
+    try:
+        return json.loads(os.environ.get(RATE_LIMITS_ENV) or "{}")
+    except ValueError as e:
+        logger.error("Invalid %s: %s", RATE_LIMITS_ENV, e)
+        return {}
+
+
+_overrides = _load_overrides()
+
+
+def limit_for(name):
+    """(rate, burst) for an endpoint, or for "upstream" work"""
+    default = UPSTREAM_LIMIT if name == "upstream" else ROUTE_LIMITS.get(name, DEFAULT_LIMIT)
+    return tuple(_overrides.get(name) or default)
+
+
+def client_id(remote_addr, forwarded_for=""):
+    """The address rate limits are keyed on"""
+    if PROXY_HOPS > 0 and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(",") if address.strip()]
+        if addresses:
+            return addresses[-min(PROXY_HOPS, len(addresses))]
+    return remote_addr or "unknown"
+
+
+def _take(client, name):
+    """Take a token from a client's bucket, returning 0 or the seconds until one is available"""
+    key = (client, name)
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rate, burst = limit_for(name)
+            bucket = _buckets[key] = TokenBucket(rate, burst)
+            while len(_buckets) > MAX_BUCKETS:
+                _buckets.popitem(last=False)
+        else:
+            _buckets.move_to_end(key)
+        return bucket.take()
+
+
+def check(client, endpoint, upstream=False):
+    """Admit a request, returning None or (reason, status code, retry after seconds)"""
+    # An admitted upstream request holds a slot until release_upstream()
+    if not RATE_LIMITS_ENABLED or endpoint in EXEMPT_ENDPOINTS:
+        return None
+
+    delay = _take(client, endpoint)
+    if delay:
+        RATE_LIMITED.inc(endpoint, "route")
+        return ("route", 429, math.ceil(delay))
+    if not upstream:
+        return None
+
+    # The global cap is checked first, so a request refused for it doesn't
+    # spend the client's upstream token
+    if not acquire_upstream():
+        RATE_LIMITED.inc(endpoint, "in_flight")
+        return ("in_flight", 503, UPSTREAM_RETRY_AFTER)
+    delay = _take(client, "upstream")
+    if delay:
+        release_upstream()
+        RATE_LIMITED.inc(endpoint, "upstream")
+        return ("upstream", 429, math.ceil(delay))
+    return None
+
+
+def acquire_upstream():
+    """Take a slot under the global upstream cap without waiting, returning whether one was free"""
+    global _upstream_in_flight
+    if not _upstream_slots.acquire(blocking=False):
+        return False
+    with _lock:
+        _upstream_in_flight += 1
+    return True
+
+
+def release_upstream():
+    global _upstream_in_flight
+    with _lock:
+        _upstream_in_flight -= 1
+    _upstream_slots.release()
+
+
+def status():
+    with _lock:
+        return {
+            "enabled": RATE_LIMITS_ENABLED,
+            "clients_tracked": len({client for client, _ in _buckets}),
+            "upstream_in_flight": _upstream_in_flight,
+            "upstream_max_in_flight": UPSTREAM_MAX_IN_FLIGHT,
+            "upstream_limit": limit_for("upstream"),
+            "route_limits": {name: limit_for(name) for name in ROUTE_LIMITS},
+            "default_limit": DEFAULT_LIMIT,
+        }
+
+
+def collect_metrics():
+    current = status()
+    return [
+        ("beehelper_upstream_in_flight", "gauge", "Requests doing upstream work under the global cap",
+         [({}, current["upstream_in_flight"])]),
+        ("beehelper_rate_limit_clients", "gauge", "Clients with rate limit buckets", [({}, current["clients_tracked"])]),
+    ]
+
+
+metrics.register_collector(collect_metrics)
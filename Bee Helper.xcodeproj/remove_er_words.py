@@ -1,12 +1,14 @@
 import os
 
-def remove_er_words():
+from filter_words import is_playable
+
+def has_e_and_r(word):
+    """Whether a lowercase word contains both 'e' and 'r'"""
+    return 'e' in word and 'r' in word
+
+def remove_er_words(input_file="beehelper_wordbase-41017.txt", output_file="beehelper_wordbase_no_er.txt"):
     """Remove all words that contain both 'E' and 'R' from the beehelper wordbase"""
     
-    # File paths
-    input_file = "beehelper_wordbase-41017.txt"
-    output_file = "beehelper_wordbase_no_er.txt"
-    
     if not os.path.exists(input_file):
         print(f"Error: {input_file} not found")
         return []
@@ -23,7 +25,7 @@ def remove_er_words():
         removed_words = []
         
         for word in words:
-            if 'e' in word and 'r' in word:
+            if has_e_and_r(word):
                 removed_words.append(word)
             else:
                 filtered_words.append(word)
@@ -61,7 +63,7 @@ def remove_er_words():
         # Check for any words that might not meet the original criteria
         invalid_words = []
         for word in filtered_words:
-            if len(word) < 4 or len(set(word)) > 7:
+            if not is_playable(word):
                 invalid_words.append(word)
         
         if invalid_words:
@@ -1,12 +1,288 @@
 import os
 import re
 
-def remove_proper_nouns():
-    """Remove city names, brand names, and other proper nouns from the beehelper wordbase"""
+from filter_words import is_playable
+
+# Common proper noun indicators
+PROPER_NOUN_PATTERNS = [
+    # Capitalized words (though we're working with lowercase, keeping for reference)
+    r'^[A-Z]',
+
+    # Common city/country suffixes
+    r'.*burg$',      # hamburg, pittsburgh
+    r'.*town$',      # charlestown
+    r'.*ville$',     # nashville
+    r'.*ton$',       # boston, washington
+    r'.*land$',      # england, ireland
+    r'.*ia$',        # california, australia
+    r'.*stan$',      # pakistan, afghanistan
+    r'.*polis$',     # minneapolis, indianapolis
+    r'.*dale$',      # rosedale
+    r'.*field$',     # springfield
+    r'.*port$',      # newport, portland
+    r'.*ford$',      # oxford, waterford
+    r'.*bridge$',    # cambridge
+    r'.*wood$',      # hollywood
+    r'.*hill$',      # nottingham
+    r'.*shire$',     # yorkshire
+    r'.*ham$',       # birmingham
+    r'.*pool$',      # blackpool
+    r'.*mouth$',     # plymouth
+    r'.*chester$',   # manchester
+    r'.*caster$',    # lancaster
+    r'.*minster$',   # westminster
+    r'.*wich$',      # norwich
+    r'.*combe$',     # salcombe
+    r'.*leigh$',     # burleigh
+    r'.*don$',       # london
+    r'.*don$',       # london
+    r'.*ham$',       # birmingham
+    r'.*pool$',      # blackpool
+    r'.*mouth$',     # plymouth
+    r'.*chester$',   # manchester
+    r'.*caster$',    # lancaster
+    r'.*minster$',   # westminster
+    r'.*wich$',      # norwich
+    r'.*combe$',     # salcombe
+    r'.*leigh$',     # burleigh
+    r'.*don$',       # london
+]
+
+# Common brand names and companies
+BRAND_NAMES = {
+    'nike', 'adidas', 'puma', 'reebok', 'under', 'armour', 'levis', 'gap', 'old', 'navy',
+    'target', 'walmart', 'costco', 'kroger', 'safeway', 'whole', 'foods', 'trader', 'joes',
+    'starbucks', 'dunkin', 'mcdonalds', 'burger', 'king', 'wendys', 'subway', 'dominos',
+    'pizza', 'hut', 'kfc', 'taco', 'bell', 'chipotle', 'panera', 'bread', 'chick', 'fil',
+    'apple', 'google', 'microsoft', 'amazon', 'facebook', 'twitter', 'instagram', 'netflix',
+    'disney', 'warner', 'bros', 'sony', 'nintendo', 'xbox', 'playstation', 'steam',
+    'coca', 'cola', 'pepsi', 'dr', 'pepper', 'sprite', 'fanta', 'mountain', 'dew',
+    'ford', 'chevrolet', 'toyota', 'honda', 'nissan', 'bmw', 'mercedes', 'audi', 'volkswagen',
+    'hilton', 'marriott', 'hyatt', 'holiday', 'inn', 'best', 'western', 'motel', 'six',
+    'ibm', 'hp', 'dell', 'lenovo', 'asus', 'acer', 'samsung', 'lg', 'panasonic', 'sharp',
+    'nike', 'adidas', 'puma', 'reebok', 'under', 'armour', 'levis', 'gap', 'old', 'navy',
+    'target', 'walmart', 'costco', 'kroger', 'safeway', 'whole', 'foods', 'trader', 'joes',
+    'starbucks', 'dunkin', 'mcdonalds', 'burger', 'king', 'wendys', 'subway', 'dominos',
+    'pizza', 'hut', 'kfc', 'taco', 'bell', 'chipotle', 'panera', 'bread', 'chick', 'fil',
+    'apple', 'google', 'microsoft', 'amazon', 'facebook', 'twitter', 'instagram', 'netflix',
+    'disney', 'warner', 'bros', 'sony', 'nintendo', 'xbox', 'playstation', 'steam',
+    'coca', 'cola', 'pepsi', 'dr', 'pepper', 'sprite', 'fanta', 'mountain', 'dew',
+    'ford', 'chevrolet', 'toyota', 'honda', 'nissan', 'bmw', 'mercedes', 'audi', 'volkswagen',
+    'hilton', 'marriott', 'hyatt', 'holiday', 'inn', 'best', 'western', 'motel', 'six',
+    'ibm', 'hp', 'dell', 'lenovo', 'asus', 'acer', 'samsung', 'lg', 'panasonic', 'sharp'
+}
+
+# Common city names
+CITY_NAMES = {
+    'new', 'york', 'london', 'paris', 'tokyo', 'berlin', 'madrid', 'rome', 'moscow',
+    'beijing', 'shanghai', 'mumbai', 'delhi', 'cairo', 'lagos', 'nairobi', 'johannesburg',
+    'sydney', 'melbourne', 'brisbane', 'perth', 'auckland', 'wellington', 'vancouver',
+    'toronto', 'montreal', 'calgary', 'edmonton', 'ottawa', 'winnipeg', 'halifax',
+    'chicago', 'los', 'angeles', 'houston', 'phoenix', 'philadelphia', 'san', 'antonio',
+    'san', 'diego', 'dallas', 'austin', 'jacksonville', 'fort', 'worth', 'columbus',
+    'charlotte', 'san', 'francisco', 'indianapolis', 'seattle', 'denver', 'washington',
+    'boston', 'el', 'paso', 'nashville', 'detroit', 'oklahoma', 'portland', 'las', 'vegas',
+    'memphis', 'louisville', 'baltimore', 'milwaukee', 'albuquerque', 'tucson', 'fresno',
+    'sacramento', 'atlanta', 'long', 'beach', 'colorado', 'springs', 'raleigh', 'miami',
+    'cleveland', 'tampa', 'orlando', 'minneapolis', 'kansas', 'city', 'st', 'louis',
+    'oakland', 'pittsburgh', 'cincinnati', 'st', 'paul', 'anchorage', 'honolulu',
+    'buffalo', 'rochester', 'tulsa', 'fremont', 'bakersfield', 'durham', 'chula', 'vista',
+    'irvine', 'boise', 'richmond', 'norfolk', 'spokane', 'baton', 'rouge', 'tacoma',
+    'fort', 'wayne', 'arlington', 'hialeah', 'glendale', 'garland', 'modesto', 'laredo',
+    'chandler', 'lubbock', 'madison', 'laredo', 'chandler', 'lubbock', 'madison'
+}
+
+# Common country names
+COUNTRY_NAMES = {
+    'america', 'canada', 'mexico', 'brazil', 'argentina', 'chile', 'peru', 'colombia',
+    'venezuela', 'ecuador', 'bolivia', 'paraguay', 'uruguay', 'guyana', 'suriname',
+    'france', 'germany', 'italy', 'spain', 'portugal', 'netherlands', 'belgium', 'switzerland',
+    'austria', 'poland', 'czech', 'republic', 'slovakia', 'hungary', 'romania', 'bulgaria',
+    'greece', 'turkey', 'ukraine', 'russia', 'belarus', 'lithuania', 'latvia', 'estonia',
+    'finland', 'sweden', 'norway', 'denmark', 'iceland', 'ireland', 'united', 'kingdom',
+    'china', 'japan', 'korea', 'india', 'pakistan', 'bangladesh', 'sri', 'lanka', 'nepal',
+    'thailand', 'vietnam', 'cambodia', 'laos', 'myanmar', 'malaysia', 'singapore', 'indonesia',
+    'philippines', 'australia', 'new', 'zealand', 'fiji', 'papua', 'guinea', 'solomon',
+    'south', 'africa', 'nigeria', 'kenya', 'uganda', 'tanzania', 'ethiopia', 'sudan',
+    'egypt', 'morocco', 'algeria', 'tunisia', 'libya', 'chad', 'niger', 'mali', 'senegal'
+}
+
+# Common first names
+FIRST_NAMES = {
+    'john', 'jane', 'mike', 'sarah', 'david', 'lisa', 'james', 'mary', 'robert', 'jennifer',
+    'michael', 'linda', 'william', 'elizabeth', 'richard', 'barbara', 'thomas', 'susan',
+    'christopher', 'jessica', 'charles', 'sarah', 'daniel', 'karen', 'matthew', 'nancy',
+    'anthony', 'lisa', 'mark', 'betty', 'donald', 'helen', 'steven', 'sandra', 'paul',
+    'donna', 'andrew', 'carol', 'joshua', 'ruth', 'kenneth', 'sharon', 'kevin', 'michelle',
+    'brian', 'laura', 'george', 'emily', 'edward', 'kimberly', 'ronald', 'deborah', 'timothy',
+    'dorothy', 'jason', 'lisa', 'jeffrey', 'nancy', 'ryan', 'karen', 'jacob', 'betty',
+    'gary', 'helen', 'nicholas', 'sandra', 'eric', 'donna', 'jonathan', 'ruth', 'stephen',
+    'julie', 'larry', 'joyce', 'justin', 'virginia', 'scott', 'victoria', 'brandon', 'kelly',
+    'benjamin', 'lauren', 'samuel', 'christine', 'frank', 'amy', 'gregory', 'angela',
+    'raymond', 'shirley', 'alexander', 'anna', 'patrick', 'brenda', 'jack', 'pamela',
+    'dennis', 'emma', 'jerry', 'nicole', 'tyler', 'helen', 'aaron', 'samantha', 'jose',
+    'katherine', 'adam', 'christine', 'nathan', 'debra', 'henry', 'rachel', 'douglas', 'carolyn'
+}
+
+# Common last names
+LAST_NAMES = {
+    'smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis',
+    'rodriguez', 'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson',
+    'thomas', 'taylor', 'moore', 'jackson', 'martin', 'lee', 'perez', 'thompson',
+    'white', 'harris', 'sanchez', 'clark', 'ramirez', 'lewis', 'robinson', 'walker',
+    'young', 'allen', 'king', 'wright', 'scott', 'torres', 'nguyen', 'hill', 'flores',
+    'green', 'adams', 'nelson', 'baker', 'hall', 'rivera', 'campbell', 'mitchell',
+    'carter', 'roberts', 'gomez', 'phillips', 'evans', 'turner', 'diaz', 'parker',
+    'cruz', 'edwards', 'collins', 'reyes', 'stewart', 'morris', 'morales', 'murphy',
+    'rogers', 'reed', 'cook', 'morgan', 'bell', 'murphy', 'bailey', 'rivera', 'cooper',
+    'richardson', 'cox', 'howard', 'ward', 'torres', 'peterson', 'gray', 'ramirez',
+    'james', 'watson', 'brooks', 'kelly', 'sanders', 'price', 'bennett', 'wood',
+    'barnes', 'ross', 'henderson', 'coleman', 'jenkins', 'perry', 'powell', 'long',
+    'patterson', 'hughes', 'flores', 'washington', 'butler', 'simmons', 'foster',
+    'gonzales', 'bryant', 'alexander', 'russell', 'griffin', 'diaz', 'hayes'
+}
+
+# Combined set of proper nouns to remove
+PROPER_NOUNS = BRAND_NAMES.union(CITY_NAMES).union(COUNTRY_NAMES).union(FIRST_NAMES).union(LAST_NAMES)
+
+# Words that start or end with common proper noun indicators
+PROPER_NOUN_PREFIXES = ('mc', 'mac', 'van', 'von', 'de', 'del', 'di', 'da', 'du', 'le', 'la')
+PROPER_NOUN_SUFFIXES = ('berg', 'stein', 'man', 'son', 'sen', 'ski', 'sky', 'witz', 'berg')
+
+# Prefix and suffix indicators only apply to words at least this long
+AFFIX_MIN_LENGTH = 4
+
+# The rules above compile into one structure so a word is classified in a
+# single pass: a dict from listed name to the list it came from, tries of
+# prefixes and reversed suffixes whose nodes carry the rule that ends there, and
+# one alternation for any pattern that isn't a plain suffix or prefix. Duplicate
+# rules collapse as they are inserted.
+SUFFIX_PATTERN = re.compile(r'^\.\*([a-z]+)\$$')
+PREFIX_PATTERN = re.compile(r'^\^([a-z]+)$')
+RULE = None  # trie key of the rule ending at a node
+
+NAME_LISTS = (
+    ("brand", BRAND_NAMES),
+    ("city", CITY_NAMES),
+    ("country", COUNTRY_NAMES),
+    ("first_name", FIRST_NAMES),
+    ("last_name", LAST_NAMES),
+)
+
+
+def _insert(trie, key, min_length, reason):
+    """Add a rule to a trie, returning False if an equal or more general rule is already there"""
+    node = trie
+    for char in key:
+        node = node.setdefault(char, {})
+    existing = node.get(RULE)
+    if existing is not None and existing[0] <= min_length:
+        return False
+    node[RULE] = (min_length, reason)
+    return True
+
+
+def _walk(trie, chars, length):
+    node = trie
+    for char in chars:
+        node = node.get(char)
+        if node is None:
+            return None
+        rule = node.get(RULE)
+        if rule is not None and length >= rule[0]:
+            return rule[1]
+    return None
+
+
+def compile_rules(name_lists=NAME_LISTS, patterns=PROPER_NOUN_PATTERNS,
+                  prefixes=PROPER_NOUN_PREFIXES, suffixes=PROPER_NOUN_SUFFIXES):
+    """Compile proper noun rules for classify(), dropping duplicates"""
+    names = {}
+    for list_name, words in name_lists:
+        for word in words:
+            names.setdefault(word, f"name:{list_name}")
+
+    prefix_trie = {}
+    suffix_trie = {}
+    other_patterns = []
+    rules = duplicates = 0
+    for pattern in patterns:
+        rules += 1
+        suffix = SUFFIX_PATTERN.match(pattern)
+        prefix = PREFIX_PATTERN.match(pattern)
+        if suffix:
+            added = _insert(suffix_trie, reversed(suffix.group(1)), 0, f"suffix:-{suffix.group(1)}")
+        elif prefix:
+            added = _insert(prefix_trie, prefix.group(1), 0, f"prefix:{prefix.group(1)}-")
+        else:
+            added = pattern not in other_patterns
+            if added:
+                other_patterns.append(pattern)
+        duplicates += not added
+    for prefix in prefixes:
+        rules += 1
+        duplicates += not _insert(prefix_trie, prefix, AFFIX_MIN_LENGTH, f"prefix:{prefix}-")
+    for suffix in suffixes:
+        rules += 1
+        duplicates += not _insert(suffix_trie, reversed(suffix), AFFIX_MIN_LENGTH, f"suffix:-{suffix}")
+
+    other = None
+    if other_patterns:
+        other = re.compile("|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(other_patterns)))
+    return {
+        "names": names,
+        "prefixes": prefix_trie,
+        "suffixes": suffix_trie,
+        "other": other,
+        "other_patterns": {f"p{i}": pattern for i, pattern in enumerate(other_patterns)},
+        "rules": rules,
+        "duplicates": duplicates,
+    }
+
+
+RULES = compile_rules()
+
+
+def classify(word, rules=RULES):
+    """The rule that marks a lowercase word as a proper noun, e.g. "suffix:-ton", or None"""
+    reason = rules["names"].get(word)
+    if reason is not None:
+        return reason
+    if rules["other"] is not None:
+        match = rules["other"].match(word)
+        if match:
+            return f"pattern:{rules['other_patterns'][match.lastgroup]}"
+    length = len(word)
+    return _walk(rules["prefixes"], word, length) or _walk(rules["suffixes"], reversed(word), length)
+
+
+def is_proper_noun(word):
+    """Whether a lowercase word looks like a city, brand, country or person's name"""
+    return classify(word) is not None
+
+
+def is_proper_noun_scan(word):
+    """Check each rule in turn; the reference classify() is benchmarked and checked against"""
+    # Check if word is in our proper noun lists
+    if word in PROPER_NOUNS:
+        return True
+    
+    # Check if word matches common proper noun patterns
+    for pattern in PROPER_NOUN_PATTERNS:
+        if re.match(pattern, word):
+            return True
     
-    # File paths
-    input_file = "beehelper_wordbase_no_er.txt"
-    output_file = "beehelper_wordbase_clean.txt"
+    # Additional checks for proper nouns
+    if len(word) >= 4:
+        if word.startswith(PROPER_NOUN_PREFIXES):
+            return True
+        if word.endswith(PROPER_NOUN_SUFFIXES):
+            return True
+    return False
+
+
+def remove_proper_nouns(input_file="beehelper_wordbase_no_er.txt", output_file="beehelper_wordbase_clean.txt"):
+    """Remove city names, brand names, and other proper nouns from the beehelper wordbase"""
     
     if not os.path.exists(input_file):
         print(f"Error: {input_file} not found")
@@ -23,180 +299,21 @@ def remove_proper_nouns():
         filtered_words = []
         removed_words = []
         
-        # Common proper noun indicators
-        proper_noun_patterns = [
-            # Capitalized words (though we're working with lowercase, keeping for reference)
-            r'^[A-Z]',
-            
-            # Common city/country suffixes
-            r'.*burg$',      # hamburg, pittsburgh
-            r'.*town$',      # charlestown
-            r'.*ville$',     # nashville
-            r'.*ton$',       # boston, washington
-            r'.*land$',      # england, ireland
-            r'.*ia$',        # california, australia
-            r'.*stan$',      # pakistan, afghanistan
-            r'.*polis$',     # minneapolis, indianapolis
-            r'.*dale$',      # rosedale
-            r'.*field$',     # springfield
-            r'.*port$',      # newport, portland
-            r'.*ford$',      # oxford, waterford
-            r'.*bridge$',    # cambridge
-            r'.*wood$',      # hollywood
-            r'.*hill$',      # nottingham
-            r'.*shire$',     # yorkshire
-            r'.*ham$',       # birmingham
-            r'.*pool$',      # blackpool
-            r'.*mouth$',     # plymouth
-            r'.*chester$',   # manchester
-            r'.*caster$',    # lancaster
-            r'.*minster$',   # westminster
-            r'.*wich$',      # norwich
-            r'.*combe$',     # salcombe
-            r'.*leigh$',     # burleigh
-            r'.*don$',       # london
-            r'.*don$',       # london
-            r'.*ham$',       # birmingham
-            r'.*pool$',      # blackpool
-            r'.*mouth$',     # plymouth
-            r'.*chester$',   # manchester
-            r'.*caster$',    # lancaster
-            r'.*minster$',   # westminster
-            r'.*wich$',      # norwich
-            r'.*combe$',     # salcombe
-            r'.*leigh$',     # burleigh
-            r'.*don$',       # london
-        ]
-        
-        # Common brand names and companies
-        brand_names = {
-            'nike', 'adidas', 'puma', 'reebok', 'under', 'armour', 'levis', 'gap', 'old', 'navy',
-            'target', 'walmart', 'costco', 'kroger', 'safeway', 'whole', 'foods', 'trader', 'joes',
-            'starbucks', 'dunkin', 'mcdonalds', 'burger', 'king', 'wendys', 'subway', 'dominos',
-            'pizza', 'hut', 'kfc', 'taco', 'bell', 'chipotle', 'panera', 'bread', 'chick', 'fil',
-            'apple', 'google', 'microsoft', 'amazon', 'facebook', 'twitter', 'instagram', 'netflix',
-            'disney', 'warner', 'bros', 'sony', 'nintendo', 'xbox', 'playstation', 'steam',
-            'coca', 'cola', 'pepsi', 'dr', 'pepper', 'sprite', 'fanta', 'mountain', 'dew',
-            'ford', 'chevrolet', 'toyota', 'honda', 'nissan', 'bmw', 'mercedes', 'audi', 'volkswagen',
-            'hilton', 'marriott', 'hyatt', 'holiday', 'inn', 'best', 'western', 'motel', 'six',
-            'ibm', 'hp', 'dell', 'lenovo', 'asus', 'acer', 'samsung', 'lg', 'panasonic', 'sharp',
-            'nike', 'adidas', 'puma', 'reebok', 'under', 'armour', 'levis', 'gap', 'old', 'navy',
-            'target', 'walmart', 'costco', 'kroger', 'safeway', 'whole', 'foods', 'trader', 'joes',
-            'starbucks', 'dunkin', 'mcdonalds', 'burger', 'king', 'wendys', 'subway', 'dominos',
-            'pizza', 'hut', 'kfc', 'taco', 'bell', 'chipotle', 'panera', 'bread', 'chick', 'fil',
-            'apple', 'google', 'microsoft', 'amazon', 'facebook', 'twitter', 'instagram', 'netflix',
-            'disney', 'warner', 'bros', 'sony', 'nintendo', 'xbox', 'playstation', 'steam',
-            'coca', 'cola', 'pepsi', 'dr', 'pepper', 'sprite', 'fanta', 'mountain', 'dew',
-            'ford', 'chevrolet', 'toyota', 'honda', 'nissan', 'bmw', 'mercedes', 'audi', 'volkswagen',
-            'hilton', 'marriott', 'hyatt', 'holiday', 'inn', 'best', 'western', 'motel', 'six',
-            'ibm', 'hp', 'dell', 'lenovo', 'asus', 'acer', 'samsung', 'lg', 'panasonic', 'sharp'
-        }
-        
-        # Common city names
-        city_names = {
-            'new', 'york', 'london', 'paris', 'tokyo', 'berlin', 'madrid', 'rome', 'moscow',
-            'beijing', 'shanghai', 'mumbai', 'delhi', 'cairo', 'lagos', 'nairobi', 'johannesburg',
-            'sydney', 'melbourne', 'brisbane', 'perth', 'auckland', 'wellington', 'vancouver',
-            'toronto', 'montreal', 'calgary', 'edmonton', 'ottawa', 'winnipeg', 'halifax',
-            'chicago', 'los', 'angeles', 'houston', 'phoenix', 'philadelphia', 'san', 'antonio',
-            'san', 'diego', 'dallas', 'austin', 'jacksonville', 'fort', 'worth', 'columbus',
-            'charlotte', 'san', 'francisco', 'indianapolis', 'seattle', 'denver', 'washington',
-            'boston', 'el', 'paso', 'nashville', 'detroit', 'oklahoma', 'portland', 'las', 'vegas',
-            'memphis', 'louisville', 'baltimore', 'milwaukee', 'albuquerque', 'tucson', 'fresno',
-            'sacramento', 'atlanta', 'long', 'beach', 'colorado', 'springs', 'raleigh', 'miami',
-            'cleveland', 'tampa', 'orlando', 'minneapolis', 'kansas', 'city', 'st', 'louis',
-            'oakland', 'pittsburgh', 'cincinnati', 'st', 'paul', 'anchorage', 'honolulu',
-            'buffalo', 'rochester', 'tulsa', 'fremont', 'bakersfield', 'durham', 'chula', 'vista',
-            'irvine', 'boise', 'richmond', 'norfolk', 'spokane', 'baton', 'rouge', 'tacoma',
-            'fort', 'wayne', 'arlington', 'hialeah', 'glendale', 'garland', 'modesto', 'laredo',
-            'chandler', 'lubbock', 'madison', 'laredo', 'chandler', 'lubbock', 'madison'
-        }
-        
-        # Common country names
-        country_names = {
-            'america', 'canada', 'mexico', 'brazil', 'argentina', 'chile', 'peru', 'colombia',
-            'venezuela', 'ecuador', 'bolivia', 'paraguay', 'uruguay', 'guyana', 'suriname',
-            'france', 'germany', 'italy', 'spain', 'portugal', 'netherlands', 'belgium', 'switzerland',
-            'austria', 'poland', 'czech', 'republic', 'slovakia', 'hungary', 'romania', 'bulgaria',
-            'greece', 'turkey', 'ukraine', 'russia', 'belarus', 'lithuania', 'latvia', 'estonia',
-            'finland', 'sweden', 'norway', 'denmark', 'iceland', 'ireland', 'united', 'kingdom',
-            'china', 'japan', 'korea', 'india', 'pakistan', 'bangladesh', 'sri', 'lanka', 'nepal',
-            'thailand', 'vietnam', 'cambodia', 'laos', 'myanmar', 'malaysia', 'singapore', 'indonesia',
-            'philippines', 'australia', 'new', 'zealand', 'fiji', 'papua', 'guinea', 'solomon',
-            'south', 'africa', 'nigeria', 'kenya', 'uganda', 'tanzania', 'ethiopia', 'sudan',
-            'egypt', 'morocco', 'algeria', 'tunisia', 'libya', 'chad', 'niger', 'mali', 'senegal'
-        }
-        
-        # Common first names
-        first_names = {
-            'john', 'jane', 'mike', 'sarah', 'david', 'lisa', 'james', 'mary', 'robert', 'jennifer',
-            'michael', 'linda', 'william', 'elizabeth', 'richard', 'barbara', 'thomas', 'susan',
-            'christopher', 'jessica', 'charles', 'sarah', 'daniel', 'karen', 'matthew', 'nancy',
-            'anthony', 'lisa', 'mark', 'betty', 'donald', 'helen', 'steven', 'sandra', 'paul',
-            'donna', 'andrew', 'carol', 'joshua', 'ruth', 'kenneth', 'sharon', 'kevin', 'michelle',
-            'brian', 'laura', 'george', 'emily', 'edward', 'kimberly', 'ronald', 'deborah', 'timothy',
-            'dorothy', 'jason', 'lisa', 'jeffrey', 'nancy', 'ryan', 'karen', 'jacob', 'betty',
-            'gary', 'helen', 'nicholas', 'sandra', 'eric', 'donna', 'jonathan', 'ruth', 'stephen',
-            'julie', 'larry', 'joyce', 'justin', 'virginia', 'scott', 'victoria', 'brandon', 'kelly',
-            'benjamin', 'lauren', 'samuel', 'christine', 'frank', 'amy', 'gregory', 'angela',
-            'raymond', 'shirley', 'alexander', 'anna', 'patrick', 'brenda', 'jack', 'pamela',
-            'dennis', 'emma', 'jerry', 'nicole', 'tyler', 'helen', 'aaron', 'samantha', 'jose',
-            'katherine', 'adam', 'christine', 'nathan', 'debra', 'henry', 'rachel', 'douglas', 'carolyn'
-        }
-        
-        # Common last names
-        last_names = {
-            'smith', 'johnson', 'williams', 'brown', 'jones', 'garcia', 'miller', 'davis',
-            'rodriguez', 'martinez', 'hernandez', 'lopez', 'gonzalez', 'wilson', 'anderson',
-            'thomas', 'taylor', 'moore', 'jackson', 'martin', 'lee', 'perez', 'thompson',
-            'white', 'harris', 'sanchez', 'clark', 'ramirez', 'lewis', 'robinson', 'walker',
-            'young', 'allen', 'king', 'wright', 'scott', 'torres', 'nguyen', 'hill', 'flores',
-            'green', 'adams', 'nelson', 'baker', 'hall', 'rivera', 'campbell', 'mitchell',
-            'carter', 'roberts', 'gomez', 'phillips', 'evans', 'turner', 'diaz', 'parker',
-            'cruz', 'edwards', 'collins', 'reyes', 'stewart', 'morris', 'morales', 'murphy',
-            'rogers', 'reed', 'cook', 'morgan', 'bell', 'murphy', 'bailey', 'rivera', 'cooper',
-            'richardson', 'cox', 'howard', 'ward', 'torres', 'peterson', 'gray', 'ramirez',
-            'james', 'watson', 'brooks', 'kelly', 'sanders', 'price', 'bennett', 'wood',
-            'barnes', 'ross', 'henderson', 'coleman', 'jenkins', 'perry', 'powell', 'long',
-            'patterson', 'hughes', 'flores', 'washington', 'butler', 'simmons', 'foster',
-            'gonzales', 'bryant', 'alexander', 'russell', 'griffin', 'diaz', 'hayes'
-        }
-        
-        # Combined set of proper nouns to remove
-        proper_nouns = brand_names.union(city_names).union(country_names).union(first_names).union(last_names)
+        print(f"Identified {len(PROPER_NOUNS)} common proper nouns and {RULES['rules'] - RULES['duplicates']} rules to filter out ({RULES['duplicates']} duplicate rules dropped)")
         
-        print(f"Identified {len(proper_nouns)} common proper nouns to filter out")
-        
-        # Filter words
+        # Filter words, recording the rule that removed each one
+        removed_by = {}
         for word in words:
-            should_remove = False
-            
-            # Check if word is in our proper noun lists
-            if word in proper_nouns:
-                should_remove = True
-            
-            # Check if word matches common proper noun patterns
-            for pattern in proper_noun_patterns:
-                if re.match(pattern, word):
-                    should_remove = True
-                    break
-            
-            # Additional checks for proper nouns
-            if len(word) >= 4:
-                # Words that start with common proper noun indicators
-                if word.startswith(('mc', 'mac', 'van', 'von', 'de', 'del', 'di', 'da', 'du', 'le', 'la')):
-                    should_remove = True
-                
-                # Words that end with common proper noun indicators
-                if word.endswith(('berg', 'stein', 'man', 'son', 'sen', 'ski', 'sky', 'witz', 'berg')):
-                    should_remove = True
-            
-            if should_remove:
+            reason = classify(word)
+            if reason is not None:
                 removed_words.append(word)
+                removed_by[reason] = removed_by.get(reason, 0) + 1
             else:
                 filtered_words.append(word)
         
         print(f"Removed {len(removed_words)} proper nouns")
+        for reason, count in sorted(removed_by.items(), key=lambda item: -item[1]):
+            print(f"  {reason}: {count}")
         print(f"Kept {len(filtered_words)} words")
         
         # Save filtered words to new file
@@ -217,7 +334,7 @@ def remove_proper_nouns():
         # Show some examples of removed words
         print(f"\nSample removed words (first 20):")
         for word in removed_words[:20]:
-            print(f"  {word}")
+            print(f"  {word} ({classify(word)})")
         if len(removed_words) > 20:
             print(f"  ... and {len(removed_words) - 20} more")
             
@@ -229,7 +346,7 @@ def remove_proper_nouns():
         # Check for any words that might not meet the original criteria
         invalid_words = []
         for word in filtered_words:
-            if len(word) < 4 or len(set(word)) > 7:
+            if not is_playable(word):
                 invalid_words.append(word)
         
         if invalid_words:
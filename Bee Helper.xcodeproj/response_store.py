@@ -0,0 +1,395 @@
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import memory_usage
+import structured_logging
+
+logger = structured_logging.get_logger("response_store")
+
+# Compressed on-disk store of raw upstream responses.
+#
+# Bodies are stored once per content hash under blobs/, and index.json maps each
+# URL to the hash fetched on each day, plus the parsers that consumed it. Parsed
+# results are memoized by (parser, content hash, context) so an unchanged page is
+# never parsed twice, and stored pages can be re-parsed without the network.
+#
+# The index and the parse memo are append-only journals: each change is one
+# JSON line appended under a file lock, and every process replays the lines
+# other workers appended before reading, so no worker's entries are lost. Once
+# a journal is mostly superseded lines it is compacted into a fresh file, which
+# also evicts index entries past MAX_RESPONSE_AGE_DAYS (always keeping each
+# URL's latest) and deletes blobs nothing refers to any more.
+STORE_DIR = Path("cache") / "responses"
+BLOB_DIR = STORE_DIR / "blobs"
+INDEX_FILE = STORE_DIR / "index.jsonl"
+PARSE_MEMO_FILE = STORE_DIR / "parse_memo.jsonl"
+
+# Whole-file stores written before the journals; imported on first use
+LEGACY_INDEX_FILE = STORE_DIR / "index.json"
+LEGACY_PARSE_MEMO_FILE = STORE_DIR / "parse_memo.json"
+
+# Parsed results kept per parser; older entries are evicted first
+MAX_MEMO_ENTRIES_PER_PARSER = 64
+
+# Index bounds: responses kept per URL, and days a superseded response is kept
+MAX_ENTRIES_PER_URL = 30
+MAX_RESPONSE_AGE_DAYS = int(os.environ.get("RESPONSE_STORE_MAX_AGE_DAYS", 90))
+
+# A journal is compacted once it has this many lines and at least twice as
+# many as the entries they add up to
+COMPACT_MIN_LINES = 500
+
+# Unreferenced blobs younger than this may belong to a write in progress
+ORPHAN_BLOB_GRACE = 3600
+
+_lock = threading.Lock()
+
+
+def content_hash(content):
+    """SHA-256 hex digest of a response body"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _blob_path(sha256):
+    return BLOB_DIR / sha256[:2] / f"{sha256}.gz"
+
+
+def _load_json(path, default):
+    try:
+        if path.exists():
+            with open(path, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error("Error loading %s: %s", path, e)
+    return default
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock shared by every process writing a journal"""
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class _Journal:
+    """An append-only JSON-lines file replayed into an in-memory structure"""
+
+    def __init__(self, path, empty, apply, snapshot, size, legacy=None, on_compact=None):
+        self.path = path
+        self.empty = empty          # () -> a new structure
+        self.apply = apply          # (structure, record) -> None; replaying a record twice is harmless
+        self.snapshot = snapshot    # structure -> records that rebuild it
+        self.size = size            # structure -> number of live entries
+        self.legacy = legacy        # (path, structure from a whole-file store -> records)
+        self.on_compact = on_compact  # structure -> None, run after compacting
+        self.data = empty()
+        self.inode = None
+        self.offset = 0
+        self.lines = 0
+
+    def refresh(self):
+        """Replay the lines appended since the last refresh, by any process; caller holds _lock"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.legacy and self.legacy[0].exists():
+                self._import_legacy()
+            return self.data
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # Compacted by another process (or new): start over from the new file
+            self.data, self.inode, self.offset, self.lines = self.empty(), stat.st_ino, 0, 0
+        if stat.st_size > self.offset:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read(stat.st_size - self.offset)
+            # A line still being appended is picked up next time
+            end = chunk.rfind(b"\n") + 1
+            for line in chunk[:end].splitlines():
+                try:
+                    self.apply(self.data, json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning("Skipping bad line in %s: %s", self.path, e)
+                self.lines += 1
+            self.offset += end
+        return self.data
+
+    def append(self, record):
+        """Append a change and apply it; caller holds _lock"""
+        line = (json.dumps(record) + "\n").encode()
+        try:
+            with _file_lock(self.path):
+                with open(self.path, 'ab') as f:
+                    f.write(line)
+        except Exception as e:
+            logger.error("Error appending to %s: %s", self.path, e)
+            self.apply(self.data, record)
+            return
+        self.refresh()
+        if self.lines >= COMPACT_MIN_LINES and self.lines >= 2 * self.size(self.data):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal as one line per live entry; caller holds _lock"""
+        try:
+            with _file_lock(self.path):
+                self.refresh()
+                records = list(self.snapshot(self.data))
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    for record in records:
+                        f.write(json.dumps(record) + "\n")
+                os.replace(tmp_path, self.path)
+                self.data, self.inode, self.offset, self.lines = self.empty(), None, 0, 0
+                self.refresh()
+                if self.on_compact:
+                    self.on_compact(self.data)
+        except Exception as e:
+            logger.error("Error compacting %s: %s", self.path, e)
+
+    def _import_legacy(self):
+        legacy_path, to_records = self.legacy
+        self.legacy = None
+        data = self.empty()
+        for record in to_records(_load_json(legacy_path, {})):
+            self.apply(data, record)
+        self.data = data
+        self.compact()
+        logger.info("Imported %s into %s", legacy_path, self.path)
+
+
+def _apply_index(index, record):
+    entries = index.setdefault(record["url"], [])
+    entry = record["entry"]
+    for i in range(len(entries) - 1, -1, -1):
+        if entries[i]["fetched_on"] == entry["fetched_on"]:
+            entries[i] = entry
+            break
+    else:
+        entries.append(entry)
+    del entries[:-MAX_ENTRIES_PER_URL]
+
+
+def _index_records(index):
+    """Index entries to keep when compacting: recent ones, and the latest per URL"""
+    cutoff = (date.today() - timedelta(days=MAX_RESPONSE_AGE_DAYS)).isoformat()
+    for url, entries in index.items():
+        for i, entry in enumerate(entries):
+            if entry["fetched_on"] >= cutoff or i == len(entries) - 1:
+                yield {"url": url, "entry": entry}
+
+
+def _legacy_index_records(index):
+    for url, entries in index.items():
+        for entry in entries:
+            yield {"url": url, "entry": entry}
+
+
+def _apply_parse_memo(memo, record):
+    entries = memo.setdefault(record["parser"], {})
+    entries.pop(record["key"], None)
+    entries[record["key"]] = record["result"]
+    while len(entries) > MAX_MEMO_ENTRIES_PER_PARSER:
+        del entries[next(iter(entries))]
+
+
+def _parse_memo_records(memo):
+    for parser_name, entries in memo.items():
+        for key, result in entries.items():
+            yield {"parser": parser_name, "key": key, "result": result}
+
+
+def _delete_orphan_blobs(index):
+    """Delete blobs no index entry refers to; runs while compacting the index"""
+    referenced = {entry["sha256"] for entries in index.values() for entry in entries}
+    if not BLOB_DIR.exists():
+        return
+    now = time.time()
+    for path in BLOB_DIR.glob("*/*.gz"):
+        try:
+            if path.name[:-3] not in referenced and now - path.stat().st_mtime > ORPHAN_BLOB_GRACE:
+                path.unlink()
+        except OSError as e:
+            logger.warning("Error deleting stored response %s: %s", path, e)
+
+
+_index = _Journal(
+    INDEX_FILE, dict, _apply_index, _index_records,
+    lambda index: sum(len(entries) for entries in index.values()),
+    legacy=(LEGACY_INDEX_FILE, _legacy_index_records),
+    on_compact=_delete_orphan_blobs,
+)
+_parse_memo = _Journal(
+    PARSE_MEMO_FILE, dict, _apply_parse_memo, _parse_memo_records,
+    lambda memo: sum(len(entries) for entries in memo.values()),
+    legacy=(LEGACY_PARSE_MEMO_FILE, _parse_memo_records),
+)
+
+memory_usage.track("response_store.index", lambda: _index.data)
+memory_usage.track("response_store.parse_memo", lambda: _parse_memo.data)
+
+
+def _get_index():
+    with _lock:
+        return _index.refresh()
+
+
+def _get_parse_memo():
+    with _lock:
+        return _parse_memo.refresh()
+
+
+def compact():
+    """Compact both journals now, evicting old index entries and unreferenced blobs"""
+    with _lock:
+        _index.compact()
+        _parse_memo.compact()
+
+
+def record(url, content, fetched_on=None, validators=None):
+    """Store a response body and its cache validators for a URL and fetch date, returning its content hash"""
+    sha256 = content_hash(content)
+    fetched_on = fetched_on or date.today().isoformat()
+
+    blob_path = _blob_path(sha256)
+    try:
+        # A stored body is reused; touching it keeps compaction from taking it for an orphan
+        os.utime(blob_path)
+    except FileNotFoundError:
+        # Written aside and renamed, so readers never see a partial blob
+        tmp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, blob_path)
+        except Exception as e:
+            logger.error("Error storing response for %s: %s", url, e)
+            tmp_path.unlink(missing_ok=True)
+            return sha256
+
+    with _lock:
+        _add_entry(url, sha256, fetched_on, validators)
+
+    return sha256
+
+
+def record_not_modified(url, fetched_on=None):
+    """Record that a URL was revalidated unchanged, returning the stored entry"""
+    fetched_on = fetched_on or date.today().isoformat()
+    with _lock:
+        entries = _index.refresh().get(url)
+        previous = entries[-1] if entries else None
+        if previous is None:
+            return None
+        validators = {key: previous[key] for key in ("etag", "last_modified") if key in previous}
+        return _add_entry(url, previous["sha256"], fetched_on, validators)
+
+
+def _add_entry(url, sha256, fetched_on, validators):
+    """Add or update the index entry for a URL and fetch date; caller holds the lock"""
+    entries = _index.refresh().get(url)
+    previous = entries[-1] if entries else None
+    if previous and previous["fetched_on"] == fetched_on and previous["sha256"] == sha256:
+        entry = {key: value for key, value in previous.items() if key not in ("etag", "last_modified")}
+    else:
+        parsers = previous.get("parsers", {}) if previous and previous["sha256"] == sha256 else {}
+        entry = {"fetched_on": fetched_on, "sha256": sha256, "parsers": dict(parsers)}
+
+    # Replaces the entry for the same fetch date, if there is one
+    entry.update(validators or {})
+    _index.append({"url": url, "entry": entry})
+    return entry
+
+
+def validators_for(url):
+    """The ETag and Last-Modified validators of the latest stored response for a URL"""
+    entry = latest(url)
+    if entry is None:
+        return {}
+    return {key: entry[key] for key in ("etag", "last_modified") if key in entry}
+
+
+def note_parser(url, sha256, parser_name, context=""):
+    """Remember which parsers consumed a stored response so it can be re-parsed later"""
+    with _lock:
+        for entry in list(_index.refresh().get(url, [])):
+            if entry["sha256"] != sha256:
+                continue
+            parsers = entry.get("parsers", {})
+            if parsers.get(parser_name) != context:
+                entry = dict(entry, parsers=dict(parsers, **{parser_name: context}))
+                _index.append({"url": url, "entry": entry})
+
+
+def read(sha256):
+    """Read a stored response body by content hash"""
+    with gzip.open(_blob_path(sha256), 'rb') as f:
+        return f.read()
+
+
+def latest(url):
+    """The most recent index entry for a URL, or None"""
+    entries = _get_index().get(url)
+    return entries[-1] if entries else None
+
+
+def _memo_key(sha256, context):
+    return f"{sha256}:{context}"
+
+
+def get_parsed(parser_name, sha256, context=""):
+    """Return (True, result) if this content was already parsed by this parser"""
+    entries = _get_parse_memo().get(parser_name, {})
+    key = _memo_key(sha256, context)
+    if key in entries:
+        return True, entries[key]
+    return False, None
+
+
+def set_parsed(parser_name, sha256, result, context=""):
+    """Memoize a parser result for a content hash"""
+    with _lock:
+        _parse_memo.append({"parser": parser_name, "key": _memo_key(sha256, context), "result": result})
+
+
+def stored_responses(parser_name=None):
+    """Yield (url, entry, parser_name, context) for every stored response with a known parser"""
+    seen = set()
+    for url, entries in list(_get_index().items()):
+        for entry in entries:
+            for name, context in entry.get("parsers", {}).items():
+                key = (entry["sha256"], name, context)
+                if (parser_name is None or name == parser_name) and key not in seen:
+                    seen.add(key)
+                    yield url, entry, name, context
+
+
+def status():
+    """Describe the size of the store"""
+    index = _get_index()
+    blob_count = 0
+    blob_bytes = 0
+    if BLOB_DIR.exists():
+        for path in BLOB_DIR.glob("*/*.gz"):
+            blob_count += 1
+            blob_bytes += path.stat().st_size
+    return {
+        "urls": len(index),
+        "responses": sum(len(entries) for entries in index.values()),
+        "blobs": blob_count,
+        "compressed_bytes": blob_bytes,
+        "memoized_parses": sum(len(entries) for entries in _get_parse_memo().values()),
+    }
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import upstream
+
+# On-disk cache of downloaded word sources.
+#
+# A source URL is streamed to disk as it is read, so callers get its lines
+# while the download is still running and memory stays bounded by one chunk.
+# The body is kept with the response's ETag and Last-Modified, and later reads
+# send them back: a 304 streams the cached copy instead of downloading again.
+# Offline reads use the cached copy without touching the network, and a failed
+# download falls back to it when there is one.
+CACHE_DIR = Path("cache") / "sources"
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_CHUNK = 1 << 16
+
+
+class SourceUnavailable(Exception):
+    """Raised when a source can't be downloaded and has no cached copy"""
+
+
+def cache_paths(url, cache_dir=CACHE_DIR):
+    """(body, metadata) paths of the cached copy of a URL"""
+    key = hashlib.sha256(url.encode()).hexdigest()[:32]
+    cache_dir = Path(cache_dir)
+    return cache_dir / f"{key}.txt", cache_dir / f"{key}.json"
+
+
+def cached_metadata(url, cache_dir=CACHE_DIR):
+    """Validators and details of the cached copy of a URL, or None if there isn't one"""
+    body_path, meta_path = cache_paths(url, cache_dir)
+    if not body_path.exists():
+        return None
+    try:
+        with open(meta_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        yield from f
+
+
+def _download(response, url, body_path, meta_path):
+    """Yield the response's lines while writing the body to the cache, replacing the cached copy once complete"""
+    body_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = body_path.with_name(f"{body_path.name}.{os.getpid()}.tmp")
+    size = 0
+    complete = False
+    try:
+        with open(temp_path, "wb") as f:
+            pending = b""
+            for chunk in response.iter_content(DOWNLOAD_CHUNK):
+                f.write(chunk)
+                size += len(chunk)
+                pending += chunk
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    yield line + b"\n"
+            if pending:
+                yield pending
+        complete = True
+    finally:
+        if not complete:
+            # Stopped early or failed: don't cache a partial body
+            temp_path.unlink(missing_ok=True)
+
+    os.replace(temp_path, body_path)
+    metadata = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "bytes": size,
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def lines(url, cache_dir=CACHE_DIR, offline=False, status=None):
+    """Raw lines of a URL, streamed from the network or the cache"""
+    # status["cache"] says where they came from: downloaded, revalidated,
+    # offline, or stale (the download failed and the cached copy was used)
+    status = {} if status is None else status
+    body_path, meta_path = cache_paths(url, cache_dir)
+    metadata = cached_metadata(url, cache_dir)
+
+    if offline:
+        if metadata is None:
+            raise SourceUnavailable(f"No cached copy of {url} to use offline")
+        status["cache"] = "offline"
+        yield from _read_file(body_path)
+        return
+
+    import requests
+
+    headers = {}
+    if metadata and metadata.get("etag"):
+        headers["If-None-Match"] = metadata["etag"]
+    if metadata and metadata.get("last_modified"):
+        headers["If-Modified-Since"] = metadata["last_modified"]
+
+    try:
+        response = requests.get(upstream.resolve(url), headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except requests.RequestException as e:
+        if metadata is None:
+            raise SourceUnavailable(f"Can't download {url}: {e}")
+        status["cache"] = "stale"
+        status["error"] = str(e)
+        yield from _read_file(body_path)
+        return
+
+    with response:
+        if response.status_code == 304 and metadata is not None:
+            status["cache"] = "revalidated"
+            yield from _read_file(body_path)
+            return
+        status["cache"] = "downloaded"
+        yield from _download(response, url, body_path, meta_path)
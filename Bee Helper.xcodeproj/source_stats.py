@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import structured_logging
+
+logger = structured_logging.get_logger("source_stats")
+
+# Rolling success-rate and latency statistics per upstream source, split by date
+# class, used to order the scrape cascade by expected time to a valid answer.
+#
+# With independent sources tried in sequence, ordering by latency / success rate
+# minimizes the expected time until one succeeds. Statistics are exponentially
+# weighted so a source that starts failing drops down within a few attempts and
+# one that recovers climbs back up.
+CACHE_DIR = Path("cache")
+SOURCE_STATS_FILE = CACHE_DIR / "source_stats.json"
+
+DATE_CLASSES = ("today", "yesterday", "archive")
+
+# Weight of the newest observation in the rolling averages
+EWMA_ALPHA = 0.2
+
+# Priors for sources that have not been tried yet in a date class
+PRIOR_SUCCESS_RATE = 0.5
+PRIOR_LATENCY = 1.0
+
+# Floor on the success rate so a failing source still gets retried eventually
+MIN_SUCCESS_RATE = 0.02
+
+# Statistics of a source that hasn't been tried decay back towards the priors
+# with this half-life in seconds, so a demoted source gets another chance
+STATS_HALF_LIFE = 3 * 24 * 3600
+
+# Manual overrides, e.g. {"today": ["word.tips (today)"]}: listed sources are tried
+# first, in the given order, before the learned ordering
+PRIORITY_OVERRIDES_ENV = "SOURCE_PRIORITY_OVERRIDES"
+
+_lock = threading.Lock()
+_stats = None
+_env_overrides = None
+
+
+def date_class(target_date):
+    """Classify a puzzle date as today, yesterday or archive"""
+    today = date.today()
+    if target_date >= today:
+        return "today"
+    if target_date == today - timedelta(days=1):
+        return "yesterday"
+    return "archive"
+
+
+def _load():
+    stats = {"sources": {}, "overrides": {}}
+    try:
+        if SOURCE_STATS_FILE.exists():
+            with open(SOURCE_STATS_FILE, 'r') as f:
+                stats.update(json.load(f))
+    except Exception as e:
+        logger.error("Error loading source stats: %s", e)
+    return stats
+
+
+def _load_env_overrides():
+    try:
+        return json.loads(os.environ.get(PRIORITY_OVERRIDES_ENV) or "{}")
+    except ValueError as e:
+        logger.error("Invalid %s: %s", PRIORITY_OVERRIDES_ENV, e)
+        return {}
+
+
+def _save(stats):
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp_file = SOURCE_STATS_FILE.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp_file, SOURCE_STATS_FILE)
+    except Exception as e:
+        logger.error("Error saving source stats: %s", e)
+
+
+def _get_stats():
+    global _stats
+    if _stats is None:
+        _stats = _load()
+    return _stats
+
+
+def _source_entry(stats, source_name, klass):
+    return stats["sources"].setdefault(klass, {}).setdefault(source_name, {
+        "success_rate": PRIOR_SUCCESS_RATE,
+        "latency": PRIOR_LATENCY,
+        "attempts": 0,
+        "successes": 0,
+    })
+
+
+def record(source_name, klass, success, latency):
+    """Fold one attempt of a source into its rolling statistics"""
+    with _lock:
+        stats = _get_stats()
+        entry = _source_entry(stats, source_name, klass)
+        entry["success_rate"] += EWMA_ALPHA * ((1.0 if success else 0.0) - entry["success_rate"])
+        entry["latency"] += EWMA_ALPHA * (latency - entry["latency"])
+        entry["attempts"] += 1
+        if success:
+            entry["successes"] += 1
+        entry["updated_at"] = time.time()
+        _save(stats)
+
+
+def overrides_for(klass):
+    """Sources pinned to the front of a date class: runtime overrides win over the environment"""
+    global _env_overrides
+    if _env_overrides is None:
+        _env_overrides = _load_env_overrides()
+    return _get_stats()["overrides"].get(klass) or _env_overrides.get(klass) or []
+
+
+def expected_cost(source_name, klass):
+    """Expected seconds spent on this source per valid answer it produces"""
+    entry = _get_stats()["sources"].get(klass, {}).get(source_name)
+    if entry is None:
+        return PRIOR_LATENCY / PRIOR_SUCCESS_RATE
+    weight = 0.5 ** ((time.time() - entry.get("updated_at", 0)) / STATS_HALF_LIFE)
+    success_rate = PRIOR_SUCCESS_RATE + (entry["success_rate"] - PRIOR_SUCCESS_RATE) * weight
+    latency = PRIOR_LATENCY + (entry["latency"] - PRIOR_LATENCY) * weight
+    return latency / max(success_rate, MIN_SUCCESS_RATE)
+
+
+def order(sources, klass):
+    """Order (name, func) sources by manual overrides, then by expected cost"""
+    overrides = overrides_for(klass)
+    pinned = {name: position for position, name in enumerate(overrides)}
+    return sorted(
+        sources,
+        key=lambda source: (
+            pinned.get(source[0], len(pinned)),
+            expected_cost(source[0], klass),
+        )
+    )
+
+
+def set_override(klass, source_names):
+    """Pin sources to the front of a date class's ordering; None clears the override"""
+    with _lock:
+        stats = _get_stats()
+        if source_names:
+            stats["overrides"][klass] = list(source_names)
+        else:
+            stats["overrides"].pop(klass, None)
+        _save(stats)
+
+
+def status():
+    """Statistics, overrides and expected costs for every date class"""
+    stats = _get_stats()
+    return {
+        klass: {
+            "overrides": overrides_for(klass),
+            "sources": {
+                name: dict(entry, expected_cost=round(expected_cost(name, klass), 3))
+                for name, entry in stats["sources"].get(klass, {}).items()
+            },
+        }
+        for klass in DATE_CLASSES
+    }
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Startup phases and readiness.
+#
+# main marks each import phase and runs its heavy loads (dictionary, index,
+# puzzle stores) through run(), on a background thread unless EAGER_STARTUP is
+# set, so the server can accept connections and answer health checks while the
+# data loads. Requests that need the data wait for is_ready(). report() breaks
+# startup down phase by phase.
+EAGER_STARTUP = os.environ.get("EAGER_STARTUP", "").lower() in ("1", "true", "yes")
+
+# How long a request waits for startup to finish before getting a 503
+READY_TIMEOUT = float(os.environ.get("STARTUP_READY_TIMEOUT", 20))
+
+_started = time.perf_counter()
+_last_mark = _started
+_phases = []
+_ready = threading.Event()
+_ready_at = None
+_error = None
+_loader = None
+
+
+def mark(name):
+    """Record the time since the previous mark as a named phase"""
+    global _last_mark
+    now = time.perf_counter()
+    _phases.append({"name": name, "ms": round((now - _last_mark) * 1000, 1), "background": False})
+    _last_mark = now
+
+
+@contextmanager
+def phase(name):
+    """Record the time spent in the block as a named phase"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append({
+            "name": name,
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "background": threading.current_thread() is not threading.main_thread(),
+        })
+
+
+def _run_loader():
+    global _ready_at, _error
+    try:
+        _loader()
+    except Exception as e:
+        # Serve with whatever loaded rather than refusing requests forever
+        _error = f"{type(e).__name__}: {e}"
+    finally:
+        _ready_at = time.perf_counter()
+        _ready.set()
+
+
+def _start_background():
+    threading.Thread(target=_run_loader, name="startup-loader", daemon=True).start()
+
+
+def run(loader):
+    """Run the startup loader, in the background unless EAGER_STARTUP is set"""
+    global _loader
+    _loader = loader
+    if EAGER_STARTUP:
+        _run_loader()
+        return
+    _start_background()
+    # A fork (gunicorn --preload) only copies the calling thread; if loading
+    # hadn't finished, the child loads again itself
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_in_child)
+
+
+def _restart_in_child():
+    global _ready
+    if not _ready.is_set():
+        _ready = threading.Event()
+        _start_background()
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def wait_ready(timeout=READY_TIMEOUT):
+    """Wait for startup to finish, returning whether it has"""
+    return _ready.wait(timeout)
+
+
+def error():
+    """The exception that stopped the startup loader, if any"""
+    return _error
+
+
+def report():
+    """Startup phases with their durations and the time until the server was ready"""
+    return {
+        "ready": _ready.is_set(),
+        "eager": EAGER_STARTUP,
+        "ready_after_ms": round((_ready_at - _started) * 1000, 1) if _ready_at else None,
+        "error": _error,
+        "phases": list(_phases),
+    }
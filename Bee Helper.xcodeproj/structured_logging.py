@@ -0,0 +1,139 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+# Structured logging for the server.
+#
+# Records are handed to a bounded in-memory queue on the calling thread, and a
+# background listener thread formats and writes them, so request threads never
+# block on stdout. Loggers are level-gated before any message formatting: call
+# sites pass %-style arguments (or check isEnabledFor for expensive ones), so a
+# suppressed debug line costs one integer comparison. Every record carries the
+# id of the request that produced it.
+#
+# LOG_LEVEL sets the level (default INFO); LOG_FORMAT=text switches from JSON
+# lines to plain text for local development.
+LOGGER_NAME = "beehelper"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")
+LOG_QUEUE_SIZE = 10000
+
+# Attributes of every LogRecord; anything else came in through `extra=`
+_STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+_listener = None
+_dropped = 0
+
+
+def set_request_id(request_id):
+    """Set the request id attached to log records from the current context"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+def dropped_records():
+    """Number of records dropped because the log queue was full"""
+    return _dropped
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to each record"""
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def prepare(self, record):
+        # Leave message formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, level, logger, request id and extra fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+
+def _start_listener(log_queue, stream_handler):
+    global _listener
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure():
+    """Install the queue-backed handler on the server's logger; safe to call more than once"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if any(isinstance(handler, DroppingQueueHandler) for handler in logger.handlers):
+        return logger
+
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+
+    _start_listener(log_queue, stream_handler)
+    atexit.register(_stop_listener)
+    # The listener thread doesn't survive a fork (gunicorn --preload); start a new one in the child
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: _start_listener(log_queue, stream_handler))
+    return logger
+
+
+def get_logger(name):
+    """Logger for a server module, under the configured server logger"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import dictionary_delta
+import word_index
+
+# Wordbase deltas: diff and parse, and an index patched with a delta matching
+# one built from scratch.
+#
+#   python -m unittest test_dictionary_delta
+OLD_WORDS = ["aardvark", "knit", "knot", "thick", "tonic", "zebra"]
+NEW_WORDS = ["chick", "knit", "thick", "tonic", "zymurgy", "éclair"]
+
+
+def same_index(index):
+    """An index with each group's words sorted, since build() and apply_delta() order them differently"""
+    return dict(
+        index,
+        groups={mask: sorted(words) for mask, words in index["groups"].items()},
+        other=sorted(index["other"]),
+    )
+
+
+class DictionaryDeltaTest(unittest.TestCase):
+    def test_diff_is_a_merge_of_sorted_streams(self):
+        self.assertEqual(
+            list(dictionary_delta.diff(OLD_WORDS, NEW_WORDS)),
+            [("-", "aardvark"), ("+", "chick"), ("-", "knot"), ("-", "zebra"), ("+", "zymurgy"), ("+", "éclair")],
+        )
+        self.assertEqual(list(dictionary_delta.diff(OLD_WORDS, OLD_WORDS)), [])
+        self.assertEqual(list(dictionary_delta.diff([], ["knit"])), [("+", "knit")])
+
+    def test_written_delta_parses_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old_path, new_path, delta_path = (Path(tmp) / name for name in ("old.txt", "new.txt", "old-to-new.delta"))
+            old_path.write_text("\n".join(OLD_WORDS) + "\n", encoding="utf-8")
+            new_path.write_text("\n".join(NEW_WORDS) + "\n", encoding="utf-8")
+            result = dictionary_delta.write_delta(old_path, new_path, delta_path)
+            with open(delta_path, encoding="utf-8") as f:
+                delta = dictionary_delta.parse(f)
+            self.assertEqual(sorted(path.name for path in Path(tmp).iterdir()), ["new.txt", "old-to-new.delta", "old.txt"])
+
+        self.assertEqual(delta["from"], word_index.dictionary_version(OLD_WORDS))
+        self.assertEqual(delta["to"], word_index.dictionary_version(NEW_WORDS))
+        self.assertEqual((result["from"], result["to"]), (delta["from"], delta["to"]))
+        self.assertEqual(delta["added"], ["chick", "zymurgy", "éclair"])
+        self.assertEqual(delta["removed"], ["aardvark", "knot", "zebra"])
+
+    def test_unsorted_wordbase_is_rejected(self):
+        with self.assertRaises(dictionary_delta.DeltaError):
+            list(dictionary_delta.sorted_words(["knot", "knit"], "old.txt"))
+
+    def test_malformed_deltas_are_rejected(self):
+        version = "0" * 64
+        for lines in (
+            ["from " + version, "to " + version],
+            [dictionary_delta.HEADER, "from abc", "to " + version],
+            [dictionary_delta.HEADER, "from " + version, "to " + version, "*knit"],
+            [dictionary_delta.HEADER, "from " + version, "to " + version, "+"],
+        ):
+            with self.subTest(lines=lines), self.assertRaises(dictionary_delta.DeltaError):
+                dictionary_delta.parse(lines)
+
+    def test_patched_index_equals_a_full_rebuild(self):
+        # Upper case, as the server loads them; "éclair" lands in the scanned
+        # words and "zebra" leaves a letter group empty
+        old = {word.upper() for word in OLD_WORDS}
+        new = {word.upper() for word in NEW_WORDS}
+        delta = {"added": [], "removed": []}
+        for sign, word in dictionary_delta.diff(sorted(old), sorted(new)):
+            delta["added" if sign == "+" else "removed"].append(word)
+
+        old_index = word_index.build(old)
+        patched = word_index.apply_delta(old_index, delta["added"], delta["removed"], len(new))
+        self.assertEqual(same_index(patched), same_index(word_index.build(new)))
+        self.assertEqual(
+            word_index.find_words(patched, ["C", "H", "I", "K", "N", "O", "T"], "K"),
+            word_index.find_words(word_index.build(new), ["C", "H", "I", "K", "N", "O", "T"], "K"),
+        )
+
+        # The old index keeps serving the old words until it's swapped out
+        self.assertEqual(same_index(old_index), same_index(word_index.build(old)))
+
+
+if __name__ == "__main__":
+    unittest.main()
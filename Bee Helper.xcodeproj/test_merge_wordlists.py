@@ -0,0 +1,48 @@
+import os
+import random
+import tempfile
+import unittest
+
+import merge_wordlists
+
+# The external sort that merge_wordlists and wordbase.py sort and deduplicate
+# word lists with, in one run and spilled to disk in several.
+#
+#   python -m unittest test_merge_wordlists
+class ExternalSortTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2024)
+        letters = "abcdefgh"
+        self.words = ["".join(rng.choice(letters) for _ in range(rng.randint(1, 4))) for _ in range(2000)]
+
+    def test_small_input_sorts_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            result = list(merge_wordlists.external_sort(self.words, run_size=len(self.words), temp_dir=tmp))
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertEqual(result, sorted(set(self.words)))
+
+    def test_spilled_runs_merge_to_sorted_unique_words(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Runs of 64 words, so repeats fall in different runs and the
+            # merge has to drop them
+            result = list(merge_wordlists.external_sort(self.words, run_size=64, temp_dir=tmp))
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertEqual(result, sorted(set(self.words)))
+
+    def test_runs_are_removed_when_the_sort_is_abandoned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            words = merge_wordlists.external_sort(self.words, run_size=64, temp_dir=tmp)
+            next(words)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            words.close()
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_empty_input(self):
+        self.assertEqual(list(merge_wordlists.external_sort([])), [])
+
+    def test_dedupe_sorted(self):
+        self.assertEqual(list(merge_wordlists.dedupe_sorted(["a", "a", "b", "c", "c", "c"])), ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
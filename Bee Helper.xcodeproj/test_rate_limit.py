@@ -0,0 +1,133 @@
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+import host_scheduler
+import rate_limit
+
+# Client buckets, the global upstream cap, and which archive requests the
+# server charges to the upstream budget.
+#
+#   python -m unittest test_rate_limit
+PUZZLE_INFO = {
+    "letters": ["C", "H", "I", "K", "N", "O", "T"],
+    "center_letter": "K",
+    "source": "GitHub Archive",
+}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patches = [
+            mock.patch.object(host_scheduler.time, "monotonic", self.clock),
+            mock.patch.object(rate_limit, "RATE_LIMITS_ENABLED", True),
+            mock.patch.object(rate_limit, "_buckets", OrderedDict()),
+            mock.patch.object(rate_limit, "_overrides", {"upstream": [0.5, 2]}),
+            mock.patch.object(rate_limit, "_upstream_slots", threading.BoundedSemaphore(1)),
+            mock.patch.object(rate_limit, "_upstream_in_flight", 0),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_bucket_refills_at_its_rate(self):
+        for _ in range(2):
+            self.assertIsNone(rate_limit.check("a", "get_archive_puzzle", upstream=True))
+            rate_limit.release_upstream()
+        self.assertEqual(rate_limit.check("a", "get_archive_puzzle", upstream=True), ("upstream", 429, 2))
+
+        # Half a token a second: one more request after two seconds, not before
+        self.clock.now += 1
+        self.assertEqual(rate_limit.check("a", "get_archive_puzzle", upstream=True)[0], "upstream")
+        self.clock.now += 1
+        self.assertIsNone(rate_limit.check("a", "get_archive_puzzle", upstream=True))
+        rate_limit.release_upstream()
+
+        # Other clients have buckets of their own
+        self.assertIsNone(rate_limit.check("b", "get_archive_puzzle", upstream=True))
+        rate_limit.release_upstream()
+
+    def test_cap_refusal_keeps_the_clients_token(self):
+        self.assertIsNone(rate_limit.check("a", "get_archive_puzzle", upstream=True))
+        for _ in range(5):
+            self.assertEqual(rate_limit.check("b", "get_archive_puzzle", upstream=True), ("in_flight", 503, 5))
+        rate_limit.release_upstream()
+
+        # b was refused for the cap only, so its two tokens are still there
+        for _ in range(2):
+            self.assertIsNone(rate_limit.check("b", "get_archive_puzzle", upstream=True))
+            rate_limit.release_upstream()
+        self.assertEqual(rate_limit.status()["upstream_in_flight"], 0)
+
+    def test_client_refusal_gives_back_the_slot(self):
+        for _ in range(2):
+            self.assertIsNone(rate_limit.check("a", "get_archive_puzzle", upstream=True))
+            rate_limit.release_upstream()
+        self.assertEqual(rate_limit.check("a", "get_archive_puzzle", upstream=True)[0], "upstream")
+        self.assertEqual(rate_limit.status()["upstream_in_flight"], 0)
+        self.assertIsNone(rate_limit.check("b", "get_archive_puzzle", upstream=True))
+        rate_limit.release_upstream()
+
+    def test_client_id_ignores_forwarded_for_without_proxy_hops(self):
+        self.assertEqual(rate_limit.client_id("10.0.0.1", "6.6.6.6"), "10.0.0.1")
+        with mock.patch.object(rate_limit, "PROXY_HOPS", 1):
+            self.assertEqual(rate_limit.client_id("10.0.0.1", "6.6.6.6, 1.2.3.4"), "1.2.3.4")
+
+
+class ArchiveBudgetTest(unittest.TestCase):
+    def setUp(self):
+        import main
+        self.main = main
+        main.startup.wait_ready()
+        patches = [
+            mock.patch.object(rate_limit, "RATE_LIMITS_ENABLED", True),
+            mock.patch.object(rate_limit, "_buckets", OrderedDict()),
+            mock.patch.object(main, "PUZZLE_CACHE", {}),
+            mock.patch.object(main, "PUZZLE_DATABASE", {}),
+            mock.patch.object(main, "save_puzzle_cache"),
+            mock.patch.object(main, "save_puzzle_database"),
+            mock.patch.object(main.github_mirror, "lookup", return_value=None),
+            mock.patch.object(main.upstream, "fetch", side_effect=ConnectionError("no network in tests")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = main.app.test_client()
+
+    def upstream_tokens_taken(self):
+        return ("127.0.0.1", "upstream") in rate_limit._buckets
+
+    def test_database_dates_are_not_charged(self):
+        self.main.PUZZLE_DATABASE["2024-03-01"] = dict(PUZZLE_INFO)
+        for _ in range(10):
+            self.assertEqual(self.client.get("/api/spelling-bee/archive/2024-03-01").status_code, 200)
+            self.main.PUZZLE_CACHE.clear()
+        self.assertFalse(self.upstream_tokens_taken())
+
+    def test_mirror_dates_are_not_charged(self):
+        self.main.github_mirror.lookup.return_value = dict(PUZZLE_INFO)
+        with mock.patch.object(self.main, "GITHUB_ARCHIVE_MODE", "mirror"):
+            with self.main.app.test_request_context("/api/spelling-bee/archive/2024-03-02"):
+                self.assertFalse(self.main.request_needs_upstream())
+            with mock.patch.object(self.main.github_mirror, "lookup", return_value=None):
+                with self.main.app.test_request_context("/api/spelling-bee/archive/2024-03-02"):
+                    self.assertTrue(self.main.request_needs_upstream())
+
+    def test_malformed_dates_are_not_charged(self):
+        for _ in range(10):
+            self.assertEqual(self.client.get("/api/spelling-bee/archive/not-a-date").status_code, 400)
+        self.assertFalse(self.upstream_tokens_taken())
+
+
+if __name__ == "__main__":
+    unittest.main()
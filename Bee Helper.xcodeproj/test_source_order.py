@@ -0,0 +1,119 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+import main
+import source_stats
+
+# The scrape cascade with word.tips failing: its failures must count against
+# it, so a source with the real puzzle is never pushed behind canned letters.
+#
+#   python -m unittest test_source_order
+GITHUB = "github.com/tedmiston/spelling-bee-answers"
+WORD_TIPS = "word.tips (today)"
+
+REAL_PUZZLE = {
+    "letters": ["C", "H", "I", "K", "N", "O", "T"],
+    "center_letter": "K",
+    "source": "GitHub Archive",
+}
+
+
+class SourceOrderTest(unittest.TestCase):
+    def setUp(self):
+        main.startup.wait_ready()
+        # Fresh statistics with word.tips looking fast and reliable, and no
+        # stored puzzles or files written
+        stats = {"sources": {}, "overrides": {}}
+        patches = [
+            mock.patch.object(source_stats, "_stats", stats),
+            mock.patch.object(source_stats, "_env_overrides", {}),
+            mock.patch.object(source_stats, "_save"),
+            mock.patch.object(main, "get_puzzle_from_database", return_value=None),
+            mock.patch.object(main, "get_cached_puzzle", return_value=None),
+            mock.patch.object(main, "save_puzzle_to_database"),
+            mock.patch.object(main, "cache_puzzle"),
+            mock.patch.object(main, "fetch_github_archive", return_value=dict(REAL_PUZZLE)),
+            mock.patch.object(main, "scrape_nyt_forum_archive", return_value=None),
+            mock.patch.object(main, "scrape_word_finder_archive", return_value=None),
+            mock.patch.object(main.upstream, "fetch", side_effect=ConnectionError("word.tips is down")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        for _ in range(5):
+            source_stats.record(WORD_TIPS, "today", True, 0.01)
+
+    def test_failing_word_tips_falls_through_to_github(self):
+        self.assertEqual(main.scrape_word_tips_today(), None)
+        for _ in range(5):
+            result = main.get_puzzle_data_for_date(date.today())
+            self.assertEqual(result["letters"], REAL_PUZZLE["letters"])
+            self.assertEqual(result["source"], REAL_PUZZLE["source"])
+
+        entry = source_stats._stats["sources"]["today"][WORD_TIPS]
+        self.assertEqual(entry["successes"], 5)
+        self.assertGreater(entry["attempts"], 5)
+        names = [name for name, _ in source_stats.order([(WORD_TIPS, None), (GITHUB, None)], "today")]
+        self.assertEqual(names[0], GITHUB)
+        main.save_puzzle_to_database.assert_called_with(date.today().isoformat(), REAL_PUZZLE)
+
+    def test_canned_letters_count_as_failure(self):
+        canned = {"letters": list("AEILNOT"), "center_letter": "E", "source": "word.tips (error fallback)"}
+        with mock.patch.object(main, "scrape_word_tips_today", return_value=canned):
+            result = main.get_puzzle_data_for_date(date.today())
+        self.assertEqual(result["source"], REAL_PUZZLE["source"])
+        entry = source_stats._stats["sources"]["today"][WORD_TIPS]
+        self.assertLess(entry["success_rate"], 1.0)
+
+
+class CannedPuzzleRouteTest(unittest.TestCase):
+    def setUp(self):
+        main.startup.wait_ready()
+        # Every source failing, with the real puzzle cache (not saved to disk)
+        self.github = mock.Mock(return_value=None)
+        patches = [
+            mock.patch.object(source_stats, "_stats", {"sources": {}, "overrides": {}}),
+            mock.patch.object(source_stats, "_env_overrides", {}),
+            mock.patch.object(source_stats, "_save"),
+            mock.patch.object(main.rate_limit, "RATE_LIMITS_ENABLED", False),
+            mock.patch.object(main, "PUZZLE_CACHE", {}),
+            mock.patch.object(main, "save_puzzle_cache"),
+            mock.patch.object(main, "get_puzzle_from_database", return_value=None),
+            mock.patch.object(main, "save_puzzle_to_database"),
+            mock.patch.object(main, "fetch_github_archive", self.github),
+            mock.patch.object(main, "scrape_nyt_forum_archive", return_value=None),
+            mock.patch.object(main, "scrape_word_finder_archive", return_value=None),
+            mock.patch.object(main, "scrape_todays_words", return_value=None),
+            mock.patch.object(main.upstream, "fetch", side_effect=ConnectionError("upstream is down")),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = main.app.test_client()
+
+    def check_route(self, path):
+        # The first request gets placeholder letters, which mustn't be cached
+        canned = self.client.get(path).get_json()
+        self.assertIn("fallback", canned["source"])
+        self.assertEqual(main.PUZZLE_CACHE, {})
+
+        # Once a source recovers, the next request gets the real puzzle
+        self.github.return_value = dict(REAL_PUZZLE)
+        real = self.client.get(path).get_json()
+        self.assertEqual(real["letters"], REAL_PUZZLE["letters"])
+        self.assertTrue(real["source"].startswith(REAL_PUZZLE["source"]))
+        self.assertEqual(len(main.PUZZLE_CACHE), 1)
+
+    def test_today(self):
+        self.check_route("/api/spelling-bee/today")
+
+    def test_yesterday(self):
+        self.check_route("/api/spelling-bee/yesterday")
+
+    def test_archive(self):
+        self.check_route("/api/spelling-bee/archive/2024-03-01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import word_index
+import wordbase
+
+# wordbase builds: sorted, deduplicated output with its dictionary version,
+# and the stage cache rerunning only the stages whose inputs changed.
+#
+#   python -m unittest test_wordbase
+SOURCES = {
+    "a.txt": ["Thick", "knit", "zebra", "tonic", "knot", "ink"],
+    "b.txt": ["knot", "chinook", "reader", "Tonic", "kitten"],
+}
+
+
+class WordbaseBuildTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        for name, words in SOURCES.items():
+            (self.dir / name).write_text("\n".join(words) + "\n", encoding="utf-8")
+        (self.dir / "exclude.txt").write_text("kitten\n", encoding="utf-8")
+        (self.dir / "wordbase.json").write_text(json.dumps({
+            "output": "out.txt",
+            "cache_dir": "cache",
+            "sources": [{"path": "a.txt"}, {"path": "b.txt"}],
+            "stages": [
+                {"stage": "playable", "min_length": 4, "max_unique_letters": 7},
+                {"stage": "no_e_and_r"},
+                {"stage": "exclude", "path": "exclude.txt"},
+            ],
+        }))
+
+    def build(self, **kwargs):
+        # Two workers and tiny chunks, so the stages run on the pool
+        config = wordbase.load_config(self.dir / "wordbase.json")
+        return wordbase.build(config, workers=2, chunk_size=2, **kwargs)
+
+    def test_output_is_sorted_and_versioned(self):
+        manifest = self.build()
+        words = (self.dir / "out.txt").read_text(encoding="utf-8").split()
+        self.assertEqual(words, ["chinook", "knit", "knot", "thick", "tonic"])
+        self.assertEqual(manifest["output"]["words"], len(words))
+        self.assertEqual(manifest["output"]["dictionary_version"], word_index.dictionary_version(words))
+        self.assertEqual(manifest["unique_words"], 9)
+        self.assertEqual([stage["words_out"] for stage in manifest["stages"]], [8, 6, 5])
+        self.assertEqual(sorted(path.suffix for path in (self.dir / "cache" / "stages").iterdir()), [".json"] * 3 + [".txt"] * 3)
+
+    def test_only_changed_stages_rerun(self):
+        first = self.build()
+        self.assertEqual([stage["cache"] for stage in first["stages"]], ["built"] * 3)
+        self.assertEqual([stage["cache"] for stage in self.build()["stages"]], ["reused"] * 3)
+
+        (self.dir / "exclude.txt").write_text("kitten\nknot\n", encoding="utf-8")
+        manifest = self.build()
+        self.assertEqual([stage["cache"] for stage in manifest["stages"]], ["reused", "reused", "built"])
+        self.assertEqual(manifest["output"]["words"], 4)
+
+        # Without the cache every stage reruns and the output is the same
+        rebuilt = self.build(use_cache=False)
+        self.assertEqual([stage["cache"] for stage in rebuilt["stages"]], ["built"] * 3)
+        self.assertEqual(rebuilt["output"], manifest["output"])
+        self.assertFalse([path for path in (self.dir / "cache" / "stages").iterdir() if path.suffix == ".tmp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import functools
+import re
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context
+
+# Lightweight per-request spans reported in the Server-Timing response header.
+#
+# span() accumulates the time spent in a named stage of the current request;
+# repeated spans with the same name add up. Outside a request (CLI tools,
+# background threads) spans are no-ops.
+_INVALID_TOKEN_CHARS = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]+")
+
+
+def _spans():
+    spans = g.get("timing_spans")
+    if spans is None:
+        spans = g.timing_spans = {}
+    return spans
+
+
+def record(name, seconds):
+    """Add time to a named span of the current request"""
+    if not has_request_context():
+        return
+    spans = _spans()
+    total, count = spans.get(name, (0.0, 0))
+    spans[name] = (total + seconds, count + 1)
+
+
+@contextmanager
+def span(name):
+    """Time the block as a named stage of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def timed(name):
+    """Decorator timing each call as a named stage of the current request"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary():
+    """{span name: {"ms": total milliseconds, "count": calls}} for the current request"""
+    if not has_request_context():
+        return {}
+    return {
+        name: {"ms": round(total * 1000, 3), "count": count}
+        for name, (total, count) in _spans().items()
+    }
+
+
+def server_timing_header(total_seconds=None):
+    """Format the current request's spans as a Server-Timing header value"""
+    entries = []
+    for name, stats in summary().items():
+        token = _INVALID_TOKEN_CHARS.sub("_", name).strip("_") or "span"
+        entries.append(f'{token};dur={stats["ms"]}' + (f';desc="x{stats["count"]}"' if stats["count"] > 1 else ""))
+    if total_seconds is not None:
+        entries.append(f"total;dur={round(total_seconds * 1000, 3)}")
+    return ", ".join(entries)
@@ -0,0 +1,94 @@
+import os
+from datetime import date
+from urllib.parse import urlsplit
+
+import host_scheduler
+import response_store
+
+# Shared HTTP layer for the scrapers. Every successful response is recorded in
+# the raw response store so parsers can be improved and re-run without the
+# network. Requests are made conditional on the stored ETag and Last-Modified
+# validators; a 304 reuses the stored body, and therefore its memoized parse.
+# Each request waits for a slot from its host's politeness scheduler.
+#
+# UPSTREAM_REDIRECT_URL sends every upstream request to a stand-in server
+# instead, as <redirect>/<original host><path>, for load tests and offline
+# development. URLs are still stored and scheduled under the original host.
+UPSTREAM_REDIRECT_URL = os.environ.get("UPSTREAM_REDIRECT_URL", "").rstrip("/")
+
+
+class UpstreamResponse:
+    """The parts of an upstream HTTP response the scrapers use"""
+
+    def __init__(self, url, status_code, content=None, sha256=None, fetched_on=None, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self._content = content
+        self.sha256 = sha256
+        self.fetched_on = fetched_on
+        self.not_modified = not_modified
+
+    @property
+    def content(self):
+        # Revalidated bodies are only read back from the store if a parser needs them
+        if self._content is None and self.sha256:
+            self._content = response_store.read(self.sha256)
+        return self._content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+def conditional_headers(url):
+    """If-None-Match / If-Modified-Since headers for the last stored response of a URL"""
+    validators = response_store.validators_for(url)
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def resolve(url):
+    """The URL to actually request for an upstream URL, honoring UPSTREAM_REDIRECT_URL"""
+    if not UPSTREAM_REDIRECT_URL:
+        return url
+    parts = urlsplit(url)
+    return f"{UPSTREAM_REDIRECT_URL}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def _get(url, headers, timeout):
+    # Imported on first use; requests is slow to import and most requests are cache hits
+    import requests
+    with host_scheduler.slot(url):
+        return requests.get(resolve(url), headers=headers, timeout=timeout)
+
+
+def fetch(url, headers=None, timeout=10):
+    """GET an upstream URL, revalidating against the response store"""
+    request_headers = dict(headers or {})
+    request_headers.update(conditional_headers(url))
+
+    response = _get(url, request_headers, timeout)
+    fetched_on = date.today().isoformat()
+
+    if response.status_code == 304:
+        entry = response_store.record_not_modified(url, fetched_on)
+        if entry is not None:
+            return UpstreamResponse(url, 200, sha256=entry["sha256"], fetched_on=fetched_on, not_modified=True)
+        # Nothing stored to revalidate against; retry unconditionally
+        response = _get(url, headers, timeout)
+
+    sha256 = None
+    if response.status_code == 200:
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        sha256 = response_store.record(url, response.content, fetched_on, validators)
+
+    return UpstreamResponse(url, response.status_code, response.content, sha256, fetched_on)
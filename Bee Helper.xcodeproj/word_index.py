@@ -0,0 +1,133 @@
+import hashlib
+import string
+
+# Letter-mask index over the dictionary for puzzle word generation.
+#
+# Each word is filed under the bitmask of the distinct letters it uses, so a
+# puzzle only has to visit the masks that are subsets of its letters and contain
+# the center letter: at most 64 groups for a 7-letter puzzle, instead of testing
+# every word in the dictionary. Results match a linear scan with
+# is_valid_spelling_bee_word exactly; anything the masks can't express (words or
+# letters outside A-Z, an unusual center letter) is answered by scanning.
+LETTER_BITS = {letter: 1 << i for i, letter in enumerate(string.ascii_uppercase)}
+
+# Above this many distinct puzzle letters, walking every mask in the index is
+# cheaper than enumerating subsets of the puzzle's mask
+MAX_SUBSET_LETTERS = 12
+
+
+def letter_mask(letters):
+    """Bitmask of the letters, or None if any of them is outside A-Z"""
+    mask = 0
+    for letter in letters:
+        bit = LETTER_BITS.get(letter)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+
+def build(dictionary):
+    """Index words of 4+ letters by letter mask; words outside A-Z are kept for scanning"""
+    groups = {}
+    other = []
+    for word in dictionary:
+        if len(word) < 4:
+            continue
+        mask = letter_mask(word)
+        if mask is None:
+            other.append(word)
+        else:
+            groups.setdefault(mask, []).append(word)
+    return {
+        "groups": groups,
+        "other": other,
+        "words": sum(len(words) for words in groups.values()) + len(other),
+        "dictionary_words": len(dictionary),
+    }
+
+
+def hashed(words, digest):
+    """Pass sorted lowercase words through, adding each to a dictionary_version() digest"""
+    for word in words:
+        digest.update(word.encode())
+        digest.update(b"\n")
+        yield word
+
+
+def dictionary_version(dictionary):
+    """Content hash identifying a dictionary: sha256 of its sorted lowercase words"""
+    digest = hashlib.sha256()
+    for _ in hashed(sorted(word.lower() for word in dictionary), digest):
+        pass
+    return digest.hexdigest()
+
+
+def apply_delta(index, added, removed, dictionary_words):
+    """A copy of the index with words added and removed, rebuilding only the letter groups they touch"""
+    changes = {}
+    for word in removed:
+        if len(word) >= 4:
+            changes.setdefault(letter_mask(word), (set(), set()))[0].add(word)
+    for word in added:
+        if len(word) >= 4:
+            changes.setdefault(letter_mask(word), (set(), set()))[1].add(word)
+
+    # Untouched groups are shared with the old index, which keeps serving
+    # until the caller swaps the new one in
+    groups = dict(index["groups"])
+    other = index["other"]
+    for mask, (gone, new) in changes.items():
+        current = other if mask is None else groups.get(mask, ())
+        words = [word for word in current if word not in gone and word not in new] + sorted(new)
+        if mask is None:
+            other = words
+        elif words:
+            groups[mask] = words
+        else:
+            groups.pop(mask, None)
+    return {
+        "groups": groups,
+        "other": other,
+        "words": sum(len(words) for words in groups.values()) + len(other),
+        "dictionary_words": dictionary_words,
+    }
+
+
+def _submasks(mask):
+    submask = mask
+    while submask:
+        yield submask
+        submask = (submask - 1) & mask
+
+
+def find_words(index, letters, center_letter):
+    """Sorted words using only `letters` and containing `center_letter`, or None if the index can't answer"""
+    center = center_letter.upper()
+    center_bit = LETTER_BITS.get(center)
+    letter_set = set(letters)
+    if center_bit is None:
+        return None
+
+    # Words only match letters that are actually in `letters`, so letters
+    # outside A-Z can't match any indexed word
+    mask = letter_mask(letter for letter in letter_set if letter in LETTER_BITS)
+    if not mask & center_bit:
+        candidates = []
+    else:
+        groups = index["groups"]
+        rest = mask & ~center_bit
+        candidates = []
+        if bin(rest).count("1") <= MAX_SUBSET_LETTERS:
+            for submask in _submasks(rest):
+                candidates.extend(groups.get(submask | center_bit, ()))
+            candidates.extend(groups.get(center_bit, ()))
+        else:
+            for group_mask, words in groups.items():
+                if group_mask & center_bit and not group_mask & ~mask:
+                    candidates.extend(words)
+
+    for word in index["other"]:
+        if center in word and all(char in letter_set for char in word):
+            candidates.append(word)
+    return sorted(candidates)
@@ -0,0 +1,505 @@
+import argparse
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import dictionary_delta
+import source_cache
+import word_index
+from filter_words import MAX_UNIQUE_LETTERS, MIN_LENGTH, filter_playable
+from merge_wordlists import external_sort
+from remove_er_words import has_e_and_r
+from remove_proper_nouns import classify
+
+# Wordbase build pipeline.
+#
+# Builds the dictionary the server loads from a declarative JSON config instead
+# of running filter_words, merge_wordlists, remove_er_words and
+# remove_proper_nouns by hand. Sources (files or URLs) are read line by line,
+# normalized, then sorted and deduplicated with merge_wordlists' external sort,
+# and streamed through the configured stages, without holding the word lists
+# in memory. Stages only drop words, so the output comes out sorted, one word
+# per line, with a manifest of per-source and per-stage counts, content hashes
+# and the dictionary version the server will report for it.
+#
+#   python wordbase.py build                          # uses wordbase.json
+#   python wordbase.py build --config my.json --output /tmp/words.txt
+#
+# Relative paths in a config are relative to the config file. Serve the output
+# by pointing DICTIONARY_FILE at it. URL sources are cached under the config's
+# cache_dir (build/cache by default) and only downloaded again when they
+# change; --offline builds from the cached copies.
+#
+# Stages run on chunks of the deduplicated stream. With --workers N (or
+# "workers" in the config) chunks go to a process pool, a bounded number at a
+# time; results and stage counts are merged in chunk order, so the output and
+# manifest are the same for any number of workers.
+#
+# Each stage's output is cached under cache_dir/stages, keyed by a hash of the
+# stage's config, its code, the files it reads and the content of its input. A
+# rebuild reuses every stage whose key hasn't changed and only reruns from the
+# first one that has, so editing an exclusion list reruns just that stage and
+# the ones after it. The stages that rerun do so together, in one pass over
+# their input on one pool, each writing its own cached output. --no-cache
+# reruns every stage.
+#
+#   python wordbase.py diff old.txt new.txt [--output old-to-new.delta]
+#
+# writes the words added and removed between two built wordbases as a delta
+# the server can apply to its live dictionary (see dictionary_delta.py).
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_CONFIG = BASE_DIR / "wordbase.json"
+CHUNK_SIZE = 20000
+
+
+class BuildError(Exception):
+    """Raised when a config can't be built"""
+
+
+def normalize(lines):
+    """Stripped, lowercase, non-empty words"""
+    for line in lines:
+        word = line.strip().lower()
+        if word:
+            yield word
+
+
+def counted(words, counts, key):
+    """Pass words through, counting them in counts[key]"""
+    counts[key] = 0
+    for word in words:
+        counts[key] += 1
+        yield word
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def read_word_file(path):
+    """The set of normalized words in a file, read once per process"""
+    with open(path, "r", encoding="utf-8") as f:
+        return frozenset(normalize(f))
+
+
+def _file_lines(path):
+    with open(path, "rb") as f:
+        yield from f
+
+
+def read_source(source, record, cache_dir=source_cache.CACHE_DIR, offline=False):
+    """Lines of a source file or URL as they stream in, hashing them into record["sha256"]"""
+    digest = hashlib.sha256()
+    record["lines"] = 0
+    if "url" in source:
+        raw_lines = source_cache.lines(source["url"], cache_dir, offline, status=record)
+    else:
+        raw_lines = _file_lines(source["path"])
+    for raw in raw_lines:
+        raw = raw.rstrip(b"\r\n")
+        digest.update(raw + b"\n")
+        record["lines"] += 1
+        yield raw.decode("utf-8", errors="replace")
+    record["sha256"] = digest.hexdigest()
+
+
+# Stages take the word stream, their manifest record and their config options,
+# and return a filtered stream
+
+def playable_stage(words, record, min_length=MIN_LENGTH, max_unique_letters=MAX_UNIQUE_LETTERS):
+    """Keep words of min_length+ letters using at most max_unique_letters distinct letters, with their distributions"""
+    return filter_playable(words, min_length, max_unique_letters, stats=record)
+
+
+def no_e_and_r_stage(words, record):
+    """Drop words containing both 'e' and 'r'"""
+    return (word for word in words if not has_e_and_r(word))
+
+
+def proper_nouns_stage(words, record):
+    """Drop city, brand, country and personal names, counting removals by rule in the record"""
+    removed_by = record["removed_by"] = {}
+    for word in words:
+        reason = classify(word)
+        if reason is None:
+            yield word
+        else:
+            removed_by[reason] = removed_by.get(reason, 0) + 1
+
+
+def exclude_stage(words, record, path):
+    """Drop the words listed in a file"""
+    excluded = read_word_file(path)
+    return (word for word in words if word not in excluded)
+
+
+STAGES = {
+    "playable": playable_stage,
+    "no_e_and_r": no_e_and_r_stage,
+    "proper_nouns": proper_nouns_stage,
+    "exclude": exclude_stage,
+}
+
+# Modules besides this one whose code a stage's output depends on
+STAGE_MODULES = {
+    "playable": "filter_words",
+    "no_e_and_r": "remove_er_words",
+    "proper_nouns": "remove_proper_nouns",
+    "exclude": None,
+}
+
+
+def load_config(config_path):
+    """Read a build config, resolving its paths against the config file's directory"""
+    config_path = Path(config_path)
+    try:
+        with open(config_path, "r") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BuildError(f"Can't read config {config_path}: {e}")
+
+    base = config_path.resolve().parent
+    config["cache_dir"] = str(base / config.get("cache_dir", "build/cache"))
+    for key in ("output", "manifest"):
+        if config.get(key):
+            config[key] = str(base / config[key])
+    if not config.get("output"):
+        raise BuildError("Config has no output")
+    if not config.get("manifest"):
+        config["manifest"] = str(Path(config["output"]).with_suffix(".manifest.json"))
+
+    if not config.get("sources"):
+        raise BuildError("Config has no sources")
+    for i, source in enumerate(config["sources"]):
+        source.setdefault("name", source.get("path") or source.get("url") or f"source{i}")
+        if "path" in source:
+            source["path"] = str(base / source["path"])
+        elif "url" not in source:
+            raise BuildError(f"Source {source['name']} needs a path or a url")
+
+    for stage in config.setdefault("stages", []):
+        if stage.get("stage") not in STAGES:
+            raise BuildError(f"Unknown stage {stage.get('stage')!r}, expected one of {', '.join(STAGES)}")
+        if "path" in stage:
+            stage["path"] = str(base / stage["path"])
+    return config
+
+
+def chunks(words, size):
+    iterator = iter(words)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_stages(chunk, stages):
+    """Run the stages over one chunk, returning the words out of each stage and each stage's record"""
+    outputs = []
+    records = []
+    words = chunk
+    for stage in stages:
+        options = {key: value for key, value in stage.items() if key != "stage"}
+        record = {}
+        words = list(STAGES[stage["stage"]](words, record, **options))
+        outputs.append(words)
+        records.append(record)
+    return outputs, records
+
+
+def merge_counts(total, part):
+    """Add a chunk's counters into the running totals, recursing into nested counters"""
+    for key, value in part.items():
+        if isinstance(value, dict):
+            merge_counts(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def sort_counts(counts):
+    return {key: sort_counts(value) if isinstance(value, dict) else value for key, value in sorted(counts.items())}
+
+
+def run_chunks(words, stages, workers=1, chunk_size=CHUNK_SIZE):
+    """run_stages() results per chunk, in chunk order, on a process pool when workers > 1"""
+    if workers <= 1:
+        for chunk in chunks(words, chunk_size):
+            yield run_stages(chunk, stages)
+        return
+
+    # Keep a couple of chunks per worker queued so reading sources overlaps
+    # with filtering, without reading everything ahead
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for chunk in chunks(words, chunk_size):
+            pending.append(executor.submit(run_stages, chunk, stages))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_lines(path, words):
+    """Write words one per line, replacing the file atomically, and return the sha256 of what was written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for word in words:
+            line = word + "\n"
+            digest.update(line.encode("utf-8"))
+            f.write(line)
+    os.replace(temp_path, path)
+    return digest.hexdigest()
+
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+@functools.lru_cache(maxsize=None)
+def code_sha256(stage_name):
+    """Hash of the code a stage runs: this module and the module it filters with"""
+    digest = hashlib.sha256()
+    module = STAGE_MODULES.get(stage_name)
+    for name in (__name__, module) if module else (__name__,):
+        digest.update(Path(sys.modules[name].__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def stage_key(stage, input_sha256, files_sha256=None):
+    """Cache key of a stage's output, from its config, code, the files it reads and its input's content"""
+    options = {key: value for key, value in stage.items() if key != "path"}
+    key = {
+        "stage": options,
+        "code": code_sha256(stage["stage"]),
+        "files": files_sha256,
+        "input": input_sha256,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def cached_stage(stage_dir, key):
+    """The cached result of a stage (words, sha256, stats), or None if it hasn't been built"""
+    result_path = Path(stage_dir) / f"{key}.json"
+    if not (Path(stage_dir) / f"{key}.txt").exists():
+        return None
+    try:
+        with open(result_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_stages_to_files(stages, input_path, stage_dir, workers=1, chunk_size=CHUNK_SIZE):
+    """Run stages over a word file in one pass, writing each stage's output to a temporary file, and return their results"""
+    stage_dir = Path(stage_dir)
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    results = [
+        {"path": stage_dir / f"stage{i}.{os.getpid()}.tmp", "words": 0, "stats": {}}
+        for i in range(len(stages))
+    ]
+    digests = [hashlib.sha256() for _ in stages]
+    files = [open(result["path"], "w", encoding="utf-8") for result in results]
+    try:
+        for outputs, records in run_chunks(read_lines(input_path), stages, workers, chunk_size):
+            for result, digest, f, words, record in zip(results, digests, files, outputs, records):
+                merge_counts(result["stats"], record)
+                result["words"] += len(words)
+                for word in words:
+                    line = word + "\n"
+                    digest.update(line.encode("utf-8"))
+                    f.write(line)
+    except BaseException:
+        for f, result in zip(files, results):
+            f.close()
+            result["path"].unlink(missing_ok=True)
+        raise
+    for f, result, digest in zip(files, results, digests):
+        f.close()
+        result["sha256"] = digest.hexdigest()
+        result["stats"] = sort_counts(result["stats"])
+    return results
+
+
+def save_stage(stage_dir, key, result):
+    """Move a stage's output from run_stages_to_files() into the cache under its key, and return its cached result"""
+    # The output is moved in before its result is written, so a result on
+    # disk always has a complete output next to it
+    os.replace(result["path"], Path(stage_dir) / f"{key}.txt")
+    cached = {"words": result["words"], "sha256": result["sha256"], "stats": result["stats"]}
+    with open(Path(stage_dir) / f"{key}.json", "w") as f:
+        json.dump(cached, f, indent=2)
+    return cached
+
+
+def build(config, output=None, workers=None, chunk_size=CHUNK_SIZE, offline=False, use_cache=True):
+    """Run a build config, writing the wordbase and its manifest, and return the manifest"""
+    started = time.perf_counter()
+    output = output or config["output"]
+    manifest_path = config["manifest"] if output == config["output"] else str(Path(output).with_suffix(".manifest.json"))
+    workers = workers or config.get("workers") or 1
+    stage_dir = Path(config["cache_dir"]) / "stages"
+
+    counts = {}
+    source_records = []
+
+    def source_lines():
+        for source in config["sources"]:
+            record = {key: source[key] for key in ("name", "path", "url") if key in source}
+            source_records.append(record)
+            yield from read_source(source, record, Path(config["cache_dir"]) / "sources", offline)
+
+    words = counted(normalize(source_lines()), counts, "source_words")
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    words = counted(external_sort(words, temp_dir=stage_dir), counts, "unique_words")
+
+    # The sorted, deduplicated source words are the first stage's input; their
+    # hash starts the chain of stage keys
+    sources_path = stage_dir / f"sources.{os.getpid()}.tmp"
+    input_sha256 = write_lines(sources_path, words)
+    input_path = sources_path
+    words_in = counts["unique_words"]
+
+    stage_records = []
+    built = None
+    try:
+        for i, stage in enumerate(config["stages"]):
+            record = dict(stage)
+            if "path" in stage:
+                record["sha256"] = file_sha256(stage["path"])
+            key = stage_key(stage, input_sha256, record.get("sha256"))
+
+            cached = cached_stage(stage_dir, key) if use_cache and built is None else None
+            if cached is None:
+                if built is None:
+                    # This stage and every one after it run in one pass
+                    built = run_stages_to_files(config["stages"][i:], input_path, stage_dir, workers, chunk_size)
+                cached = save_stage(stage_dir, key, built.pop(0))
+                record["cache"] = "built"
+            else:
+                record["cache"] = "reused"
+
+            record["key"] = key
+            record["words_in"] = words_in
+            record["words_out"] = cached["words"]
+            record["removed"] = words_in - cached["words"]
+            record.update(cached["stats"])
+            stage_records.append(record)
+
+            input_path = stage_dir / f"{key}.txt"
+            input_sha256 = cached["sha256"]
+            words_in = cached["words"]
+
+        # The stages' input was sorted and they only drop words, so the last
+        # output is already in order
+        version = hashlib.sha256()
+        output_sha256 = write_lines(output, counted(word_index.hashed(read_lines(input_path), version), counts, "output_words"))
+    finally:
+        sources_path.unlink(missing_ok=True)
+        for result in built or []:
+            result["path"].unlink(missing_ok=True)
+
+    manifest = {
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "duration_s": round(time.perf_counter() - started, 3),
+        "workers": workers,
+        "sources": source_records,
+        "source_words": counts["source_words"],
+        "unique_words": counts["unique_words"],
+        "stages": stage_records,
+        "output": {
+            "path": str(output),
+            "words": counts["output_words"],
+            "sha256": output_sha256,
+            "dictionary_version": version.hexdigest(),
+        },
+    }
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    manifest["manifest_path"] = manifest_path
+    return manifest
+
+
+def print_summary(manifest):
+    for source in manifest["sources"]:
+        cache = f" ({source['cache']})" if "cache" in source else ""
+        print(f"  source {source['name']}: {source['lines']} lines{cache}")
+        if source.get("error"):
+            print(f"    download failed, used the cached copy: {source['error']}")
+    print(f"  {manifest['source_words']} words, {manifest['unique_words']} unique")
+    for stage in manifest["stages"]:
+        print(f"  {stage['stage']:<14} {stage['words_in']:>8} -> {stage['words_out']:>8}  (-{stage['removed']})  {stage['cache']}")
+    reused = sum(stage["cache"] == "reused" for stage in manifest["stages"])
+    print(f"  reused {reused} of {len(manifest['stages'])} stages from the cache")
+    output = manifest["output"]
+    print(f"Wrote {output['words']} words to {output['path']} in {manifest['duration_s']}s ({manifest['workers']} workers)")
+    print(f"  dictionary version {output['dictionary_version']}")
+    print(f"  manifest {manifest['manifest_path']}")
+
+
+def default_delta_path(old_path, new_path):
+    old_path, new_path = Path(old_path), Path(new_path)
+    return new_path.with_name(f"{old_path.stem}-to-{new_path.stem}.delta")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Build and manage Spelling Bee wordbases")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="build a wordbase from a config")
+    build_parser.add_argument("--config", default=str(DEFAULT_CONFIG), help="build config (default: wordbase.json)")
+    build_parser.add_argument("--output", help="write the wordbase here instead of the config's output")
+    build_parser.add_argument("--workers", type=int, help="processes to run stages on (default: the config's workers, or 1)")
+    build_parser.add_argument("--offline", action="store_true", help="use cached copies of URL sources instead of the network")
+    build_parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="words per chunk of stage work")
+    build_parser.add_argument("--no-cache", action="store_true", help="rerun every stage instead of reusing cached outputs")
+
+    diff_parser = commands.add_parser("diff", help="write the delta between two sorted wordbases")
+    diff_parser.add_argument("old", help="wordbase the server has now")
+    diff_parser.add_argument("new", help="wordbase to move it to")
+    diff_parser.add_argument("--output", help="delta file (default: <old>-to-<new>.delta next to the new wordbase)")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        try:
+            config = load_config(args.config)
+            manifest = build(config, output=args.output, workers=args.workers, chunk_size=args.chunk_size, offline=args.offline,
+                             use_cache=not args.no_cache)
+        except (BuildError, source_cache.SourceUnavailable, OSError) as e:
+            # OSError covers missing files and failed downloads
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print_summary(manifest)
+    elif args.command == "diff":
+        try:
+            delta = dictionary_delta.write_delta(args.old, args.new, args.output or default_delta_path(args.old, args.new))
+        except (dictionary_delta.DeltaError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {delta['path']}: +{delta['added']} -{delta['removed']} words")
+        print(f"  from {delta['from']}")
+        print(f"  to   {delta['to']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())